@@ -0,0 +1,122 @@
+"""Benchmark: memory of plain versus hash-consed (interned) loads.
+
+Builds a stream of repetitive manifests -- Kubernetes Deployments whose
+labels appear in metadata, selector and template, and Compose files whose
+services share one environment block -- then loads it plainly and through
+an InternTable and reports the memory each loaded stream keeps alive (and
+the YamlTrees built from it), the load times, and the size of the stream
+written back with and without anchors. Run from the repository root:
+
+    python -m benchmarks.bench_interning [--documents 1000] [--services 20]
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from containcraft.core.interning import InternTable
+from containcraft.core.yaml_io import dumps_yaml_all, SafeLoader
+from containcraft.core.yaml_tree import YamlTree
+
+import yaml
+
+ENVIRONMENT = {f"SETTING_{i}": f"value-{i}" for i in range(12)}
+
+
+def deployment(i):
+    labels = {"app": f"app-{i % 50}", "tier": "backend", "team": "platform"}
+    return {"apiVersion": "apps/v1", "kind": "Deployment",
+            "metadata": {"name": f"app-{i}", "namespace": "prod", "labels": dict(labels)},
+            "spec": {"replicas": 3, "selector": {"matchLabels": dict(labels)},
+                     "template": {"metadata": {"labels": dict(labels)},
+                                  "spec": {"containers": [{
+                                      "name": "main", "image": "registry.local/app:1.4.2",
+                                      "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                                      "resources": {"limits": {"cpu": "500m", "memory": "256Mi"}},
+                                      "env": [{"name": k, "value": v} for k, v in ENVIRONMENT.items()]}]}}}}
+
+
+def compose(i, services):
+    return {"version": "3.8",
+            "services": {f"svc-{i}-{s}": {"image": "registry.local/worker:2.0", "restart": "always",
+                                          "environment": dict(ENVIRONMENT)}
+                         for s in range(services)}}
+
+
+def stream_text(documents, services):
+    docs = [deployment(i) if i % 2 else compose(i, services) for i in range(documents)]
+    return dumps_yaml_all(docs)
+
+
+def retained(load):
+    """(result, bytes still allocated after load)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def timed(load):
+    # separately from retained(): tracemalloc slows allocation-heavy code several times over
+    start = time.perf_counter()
+    load()
+    return time.perf_counter() - start
+
+
+def load_plain(text):
+    return list(yaml.load_all(text, Loader=SafeLoader))
+
+
+def load_interned(text, table):
+    return [table.intern(doc) for doc in yaml.load_all(text, Loader=SafeLoader)]
+
+
+def build_trees(documents):
+    trees = []
+    for doc in documents:
+        tree = YamlTree()
+        tree.load_from_dict(doc)
+        trees.append(tree)
+    return trees
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000, help="documents in the stream")
+    parser.add_argument("--services", type=int, default=20, help="services per Compose document")
+    args = parser.parse_args()
+
+    text = stream_text(args.documents, args.services)
+    print(f"stream: {args.documents} documents, {len(text) / 1e6:.1f} MB of YAML")
+
+    plain_s = timed(lambda: load_plain(text))
+    interned_s = timed(lambda: load_interned(text, InternTable()))
+    plain, plain_bytes = retained(lambda: load_plain(text))
+    table = InternTable()
+    interned, interned_bytes = retained(lambda: load_interned(text, table))
+    assert interned == plain, "interned documents differ from the plain load"
+    print(f"load, plain        {plain_s:8.3f} s  {plain_bytes / 1e6:8.1f} MB retained")
+    print(f"load, interned     {interned_s:8.3f} s  {interned_bytes / 1e6:8.1f} MB retained"
+          f"  ({1 - interned_bytes / plain_bytes:.0%} less)")
+    stats = table.stats()
+    print(f"  {stats['shared']} of {stats['values']} values shared, {stats['distinct_scalars']} distinct scalars, "
+          f"{stats['distinct_containers']} distinct containers, ~{stats['bytes_saved'] / 1e6:.1f} MB of copies dropped")
+
+    _, plain_tree_bytes = retained(lambda: build_trees(plain))
+    _, interned_tree_bytes = retained(lambda: build_trees(interned))
+    print(f"trees, plain       {plain_tree_bytes / 1e6:19.1f} MB retained")
+    print(f"trees, interned    {interned_tree_bytes / 1e6:19.1f} MB retained"
+          f"  (nodes are not shared; keys and scalars are)")
+
+    anchored = dumps_yaml_all(interned, table)
+    restored = load_plain(anchored)
+    assert restored == plain, "anchored output does not load back to the same documents"
+    print(f"output, plain      {len(text) / 1e6:19.1f} MB")
+    print(f"output, anchors    {len(anchored) / 1e6:19.1f} MB  ({1 - len(anchored) / len(text):.0%} smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Memory benchmark: __slots__ YamlNode vs. the previous __dict__-based node.
+
+Builds the same tree with both representations on synthetic wide and deep
+documents and reports traced bytes per node.
+
+    python -m benchmarks.bench_node_memory [--nodes 200000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from containcraft.core.yaml_node import YamlNode
+
+
+class LegacyYamlNode:
+    """The node class as it was before __slots__ (one __dict__ + list each)."""
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.children = []
+
+    def add_child(self, child):
+        self.children.append(child)
+
+
+def wide_document(n):
+    # services with a handful of scalar fields each, like a big compose file
+    return {"services": {f"svc-{i}": {"image": f"img:{i}", "restart": "always", "replicas": i}
+                         for i in range(n // 4)}}
+
+
+def deep_document(n):
+    root = cur = {}
+    for i in range(n // 2):
+        nxt = {}
+        cur[f"level{i}"] = nxt
+        cur[f"value{i}"] = i
+        cur = nxt
+    return root
+
+
+def build(node_cls, key, data):
+    """Iteratively convert data to nodes of node_cls; returns (root, count)."""
+    root = node_cls(key)
+    count = 1
+    stack = [(root, data)]
+    while stack:
+        node, value = stack.pop()
+        if isinstance(value, dict):
+            for k, v in value.items():
+                child = node_cls(k)
+                node.add_child(child)
+                count += 1
+                stack.append((child, v))
+        else:
+            node.value = value
+    return root, count
+
+
+def measure(node_cls, data):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree, count = build(node_cls, "root", data)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return count, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'document':<8} {'representation':<16} {'nodes':>9} {'total MB':>9} {'B/node':>7}")
+    for name, make in (("wide", wide_document), ("deep", deep_document)):
+        data = make(args.nodes)
+        for label, cls in (("legacy __dict__", LegacyYamlNode), ("__slots__", YamlNode)):
+            count, used = measure(cls, data)
+            print(f"{name:<8} {label:<16} {count:>9} {used / 1e6:>9.1f} {used / count:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
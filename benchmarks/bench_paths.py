@@ -0,0 +1,95 @@
+"""Microbenchmark: compiled/memoized paths vs. per-call string splitting.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_paths
+"""
+import timeit
+
+from containcraft.core.yaml_path import compile_path
+
+PATHS = [
+    "services.kafka.environment.KAFKA_BROKER_ID",
+    "services.web.ports[0]",
+    "spec.template.spec.containers[0].image",
+    "cluster.brokers.broker-1.listeners",
+]
+
+DOC = {
+    "services": {
+        "kafka": {"environment": {"KAFKA_BROKER_ID": "1"}},
+        "web": {"ports": ["80:80", "443:443"]},
+    },
+    "spec": {"template": {"spec": {"containers": [{"image": "nginx"}]}}},
+    "cluster": {"brokers": {"broker-1": {"listeners": "PLAINTEXT://:9092"}}},
+}
+
+
+# The string-splitting implementation edit_yaml used before the path engine.
+def legacy_split_path(path):
+    segments = []
+    for seg in path.split("."):
+        if "[" in seg and seg.endswith("]"):
+            name, idx = seg[:-1].split("[")
+            if name:
+                segments.append(name)
+            segments.append(idx)
+        else:
+            segments.append(seg)
+    return segments
+
+
+def legacy_get(data, path):
+    cur = data
+    for p in legacy_split_path(path):
+        if isinstance(cur, dict):
+            cur = cur[p]
+        elif isinstance(cur, list):
+            cur = cur[int(p)]
+    return cur
+
+
+def legacy_set(data, path, value):
+    parts = legacy_split_path(path)
+    cur = data
+    for p in parts[:-1]:
+        if isinstance(cur, dict):
+            cur = cur[p]
+        elif isinstance(cur, list):
+            cur = cur[int(p)]
+    if isinstance(cur, list):
+        cur[int(parts[-1])] = value
+    else:
+        cur[parts[-1]] = value
+
+
+def compiled_get(data, path):
+    return compile_path(path).get(data)
+
+
+def compiled_set(data, path, value):
+    compile_path(path).set(data, value)
+
+
+def bench(label, fn, number=200_000):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5))
+    print(f"{label:<28} {seconds / number * 1e9:8.0f} ns/op")
+
+
+def main():
+    for path in PATHS:
+        assert legacy_get(DOC, path) == compiled_get(DOC, path)
+
+    print(f"{len(PATHS)} paths, each op touches every path once\n")
+    bench("legacy get", lambda: [legacy_get(DOC, p) for p in PATHS])
+    bench("compiled get (cached)", lambda: [compiled_get(DOC, p) for p in PATHS])
+    bench("legacy set", lambda: [legacy_set(DOC, p, "x") for p in PATHS])
+    bench("compiled set (cached)", lambda: [compiled_set(DOC, p, "x") for p in PATHS])
+
+    compiled = [compile_path(p) for p in PATHS]
+    bench("precompiled get", lambda: [c.get(DOC) for c in compiled])
+    bench("parse only (cache miss)", lambda: [compile_path.__wrapped__(p) for p in PATHS], number=50_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark: compiled declarative schema validators, in documents per minute.
+
+Validates a mix of Compose, Kubernetes and Kafka documents of realistic
+size on one core and checks the rate against the 100k docs/min target.
+Run from the repository root:
+
+    python -m benchmarks.bench_schemas [--docs 30000]
+"""
+import argparse
+import sys
+import time
+
+from containcraft.schemas.registry import SCHEMAS, detect_schema
+from containcraft.schemas.spec import compile_spec
+
+TARGET_PER_MINUTE = 100_000
+
+
+def compose_doc(i):
+    return {
+        "version": "3.8",
+        "services": {
+            f"web{i}": {
+                "image": f"nginx:1.{i % 30}",
+                "ports": ["8080:80", "127.0.0.1:8443:443/tcp", 9000 + i % 100],
+                "volumes": ["./html:/usr/share/nginx/html:ro", {"type": "volume", "source": "logs", "target": "/var/log"}],
+                "environment": {"NGINX_HOST": "example.com", "WORKERS": 4},
+                "depends_on": ["api"],
+                "restart": "unless-stopped",
+            },
+            "api": {
+                "build": {"context": ".", "dockerfile": "Dockerfile"},
+                "command": ["gunicorn", "app:app"],
+                "environment": ["DATABASE_URL=postgres://db/app", "DEBUG=0"],
+                "restart": "on-failure:3",
+            },
+            "db": {"image": "postgres:16", "volumes": ["pg:/var/lib/postgresql/data"], "restart": "always"},
+        },
+        "volumes": {"pg": None, "logs": None},
+    }
+
+
+def deployment_doc(i):
+    labels = {"app": f"app{i}", "tier": "web"}
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {"name": f"app{i}", "namespace": "prod", "labels": labels},
+        "spec": {
+            "replicas": 1 + i % 5,
+            "selector": {"matchLabels": labels},
+            "template": {
+                "metadata": {"labels": labels},
+                "spec": {"containers": [
+                    {"name": "main", "image": f"registry/app:{i}", "imagePullPolicy": "IfNotPresent",
+                     "ports": [{"containerPort": 8080, "name": "http"}],
+                     "env": [{"name": "MODE", "value": "prod"}, {"name": "PORT", "value": "8080"}]},
+                    {"name": "sidecar", "image": "envoy:1.29", "args": ["--config", "/etc/envoy.yaml"]},
+                ]},
+            },
+        },
+    }
+
+
+def service_doc(i):
+    return {
+        "apiVersion": "v1",
+        "kind": "Service",
+        "metadata": {"name": f"app{i}-svc", "labels": {"app": f"app{i}"}},
+        "spec": {"type": "ClusterIP", "selector": {"app": f"app{i}"},
+                 "ports": [{"port": 80, "targetPort": "http", "protocol": "TCP"}]},
+    }
+
+
+def kafka_doc(i):
+    return {"cluster": {"zookeeper": "zookeeper:2181", "brokers": {
+        f"broker-{b}": {"broker.id": b, "listeners": f"PLAINTEXT://:{9092 + b}",
+                        "log.dirs": f"/kafka/logs-{b}", "environment": {"KAFKA_HEAP_OPTS": "-Xmx1G"}}
+        for b in range(3)}}}
+
+
+def make_documents(count):
+    makers = [compose_doc, deployment_doc, service_doc, kafka_doc]
+    return [makers[i % len(makers)](i) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=30_000, help="documents to validate")
+    args = parser.parse_args()
+
+    documents = make_documents(args.docs)
+    schemas = [detect_schema(doc) for doc in documents]
+
+    start = time.perf_counter()
+    for schema in SCHEMAS.values():
+        if schema.spec is not None:
+            compile_spec(schema.spec)
+    compile_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    invalid = sum(1 for doc, schema in zip(documents, schemas) if schema.errors(doc))
+    seconds = time.perf_counter() - start
+
+    rate = len(documents) / seconds * 60
+    print(f"compile all schemas       {compile_seconds * 1000:8.2f} ms (once per process)")
+    print(f"validate {len(documents)} docs      {seconds:8.3f} s  ({seconds / len(documents) * 1e6:.1f} us/doc)")
+    print(f"throughput                {rate:12,.0f} docs/min on one core "
+          f"(target {TARGET_PER_MINUTE:,}: {'ok' if rate >= TARGET_PER_MINUTE else 'MISSED'})")
+    assert invalid == 0, f"{invalid} generated documents failed validation"
+    return 0 if rate >= TARGET_PER_MINUTE else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Startup regression check: cold start time and what each entry point imports.
+
+Each case runs in a fresh interpreter several times; the median wall time
+must stay under its budget, and headless commands must not import the UI
+stack (rich, pyfiglet, containcraft.ui). The interactive menu has a larger
+budget because importing rich.console alone takes most of 100 ms on slow
+machines. Exits 1 on any regression, so it can run in CI. Run from the
+repository root:
+
+    python -m benchmarks.bench_startup [--runs 7]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+BUDGET_MS = 100
+INTERACTIVE_BUDGET_MS = 200
+
+UI_MODULES = ("rich", "pyfiglet", "containcraft.ui", "pygments")
+
+# (label, code run in a fresh interpreter, modules it must not import, budget in ms)
+CASES = [
+    ("contain --help", "import sys; sys.argv = ['contain', '--help']\n"
+                       "from containcraft.cli import main\n"
+                       "try:\n    main()\nexcept SystemExit:\n    pass", UI_MODULES, BUDGET_MS),
+    ("headless: validate", "import containcraft.cli, containcraft.batch.validate", UI_MODULES, BUDGET_MS),
+    ("headless: query", "import containcraft.cli, containcraft.batch.query", UI_MODULES, BUDGET_MS),
+    ("headless: generate", "import containcraft.cli, containcraft.batch.generate", UI_MODULES, BUDGET_MS),
+    ("interactive menu", "import containcraft.cli, containcraft.ui.menu, containcraft.yaml_cli.banner\n"
+                         "containcraft.yaml_cli.banner.print_ascii_banner()", ("pyfiglet", "pygments"), INTERACTIVE_BUDGET_MS),
+]
+
+_REPORT = "\nimport sys as _s; print(','.join(m for m in _s.modules))"
+
+
+def run_case(code: str, runs: int):
+    times = []
+    modules = set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code + _REPORT], capture_output=True, text=True, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+        modules = set(result.stdout.strip().splitlines()[-1].split(","))
+    return statistics.median(times), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per case")
+    args = parser.parse_args()
+
+    baseline, _ = run_case("pass", args.runs)
+    print(f"{'python -c pass':<22} {baseline:7.1f} ms  (interpreter baseline)")
+    failures = []
+    for label, code, forbidden, budget in CASES:
+        ms, modules = run_case(code, args.runs)
+        leaked = sorted(m for m in modules if m.split(".")[0] in forbidden or
+                        any(m == f or m.startswith(f + ".") for f in forbidden))
+        status = "ok"
+        if ms > budget:
+            status = f"OVER {budget} ms"
+            failures.append(label)
+        if leaked:
+            status += f"; imports {', '.join(leaked[:3])}{'...' if len(leaked) > 3 else ''}"
+            failures.append(label)
+        print(f"{label:<22} {ms:7.1f} ms  {status}")
+
+    from containcraft.yaml_cli.banner import BANNER, render_banner
+    if BANNER != render_banner():
+        print("banner: BANNER is stale; regenerate it with render_banner()")
+        failures.append("banner")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
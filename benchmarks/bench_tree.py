@@ -0,0 +1,62 @@
+"""Throughput of the non-recursive tree conversions and renderers.
+
+    python -m benchmarks.bench_tree [--nodes 1000000] [--depth 50000]
+"""
+import argparse
+import time
+
+from containcraft.core.renderer import iter_render_lines
+from containcraft.core.yaml_tree import YamlTree
+from containcraft.ui.tree_viewer import iter_view_lines
+
+
+def wide_document(n):
+    # ~5 nodes per service: the service mapping plus four scalar fields
+    return {"services": {f"svc-{i}": {"image": f"img:{i}", "restart": "always",
+                                      "replicas": i, "port": 8000 + i}
+                         for i in range(n // 5)}}
+
+
+def deep_document(depth):
+    root = cur = {}
+    for i in range(depth):
+        nxt = {}
+        cur[f"k{i}"] = nxt
+        cur = nxt
+    cur["leaf"] = 1
+    return root
+
+
+def timed(label, nodes, fn):
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    print(f"{label:<28} {seconds:7.2f} s  {nodes / seconds / 1e6:6.2f} M nodes/s")
+    return result
+
+
+def run(label, data):
+    tree = YamlTree()
+    start = time.perf_counter()
+    tree.load_from_dict(data)
+    build = time.perf_counter() - start
+    nodes = sum(1 for _ in iter_render_lines(tree.root))
+    print(f"{label}: {nodes} nodes")
+    print(f"{'  dict_to_tree':<28} {build:7.2f} s  {nodes / build / 1e6:6.2f} M nodes/s")
+    timed("  tree_to_dict", nodes, tree.tree_to_dict)
+    timed("  render_tree lines", nodes, lambda: sum(1 for _ in iter_render_lines(tree.root)))
+    timed("  view_tree lines", nodes, lambda: sum(1 for _ in iter_view_lines(tree.root)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--depth", type=int, default=50_000)
+    args = parser.parse_args()
+
+    run("wide", wide_document(args.nodes))
+    run("deep", deep_document(args.depth))
+
+
+if __name__ == "__main__":
+    main()
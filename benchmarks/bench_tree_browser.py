@@ -0,0 +1,77 @@
+"""Benchmark: frame time of the collapsible tree viewer on a huge document.
+
+Builds a document of --services services (eight tree lines each) and
+times the viewer's operations: laying out one frame at the top, collapsing and
+expanding the wide services mapping, jumping to a path in the middle, paging and
+drawing a frame there, and drawing the last page. The frame times should
+not grow with --services. For comparison, it also times rendering the whole
+tree as text, as the full tree view did. The same frames are then timed on
+a lazy tree read from a file, where collapsed subtrees are never parsed.
+Run from the repository root:
+
+    python -m benchmarks.bench_tree_browser [--services 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from containcraft.core.lazy_tree import load_lazy_tree
+from containcraft.core.renderer import render_tree
+from containcraft.core.yaml_io import save_yaml
+from containcraft.core.yaml_tree import YamlTree
+from containcraft.ui.tree_viewer import TreeBrowser
+
+from .bench_tree_edit import wide_services
+
+WIDTH = 120
+HEIGHT = 40
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<36}{(time.perf_counter() - start) * 1000:10.2f} ms")
+    return result
+
+
+def browse(tree, services):
+    browser = timed("open viewer", lambda: TreeBrowser(tree.root, HEIGHT))
+    timed("frame at the top", lambda: browser.lines(WIDTH))
+    # services is the single top-level key, so it is the root and opens expanded
+    timed("collapse services", lambda: browser.toggle(browser.frame()[0]))
+    timed("expand services again", lambda: browser.toggle(browser.frame()[0]))
+    timed("jump to a service in the middle", lambda: browser.jump(f"services.svc-{services // 2}.ports"))
+    timed("frame there", lambda: browser.lines(WIDTH))
+    timed("next page", lambda: browser.scroll(HEIGHT))
+    timed("frame there", lambda: browser.lines(WIDTH))
+    timed("last page", browser.scroll_to_end)
+    timed("frame there", lambda: browser.lines(WIDTH))
+    print(f"  {browser.total_rows()} visible rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, default=100_000, help="sibling services in the document")
+    args = parser.parse_args()
+
+    data = wide_services(args.services)
+    tree = YamlTree()
+    tree.load_from_dict(data)
+    print(f"full tree ({args.services} services)")
+    lines = timed("render every line (old full view)", lambda: render_tree(tree.root))
+    print(f"  {lines.count(chr(10)) + 1} lines")
+    browse(tree, args.services)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "huge.yaml")
+        save_yaml(path, data)
+        print("lazy tree read from the file")
+        lazy = timed("load lazy tree", lambda: load_lazy_tree(path))
+        browse(lazy, args.services)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Benchmark: random-access editing of a wide YamlTree by path.
+
+Runs a seeded mix of get / set / append / delete / rename operations on
+paths like services.svc-123.ports[1] in a document with tens of thousands
+of sibling services, through YamlTree's indexed path operations, and times
+a sample of the same lookups done by scanning children lists, which is how
+nodes were found before mappings were indexed. Run from the repository root:
+
+    python -m benchmarks.bench_tree_edit [--services 50000] [--ops 20000]
+"""
+import argparse
+import random
+import sys
+import time
+
+from containcraft.core.content_hash import value_digest
+from containcraft.core.yaml_tree import YamlTree
+
+# operations per op kind in the mix
+MIX = ("get", "get", "set", "set", "append", "delete", "rename")
+
+
+def wide_services(n, ports=4):
+    return {"services": {f"svc-{i}": {"image": f"img:{i}", "restart": "always",
+                                      "ports": [8000 + p for p in range(ports)]}
+                         for i in range(n)}}
+
+
+def linear_find(tree, parts):
+    """Find a node by scanning each children list, without the key index."""
+    node = tree.root
+    if node is None or node.key != parts[0]:
+        return None
+    for part in parts[1:]:
+        node = next((c for c in node.children if c.key == part), None)
+        if node is None:
+            return None
+    return node
+
+
+def make_ops(services, count, seed):
+    rng = random.Random(seed)
+    ops = []
+    for _ in range(count):
+        name = f"svc-{rng.randrange(services)}"
+        op = rng.choice(MIX)
+        if op == "get":
+            ops.append((op, ("services", name, "ports", rng.randrange(2)), None))
+        elif op == "set":
+            ops.append((op, ("services", name, "image"), f"img:{rng.randrange(1000)}"))
+        elif op == "append":
+            ops.append((op, ("services", name, "ports"), 9000))
+        elif op == "delete":
+            ops.append((op, ("services", name, "ports", -1), None))
+        else:
+            ops.append((op, ("services", name, "restart"), "restartPolicy"))
+    return ops
+
+
+def apply_ops(tree, ops):
+    done = 0
+    for op, parts, value in ops:
+        try:
+            if op == "get":
+                tree.get(parts)
+            elif op == "set":
+                tree.set(parts, value)
+            elif op == "append":
+                tree.append(parts, value)
+            elif op == "delete":
+                tree.delete(parts)
+            else:
+                tree.rename(parts, value)
+                tree.rename(parts[:-1] + (value,), parts[-1])
+        except (KeyError, IndexError):
+            # a list emptied by earlier deletes
+            continue
+        done += 1
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, default=50_000, help="sibling services in the document")
+    parser.add_argument("--ops", type=int, default=20_000, help="random operations to apply")
+    parser.add_argument("--linear-ops", type=int, default=200, help="lookups timed for the linear-scan baseline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = wide_services(args.services)
+    tree = YamlTree()
+    start = time.perf_counter()
+    tree.load_from_dict(data)
+    print(f"build tree ({args.services} services)  {time.perf_counter() - start:8.3f} s")
+    tree.digest()
+
+    ops = make_ops(args.services, args.ops, args.seed)
+    start = time.perf_counter()
+    done = apply_ops(tree, ops)
+    seconds = time.perf_counter() - start
+    indexed_us = seconds / len(ops) * 1e6
+    print(f"indexed path ops                {seconds:8.3f} s  {indexed_us:8.2f} us/op  ({done} applied)")
+
+    start = time.perf_counter()
+    digest = tree.digest()
+    print(f"rehash after edits              {time.perf_counter() - start:8.3f} s")
+    assert digest == value_digest(tree.tree_to_dict()), "tree digest disagrees with its dict"
+
+    lookups = [parts[:3] for _, parts, _ in ops[:args.linear_ops]]
+    start = time.perf_counter()
+    for parts in lookups:
+        tree.find(parts)
+    find_us = (time.perf_counter() - start) / len(lookups) * 1e6
+    start = time.perf_counter()
+    for parts in lookups:
+        linear_find(tree, parts)
+    linear_us = (time.perf_counter() - start) / len(lookups) * 1e6
+    print(f"find, indexed                   {find_us:8.2f} us/lookup")
+    print(f"find, scanning children         {linear_us:8.2f} us/lookup  ({linear_us / find_us:.0f}x slower)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Benchmark: one refresh of `contain load --watch` after a small edit.
+
+Writes a wide document, loads it as the watch view does, changes one value
+on disk and times each step of the refresh: re-parsing, rebuilding the
+tree, finding the changed paths by subtree hash, and rendering, both in
+full (render_tree) and through IncrementalRenderer, which re-formats only
+the changed subtrees. Run from the repository root:
+
+    python -m benchmarks.bench_watch [--services 20000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from containcraft.core.renderer import IncrementalRenderer, render_tree
+from containcraft.core.yaml_io import load_yaml, save_yaml
+from containcraft.core.yaml_tree import YamlTree
+
+from .bench_tree_edit import wide_services
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<34}{(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def build(data):
+    tree = YamlTree()
+    tree.load_from_dict(data)
+    return tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, default=20_000, help="sibling services in the document")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "watched.yaml")
+        data = wide_services(args.services)
+        save_yaml(path, data)
+        tree = build(load_yaml(path, cache=False))
+        renderer = IncrementalRenderer()
+        renderer.render(tree.root)
+
+        data["services"][f"svc-{args.services // 2}"]["image"] = "img:edited"
+        save_yaml(path, data)
+        print(f"refresh after one edit ({args.services} services)")
+        new_data = timed("parse", lambda: load_yaml(path, cache=False))
+        new_tree = timed("build tree", lambda: build(new_data))
+        changed = timed("hash tree, find changed paths", lambda: list(new_tree.changed_paths(tree)))
+        full = timed("render, full", lambda: render_tree(new_tree.root).split("\n"))
+        lines = timed("render, incremental", lambda: renderer.render(new_tree.root))
+        assert lines == full, "incremental render differs from render_tree"
+        print(f"changed: {changed}; re-rendered {renderer.rendered} subtrees, reused {renderer.reused}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Reproducible synthetic YAML documents for the benchmarks.
+
+Every generator is a pure function of its size arguments and seed, so two
+runs (or two commits) benchmark exactly the same data. Scalars are a mix of
+strings, ints, floats, booleans and nulls, the types real manifests hold.
+
+    wide_document(nodes)           many sibling mappings, shallow
+    deep_document(depth)           one long chain of nested mappings
+    list_document(nodes)           sequences of mappings and scalar lists
+    multi_documents(docs, nodes)   a '---' stream of Kubernetes-like objects
+"""
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+# label -> (wide/list nodes, deep depth, stream documents, nodes per document)
+SIZES = {
+    "small": (20_000, 100, 100, 200),
+    "medium": (200_000, 300, 1_000, 200),
+    "large": (1_000_000, 600, 5_000, 200),
+}
+
+
+def _scalar(rng: random.Random, i: int) -> Any:
+    kind = rng.randrange(6)
+    if kind == 0:
+        return i
+    if kind == 1:
+        return f"value-{i}-{rng.randrange(1000)}"
+    if kind == 2:
+        return rng.random() < 0.5
+    if kind == 3:
+        return round(rng.random() * 1000, 3)
+    if kind == 4:
+        return None
+    return f"registry.example.com/team-{i % 17}/app:{rng.randrange(100)}"
+
+
+def wide_document(nodes: int, seed: int = 0) -> Dict[str, Any]:
+    """About nodes nodes: services with five scalar fields each."""
+    rng = random.Random(seed)
+    return {"services": {
+        f"svc-{i}": {"image": _scalar(rng, i), "restart": "always", "replicas": i,
+                     "port": 8000 + i % 1000, "enabled": rng.random() < 0.9}
+        for i in range(max(1, nodes // 6))
+    }}
+
+
+def deep_document(depth: int, seed: int = 0) -> Dict[str, Any]:
+    """A chain of depth nested mappings, each with a few scalar siblings.
+
+    Kept to a few hundred levels by default: PyYAML composes and represents
+    recursively, so much deeper documents cannot be loaded or saved at all.
+    """
+    rng = random.Random(seed)
+    root = cur = {}
+    for i in range(depth):
+        nxt: Dict[str, Any] = {}
+        cur.update({"name": f"level-{i}", "value": _scalar(rng, i), "child": nxt})
+        cur = nxt
+    cur["leaf"] = True
+    return root
+
+
+def list_document(nodes: int, seed: int = 0) -> Dict[str, Any]:
+    """About nodes nodes, mostly inside sequences."""
+    rng = random.Random(seed)
+    items: List[Any] = []
+    for i in range(max(1, nodes // 12)):
+        items.append({"id": i, "tags": [f"t{rng.randrange(50)}" for _ in range(3)],
+                      "ports": [8000 + i % 1000, 9000 + i % 1000],
+                      "env": [{"name": "MODE", "value": _scalar(rng, i)}]})
+    return {"items": items}
+
+
+def k8s_object(i: int, nodes: int, rng: random.Random) -> Dict[str, Any]:
+    """A Deployment-shaped document padded with annotations to about nodes nodes."""
+    labels = {"app": f"app{i}", "tier": "web"}
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {"name": f"app{i}", "labels": labels,
+                     "annotations": {f"note/{j}": _scalar(rng, j) for j in range(max(0, nodes - 30))}},
+        "spec": {
+            "replicas": 1 + i % 5,
+            "selector": {"matchLabels": dict(labels)},
+            "template": {
+                "metadata": {"labels": dict(labels)},
+                "spec": {"containers": [
+                    {"name": "main", "image": f"registry/app:{i}",
+                     "ports": [{"containerPort": 8080, "name": "http"}],
+                     "env": [{"name": "MODE", "value": "prod"}, {"name": "PORT", "value": "8080"}]},
+                ]},
+            },
+        },
+    }
+
+
+def multi_documents(docs: int, nodes: int = 200, seed: int = 0) -> List[Dict[str, Any]]:
+    """docs Kubernetes-like documents of about nodes nodes each."""
+    rng = random.Random(seed)
+    return [k8s_object(i, nodes, rng) for i in range(docs)]
+
+
+def shapes(size: str = "small", seed: int = 0) -> Iterator[Tuple[str, List[Any]]]:
+    """(shape name, documents) for every shape at a preset size."""
+    nodes, depth, docs, per_doc = SIZES[size]
+    yield "wide", [wide_document(nodes, seed)]
+    yield "deep", [deep_document(depth, seed)]
+    yield "list", [list_document(nodes, seed)]
+    yield "multi", multi_documents(docs, per_doc, seed)
+
+
+def count_nodes(data: Any) -> int:
+    """Mappings, sequences and scalars, counted without recursion."""
+    count = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+def sample_paths(data: Any, k: int) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+    """Up to k leaf paths spread evenly over data, and up to k sequence paths.
+
+    Paths come out in document order, so deleting them in reverse never
+    shifts the index of a path that is still to be deleted.
+    """
+    stride = max(1, count_nodes(data) // max(1, k))
+    leaves: List[Tuple[Any, ...]] = []
+    sequences: List[Tuple[Any, ...]] = []
+    seen = 0
+    stack: List[Tuple[Tuple[Any, ...], Any]] = [((), data)]
+    while stack:
+        parts, value = stack.pop()
+        seen += 1
+        if isinstance(value, dict):
+            stack.extend(((*parts, key), child) for key, child in reversed(list(value.items())))
+        elif isinstance(value, list):
+            if len(sequences) < k:
+                sequences.append(parts)
+            stack.extend(((*parts, i), child) for i, child in reversed(list(enumerate(value))))
+        elif parts and seen % stride == 0 and len(leaves) < k:
+            leaves.append(parts)
+    return leaves, sequences
@@ -0,0 +1,323 @@
+"""Benchmark suite: time and peak memory of every core path on synthetic YAML.
+
+Runs each case on the wide, deep, list-heavy and multi-document shapes from
+benchmarks.generators and reports the best of --repeat runs plus the peak
+memory of one traced run (tracemalloc, bytes allocated above the starting
+point). Results can be written to JSON and compared with a saved run from
+another commit; a case that got slower or hungrier by more than the
+threshold is reported as a regression and the exit status is 1. Run from the
+repository root:
+
+    python -m benchmarks.suite --size small --output before.json
+    python -m benchmarks.suite --size small --baseline before.json [--threshold 0.15]
+    python -m benchmarks.suite --results after.json --baseline before.json
+    python -m benchmarks.suite --only deep --only '*/load_yaml'
+
+Cases:
+    load_yaml / save_yaml       yaml_io, through a temp file (parsing, not the cache)
+    cache_memory / cache_disk   load_yaml's document cache hitting its memory or disk
+                                tier (single-document shapes)
+    dict_to_tree                YamlTree.dict_to_tree
+    load_from_dict              YamlTree.load_from_dict
+    tree_to_dict                YamlTree.tree_to_dict
+    render_tree / view_tree     core.renderer and ui.tree_viewer
+    edit_history                assoc_in / append_in / dissoc_in edits committed
+                                to EditHistory, then undone and redone
+    edit_deepcopy               the same edits with a deepcopy snapshot per edit,
+                                the history model the editor used before
+    tree_edit                   the same edits through YamlTree's path operations on
+                                a hashed tree, then the incremental rehash
+"""
+import argparse
+import copy
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from containcraft.core.doc_cache import DocumentCache
+from containcraft.core.renderer import render_tree
+from containcraft.core.yaml_io import (YAML_BACKEND, iter_yaml_documents, load_yaml, loads_yaml, save_yaml,
+                                       save_yaml_documents)
+from containcraft.core.yaml_path import resolve_key
+from containcraft.core.yaml_tree import YamlTree
+from containcraft.edit.history import EditHistory
+from containcraft.edit.persistent import append_in, assoc_in, dissoc_in
+from containcraft.ui.tree_viewer import view_tree
+
+from .generators import SIZES, count_nodes, sample_paths, shapes
+
+RESULTS_VERSION = 1
+
+# Differences below these floors are noise whatever the ratio says
+TIME_FLOOR_SECONDS = 0.002
+MEMORY_FLOOR_BYTES = 256 * 1024
+
+# A case is (name, setup, run): setup() builds the input outside the
+# measurement and run(state) is what gets timed; run may return a dict of
+# extra metrics to record alongside time and memory.
+Case = Tuple[str, Callable[[], Any], Callable[[Any], Dict[str, Any] | None]]
+
+
+def _trees(documents: List[Any]) -> List[YamlTree]:
+    trees = []
+    for doc in documents:
+        tree = YamlTree()
+        tree.load_from_dict(doc)
+        trees.append(tree)
+    return trees
+
+
+def _persistent_edits(target: Any, leaves, sequences) -> Dict[str, Any]:
+    history = EditHistory(target, max_bytes=None)
+    for parts in leaves:
+        history.commit(*assoc_in(history.current, parts, "edited"))
+    for parts in sequences:
+        history.commit(*append_in(history.current, parts, {"added": True}))
+    for parts in reversed(leaves):
+        history.commit(*dissoc_in(history.current, parts))
+    while history.undo():
+        pass
+    while history.redo():
+        pass
+    return {"edits": len(leaves) * 2 + len(sequences), "history_bytes": history.bytes_used}
+
+
+def _deepcopy_edits(target: Any, leaves, sequences) -> Dict[str, Any]:
+    undo: List[Any] = []
+    working = copy.deepcopy(target)
+
+    def parent_of(parts):
+        node = working
+        for p in parts[:-1]:
+            node = node[resolve_key(node, p)]
+        return node
+
+    for parts in leaves:
+        undo.append(copy.deepcopy(working))
+        parent = parent_of(parts)
+        parent[resolve_key(parent, parts[-1])] = "edited"
+    for parts in sequences:
+        undo.append(copy.deepcopy(working))
+        node = working
+        for p in parts:
+            node = node[resolve_key(node, p)]
+        node.append({"added": True})
+    for parts in reversed(leaves):
+        undo.append(copy.deepcopy(working))
+        parent = parent_of(parts)
+        del parent[resolve_key(parent, parts[-1])]
+    redo = []
+    while undo:
+        redo.append(working)
+        working = undo.pop()
+    return {"edits": len(leaves) * 2 + len(sequences)}
+
+
+def _hashed_tree(document: Any) -> YamlTree:
+    tree = _trees([document])[0]
+    tree.digest()
+    return tree
+
+
+def _tree_edits(tree: YamlTree, leaves, sequences) -> Dict[str, Any]:
+    for parts in leaves:
+        tree.set(parts, "edited")
+    for parts in sequences:
+        tree.append(parts, {"added": True})
+    for parts in reversed(leaves):
+        tree.delete(parts)
+    tree.digest()
+    return {"edits": len(leaves) * 2 + len(sequences)}
+
+
+def _primed_cache(path: str, disk_dir: str | None) -> DocumentCache:
+    # old enough that the memory tier trusts the file's mtime
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    cache = DocumentCache(disk_dir, memory_max_bytes=0 if disk_dir else 1 << 40)
+    cache.load(path, loads_yaml)
+    return cache
+
+
+def _not_cached(text: str):
+    raise AssertionError("document cache missed")
+
+
+def iter_cases(shape: str, documents: List[Any], workdir: str, edits: int) -> Iterator[Case]:
+    path = os.path.join(workdir, f"{shape}.yaml")
+    out = os.path.join(workdir, f"{shape}-out.yaml")
+    multi = len(documents) > 1
+    if multi:
+        save_yaml_documents(path, documents)
+        yield "load_yaml", lambda: path, lambda p: {"documents": sum(1 for _ in iter_yaml_documents(p))}
+        yield "save_yaml", lambda: documents, lambda docs: save_yaml_documents(out, docs)
+    else:
+        save_yaml(path, documents[0])
+        yield "load_yaml", lambda: path, lambda p: load_yaml(p, cache=False) and None
+        yield "save_yaml", lambda: documents[0], lambda doc: save_yaml(out, doc)
+        cache_dir = os.path.join(workdir, f"{shape}-cache")
+        yield "cache_memory", lambda: _primed_cache(path, None), lambda c: c.load(path, _not_cached) and None
+        yield "cache_disk", lambda: _primed_cache(path, cache_dir), lambda c: c.load(path, _not_cached) and None
+
+    yield "dict_to_tree", lambda: documents, lambda docs: [YamlTree().dict_to_tree("root", d) for d in docs] and None
+    yield "load_from_dict", lambda: documents, lambda docs: _trees(docs) and None
+    yield "tree_to_dict", lambda: _trees(documents), lambda trees: [t.tree_to_dict() for t in trees] and None
+    yield "render_tree", lambda: _trees(documents), lambda trees: {"chars": sum(len(render_tree(t.root)) for t in trees)}
+    yield "view_tree", lambda: _trees(documents), lambda trees: {"lines": sum(len(view_tree(t.root)) for t in trees)}
+
+    target = documents if multi else documents[0]
+    leaves, sequences = sample_paths(target, edits)
+    yield "edit_history", lambda: target, lambda t: _persistent_edits(t, leaves, sequences)
+    yield "edit_deepcopy", lambda: target, lambda t: _deepcopy_edits(t, leaves, sequences)
+    yield "tree_edit", lambda: _hashed_tree(target), lambda tree: _tree_edits(tree, leaves, sequences)
+
+
+def measure(setup: Callable[[], Any], run: Callable[[Any], Any], repeat: int, memory: bool) -> Dict[str, Any]:
+    best = None
+    extra = None
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        extra = run(state)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    result: Dict[str, Any] = {"seconds": best}
+    if memory:
+        state = setup()
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_bytes"] = peak - base
+    if extra:
+        result.update(extra)
+    return result
+
+
+def run_suite(size: str, repeat: int, memory: bool, edits: int, seed: int,
+              only: List[str]) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="containcraft-bench-") as workdir:
+        for shape, documents in shapes(size, seed):
+            nodes = sum(count_nodes(doc) for doc in documents)
+            for name, setup, run in iter_cases(shape, documents, workdir, edits):
+                key = f"{shape}/{name}"
+                if only and not any(o in (shape, name) or fnmatch.fnmatchcase(key, o) for o in only):
+                    continue
+                try:
+                    result = measure(setup, run, repeat, memory)
+                except RecursionError:
+                    # deepcopy and PyYAML recurse per nesting level
+                    result = {"skipped": "RecursionError"}
+                    print(f"{key:<26} skipped (recursion limit)")
+                else:
+                    print(_format_result(key, result, nodes))
+                result["nodes"] = nodes
+                results[key] = result
+    return results
+
+
+def _format_result(key: str, result: Dict[str, Any], nodes: int) -> str:
+    seconds = result["seconds"]
+    line = f"{key:<26} {seconds * 1000:10.2f} ms {nodes / seconds / 1e6 if seconds else 0:8.2f} M nodes/s"
+    if "peak_bytes" in result:
+        line += f" {result['peak_bytes'] / 1e6:9.2f} MB peak"
+    if "history_bytes" in result:
+        line += f"  (history {result['history_bytes'] / 1e3:.1f} kB for {result['edits']} edits)"
+    return line
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a side-by-side report and return the regressed cases."""
+    regressions = []
+    old_results, new_results = baseline["results"], current["results"]
+    print(f"\ncomparing {current['meta'].get('commit') or 'this run'} against "
+          f"{baseline['meta'].get('commit') or 'baseline'} (threshold {threshold:.0%})")
+    for key in new_results:
+        old, new = old_results.get(key), new_results[key]
+        if old is None or "seconds" not in old or "seconds" not in new:
+            continue
+        notes = []
+        for metric, floor, unit, scale in (("seconds", TIME_FLOOR_SECONDS, "ms", 1000),
+                                           ("peak_bytes", MEMORY_FLOOR_BYTES, "MB", 1e-6)):
+            if metric not in old or metric not in new:
+                continue
+            before, after = old[metric], new[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = change > threshold and after - before > floor
+            if regressed:
+                regressions.append(f"{key} {metric}")
+            notes.append(f"{before * scale:9.2f} -> {after * scale:9.2f} {unit} {change:+7.1%}"
+                         + (" REGRESSION" if regressed else ""))
+        print(f"{key:<26} " + "  ".join(notes))
+    missing = sorted(set(old_results) - set(new_results))
+    if missing:
+        print(f"not in this run: {', '.join(missing)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="preset document sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument("--edits", type=int, default=20, help="paths edited by the edit cases")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated values")
+    parser.add_argument("--only", action="append", default=[], metavar="PATTERN",
+                        help="run only matching cases: a shape, a case name or a shape/name glob (repeatable)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run per case")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against results saved by --output")
+    parser.add_argument("--results", metavar="FILE", help="compare these saved results instead of running")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown or memory growth counted as a regression")
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        meta = {"commit": _git_commit(), "python": platform.python_version(), "platform": platform.platform(),
+                "yaml_backend": YAML_BACKEND, "size": args.size, "repeat": args.repeat,
+                "edits": args.edits, "seed": args.seed}
+        print(f"size {args.size}, best of {args.repeat}, YAML backend {YAML_BACKEND}")
+        current = {"version": RESULTS_VERSION, "meta": meta,
+                   "results": run_suite(args.size, args.repeat, not args.no_memory,
+                                        args.edits, args.seed, args.only)}
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("version") != RESULTS_VERSION:
+        print(f"{args.baseline}: results format {baseline.get('version')} is not {RESULTS_VERSION}")
+        return 2
+    for key in ("size", "seed", "edits"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"warning: baseline {key} {baseline['meta'].get(key)!r} differs from {current['meta'].get(key)!r}")
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{len(regressions)} regression(s)" + (f": {', '.join(regressions)}" if regressions else ""))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import difflib
+import glob
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import yaml
+from ..core.yaml_io import SafeLoader, atomic_open, document_label, dumps_yaml_all, load_yaml
+from ..core.content_hash import HashMemo, documents_differ
+from ..core.yaml_path import compile_path
+from ..core.yaml_writer import render_edits
+from ..edit.persistent import assoc_in, dissoc_in, append_in
+
+# A patch file is a YAML list of operations (optionally under an
+# "operations" key). Paths use the editor's syntax (see core.yaml_path):
+#
+#   - op: set
+#     path: services.web.image
+#     value: nginx:1.27
+#   - op: append
+#     path: services.web.ports
+#     value: "8443:443"
+#   - op: delete
+#     path: services.web.environment.DEBUG
+#   - op: set
+#     path: spec.replicas
+#     value: 3
+#     match: Deployment/web      # only documents with this kind/name
+#
+# Each operation is applied to every document of a file where its target
+# exists (for set: where the parent exists). A file fails if an operation
+# applies to none of its documents.
+
+OPERATIONS = ("set", "append", "delete")
+
+Operation = Tuple[str, str, Any, str | None]
+
+
+def load_patch(path: str) -> List[Operation]:
+    """Read and check a patch file; raises ValueError on malformed entries."""
+    raw = load_yaml(path)
+    if isinstance(raw, dict):
+        raw = raw.get("operations")
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"{path}: expected a list of operations")
+
+    operations = []
+    for i, entry in enumerate(raw):
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: operation {i} is not a mapping")
+        op = entry.get("op")
+        target = entry.get("path")
+        if op not in OPERATIONS:
+            raise ValueError(f"{path}: operation {i} has unknown op {op!r} (expected one of {', '.join(OPERATIONS)})")
+        if not isinstance(target, str) or not target:
+            raise ValueError(f"{path}: operation {i} needs a path")
+        if op != "delete" and "value" not in entry:
+            raise ValueError(f"{path}: operation {i} ({op}) needs a value")
+        compile_path(target)  # surface syntax errors before any file is touched
+        operations.append((op, target, entry.get("value"), entry.get("match")))
+    return operations
+
+
+def expand_files(patterns: Iterable[str]) -> List[str]:
+    """Expand glob patterns (** is recursive); plain paths are kept as given."""
+    files: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            if match not in seen and not os.path.isdir(match):
+                seen.add(match)
+                files.append(match)
+    return files
+
+
+def _apply_one(doc: Any, op: str, target: str, value: Any) -> Any:
+    parts = compile_path(target).parts
+    if op == "set":
+        return assoc_in(doc, parts, value)[0]
+    if op == "append":
+        return append_in(doc, parts, value)[0]
+    return dissoc_in(doc, parts)[0]
+
+
+def apply_operations(documents: List[Any], operations: List[Operation]) -> List[Any]:
+    """Return new documents with every operation applied (inputs untouched)."""
+    documents = list(documents)
+    for op, target, value, match in operations:
+        applied = 0
+        errors = []
+        for i, doc in enumerate(documents):
+            if match is not None and document_label(doc) != match:
+                continue
+            try:
+                documents[i] = _apply_one(doc, op, target, value)
+                applied += 1
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                errors.append(str(e))
+        if not applied:
+            reason = f": {errors[0]}" if errors else ""
+            where = f" in {match}" if match is not None else ""
+            raise ValueError(f"{op} {target}{where} matched no document{reason}")
+    return documents
+
+
+def apply_to_file(path: str, operations: List[Operation], dry_run: bool = False) -> Dict[str, Any]:
+    """Apply operations to one file. Runs inside pool workers, so it never raises."""
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"path": path, "status": "unchanged", "error": None, "diff": None}
+    try:
+        with open(path, 'r') as f:
+            before_text = f.read()
+        documents = list(yaml.load_all(before_text, Loader=SafeLoader))
+        updated = apply_operations(documents, operations)
+        # digests rather than ==, which would call 1 -> true "unchanged"
+        memo = HashMemo()
+        if any(documents_differ(a, b, memo) for a, b in zip(documents, updated)):
+            after_text = render_documents(before_text, documents, updated)
+            result["status"] = "changed"
+            if dry_run:
+                result["diff"] = "".join(difflib.unified_diff(
+                    before_text.splitlines(keepends=True), after_text.splitlines(keepends=True),
+                    fromfile=f"a/{path}", tofile=f"b/{path}"))
+            else:
+                with atomic_open(path) as f:
+                    f.write(after_text)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def render_documents(text: str, documents: List[Any], updated: List[Any]) -> str:
+    """New file text: edited documents are rewritten in place where possible (see core.yaml_writer)."""
+    memo = HashMemo()
+    for index, (before, after) in enumerate(zip(documents, updated)):
+        if documents_differ(before, after, memo):
+            rendered = render_edits(text, before, after, index)
+            if rendered is None:
+                return dumps_yaml_all(updated)
+            text = rendered
+    return text
+
+
+def _apply_star(args):
+    return apply_to_file(*args)
+
+
+def _apply_chunk(tasks):
+    return [apply_to_file(*args) for args in tasks]
+
+
+def _completed(pool, tasks, chunksize: int) -> Iterator[Dict[str, Any]]:
+    """Results of tasks in chunks, in the order the chunks finish, so a slow file holds up only its chunk."""
+    from concurrent.futures import as_completed
+    futures = [pool.submit(_apply_chunk, tasks[i:i + chunksize]) for i in range(0, len(tasks), chunksize)]
+    for future in as_completed(futures):
+        yield from future.result()
+
+
+def run_apply(patch_path: str, patterns: List[str], dry_run: bool = False, jobs: int | None = None) -> int:
+    """Entry point for `contain apply`; returns the process exit code."""
+    try:
+        operations = load_patch(patch_path)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"error: {e}")
+        return 2
+
+    files = expand_files(patterns)
+    if not files:
+        print("error: no files matched")
+        return 2
+
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [(f, operations, dry_run) for f in files]
+    if jobs == 1 or len(files) == 1:
+        counts = _report(map(_apply_star, tasks), dry_run)
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing is slow to import
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+            chunksize = max(1, len(files) // (jobs * 4))
+            counts = _report(_completed(pool, tasks, chunksize), dry_run)
+
+    verb = "would change" if dry_run else "changed"
+    print(f"\n{len(files)} files: {counts['changed']} {verb}, {counts['unchanged']} unchanged, {counts['failed']} failed")
+    return 1 if counts["failed"] else 0
+
+
+def _report(results: Iterable[Dict[str, Any]], dry_run: bool) -> Dict[str, int]:
+    """
+    Print one line per file (plus the diff in dry-run mode) as results
+    arrive: in file order with one process, in completion order with several.
+    """
+    counts = {"changed": 0, "unchanged": 0, "failed": 0}
+    for result in results:
+        status = result["status"]
+        counts[status] += 1
+        if status == "failed":
+            print(f"{'failed':<12} {result['path']}: {result['error']}")
+            continue
+        label = "would change" if dry_run and status == "changed" else status
+        print(f"{label:<12} {result['path']}")
+        if result["diff"]:
+            print(result["diff"], end="")
+    return counts
@@ -0,0 +1,51 @@
+import json
+from typing import Any, Dict, List
+import yaml
+from ..core.yaml_diff import ADDED, REMOVED, DiffEntry, diff_documents, format_entry
+from ..core.yaml_io import document_label, iter_yaml_documents
+
+_ABSENT = object()
+
+
+def diff_files(path_a: str, path_b: str) -> List[Dict[str, Any]]:
+    """Per-document differences between two YAML files, paired by position."""
+    docs_a = list(iter_yaml_documents(path_a))
+    docs_b = list(iter_yaml_documents(path_b))
+    result = []
+    for index in range(max(len(docs_a), len(docs_b))):
+        a = docs_a[index] if index < len(docs_a) else _ABSENT
+        b = docs_b[index] if index < len(docs_b) else _ABSENT
+        if a is _ABSENT:
+            entries = [DiffEntry(ADDED, (), new=b)]
+        elif b is _ABSENT:
+            entries = [DiffEntry(REMOVED, (), old=a)]
+        else:
+            entries = diff_documents(a, b)
+        if entries:
+            label = document_label(b if a is _ABSENT else a)
+            result.append({"document": index, "label": label, "entries": entries})
+    return result
+
+
+def run_diff(path_a: str, path_b: str, output: str = "text", width: int = 60) -> int:
+    """Entry point for `contain diff`; exit code 0 if equal, 1 if different, 2 on error."""
+    try:
+        documents = diff_files(path_a, path_b)
+    except (OSError, yaml.YAMLError) as e:
+        print(f"error: {e}")
+        return 2
+
+    if output == "json":
+        print(json.dumps([{"document": d["document"], "label": d["label"],
+                           "changes": [e.to_dict() for e in d["entries"]]} for d in documents],
+                         indent=2, default=str))
+    elif documents:
+        print(f"--- {path_a}\n+++ {path_b}")
+        many = len(documents) > 1 or documents[0]["document"] > 0
+        for doc in documents:
+            if many:
+                label = f" ({doc['label']})" if doc["label"] else ""
+                print(f"@@ document {doc['document']}{label}")
+            for entry in doc["entries"]:
+                print(format_entry(entry, width))
+    return 1 if documents else 0
@@ -0,0 +1,218 @@
+import itertools
+import os
+import string
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+import yaml
+from ..core.interning import InternTable
+from ..core.yaml_io import load_yaml, save_yaml_documents, write_yaml_documents
+from ..schemas.base_schema import BaseSchema
+from ..schemas.registry import schema_by_name
+
+# A parameter file describes many documents at once:
+#
+#   schema: kafka                  # docker-compose | kubernetes | kafka
+#   output: kafka/cluster.yaml     # may use variables: "out/{env}/app-{app}.yaml"; "-" is stdout
+#   matrix:                        # every combination, first axis slowest
+#     broker: {from: 1, to: 300}
+#   zip:                           # advance once per combination
+#     port: {from: 9092}
+#   document:                      # document-level parameters
+#     zookeeper: zookeeper:2181
+#   item:                          # one broker / service / Kubernetes object per combination
+#     id: "{broker}"
+#     port: "{port}"
+#     log_dir: "/kafka/logs-{broker}"
+#
+# Strings in document, item and output are str.format templates over the
+# axis variables and index (the running combination number); a string that
+# is exactly "{name}" keeps the variable's type, and "{{" / "}}" are literal
+# braces. The rendered parameters go through the schema's build(), the code
+# the interactive prompts use, so generated documents are shaped the same.
+# Items sharing an output file become one document for schemas that collect
+# items (Compose services, Kafka brokers) and one document each otherwise.
+
+Render = Callable[[Dict[str, Any]], Any]
+
+
+def axis_values(name: str, spec: Any, bounded: bool = True) -> Iterator[Any]:
+    """Values of one axis: a list, a single value or a {from, to, step} range (to is inclusive)."""
+    if isinstance(spec, list):
+        return iter(spec)
+    if not isinstance(spec, dict):
+        return iter([spec])
+    start, stop, step = spec.get("from", 0), spec.get("to"), spec.get("step", 1)
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (start, step)) or step == 0:
+        raise ValueError(f"axis {name!r}: from and step must be integers and step non-zero")
+    if stop is None:
+        if bounded:
+            raise ValueError(f"axis {name!r}: matrix ranges need 'to'")
+        return itertools.count(start, step)
+    if not isinstance(stop, int) or isinstance(stop, bool):
+        raise ValueError(f"axis {name!r}: to must be an integer")
+    return iter(range(start, stop + (1 if step > 0 else -1), step))
+
+
+def iter_combinations(matrix: Dict[str, Any], zipped: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Variables for every combination of the matrix axes, with the zip axes advancing alongside."""
+    names = list(matrix)
+    axes = [list(axis_values(name, matrix[name])) for name in names]
+    counters = {name: axis_values(name, spec, bounded=False) for name, spec in zipped.items()}
+    for index, combination in enumerate(itertools.product(*axes)):
+        variables = dict(zip(names, combination))
+        variables["index"] = index
+        for name, values in counters.items():
+            value = next(values, _END)
+            if value is _END:
+                raise ValueError(f"zip axis {name!r} ran out of values after {index} combinations")
+            variables[name] = value
+        yield variables
+
+
+_END = object()
+
+
+def compile_template(template: Any) -> Render:
+    """Compile a template value into render(variables); strings are parsed once."""
+    if isinstance(template, str):
+        pieces = list(string.Formatter().parse(template))
+        if not any(field is not None for _, field, _, _ in pieces):
+            text = template.replace("{{", "{").replace("}}", "}")
+            return lambda variables: text
+        if len(pieces) == 1 and pieces[0][0] == "" and not pieces[0][2] and not pieces[0][3]:
+            name = pieces[0][1]
+            return lambda variables: _lookup(variables, name)
+        return lambda variables: template.format_map(_Variables(variables))
+    if isinstance(template, dict):
+        entries = [(compile_template(k), compile_template(v)) for k, v in template.items()]
+        return lambda variables: {k(variables): v(variables) for k, v in entries}
+    if isinstance(template, list):
+        items = [compile_template(item) for item in template]
+        return lambda variables: [item(variables) for item in items]
+    return lambda variables: template
+
+
+def _lookup(variables: Dict[str, Any], name: str) -> Any:
+    try:
+        return variables[name]
+    except KeyError:
+        raise _unknown(variables, name) from None
+
+
+def _unknown(variables: Dict[str, Any], name: str) -> ValueError:
+    return ValueError(f"unknown variable {{{name}}} (have: {', '.join(variables)})")
+
+
+class _Variables(dict):
+    def __missing__(self, name):
+        raise _unknown(self, name)
+
+
+def load_params(path: str) -> Tuple[BaseSchema, Dict[str, Any]]:
+    """Read and check a parameter file; raises ValueError on problems."""
+    params = load_yaml(path)
+    if not isinstance(params, dict):
+        raise ValueError(f"{path}: expected a mapping")
+    schema = schema_by_name(str(params.get("schema")))
+    if schema is None or not schema.can_build:
+        raise ValueError(f"{path}: schema must be one of docker-compose, kubernetes, kafka")
+    for key in ("matrix", "zip", "document", "item"):
+        if not isinstance(params.get(key) or {}, dict):
+            raise ValueError(f"{path}: {key} must be a mapping")
+    return schema, params
+
+
+def generate_documents(schema: BaseSchema, params: Dict[str, Any],
+                       output: str | None = None) -> Dict[str, List[Tuple[Dict[str, Any], Any]]]:
+    """
+    Render every combination, grouped by output file in first-seen order.
+
+    Returns output path -> list of (variables, item parameters); the
+    documents themselves are built while writing (see iter_built).
+    """
+    render_output = compile_template(output or params.get("output") or "-")
+    render_item = compile_template(params.get("item") or {})
+    groups: Dict[str, List[Tuple[Dict[str, Any], Any]]] = {}
+    for variables in iter_combinations(params.get("matrix") or {}, params.get("zip") or {}):
+        path = str(render_output(variables))
+        groups.setdefault(path, []).append((variables, render_item(variables)))
+    return groups
+
+
+def iter_built(schema: BaseSchema, params: Dict[str, Any], entries: List[Tuple[Dict[str, Any], Any]]) -> Iterator[Dict[str, Any]]:
+    """The documents of one output file, built one at a time."""
+    render_document = compile_template(params.get("document") or {})
+    if schema.item_key is not None:
+        document = render_document(entries[0][0])
+        document[schema.item_key] = [item for _, item in entries]
+        yield schema.build(document)
+        return
+    for variables, item in entries:
+        yield schema.build({**render_document(variables), **item})
+
+
+def run_generate(param_file: str, output: str | None = None, validate: bool = True, dry_run: bool = False,
+                 anchors: bool = False) -> int:
+    """
+    Entry point for `contain generate`; returns the process exit code.
+
+    With anchors, each document is hash-consed through an InternTable and
+    its repeated blocks are written once with a YAML anchor. Anchors never
+    cross documents, so the table is cleared between them and memory stays
+    bounded by the largest document, as without anchors.
+    """
+    start = time.perf_counter()
+    try:
+        schema, params = load_params(param_file)
+        groups = generate_documents(schema, params, output)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    counts = {"documents": 0, "invalid": 0}
+    table = InternTable() if anchors else None
+
+    def checked(documents: Iterator[Dict[str, Any]], path: str) -> Iterator[Dict[str, Any]]:
+        for i, document in enumerate(documents):
+            counts["documents"] += 1
+            if validate:
+                errors = schema.errors(document)
+                if errors:
+                    counts["invalid"] += 1
+                    for error in errors[:5]:
+                        print(f"invalid  {path}[{i}]: {error}", file=sys.stderr)
+            if table is None:
+                yield document
+            else:
+                # the previous document has been written by now
+                table.clear()
+                yield table.intern(document)
+
+    try:
+        for path, entries in groups.items():
+            documents = checked(iter_built(schema, params, entries), path)
+            if dry_run:
+                for _ in documents:
+                    pass
+            elif path == "-":
+                write_yaml_documents(sys.stdout, documents, table)
+            else:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                save_yaml_documents(path, documents, table)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    seconds = time.perf_counter() - start
+    files = [p for p in groups if p != "-"]
+    verb = "would write" if dry_run else "wrote"
+    print(f"{schema.name}: {counts['documents']} documents from {sum(len(e) for e in groups.values())} items, "
+          f"{verb} {len(files)} files{' and stdout' if '-' in groups else ''} in {seconds:.2f} s"
+          + (f"; {counts['invalid']} invalid" if counts["invalid"] else ""), file=sys.stderr)
+    if table is not None:
+        stats = table.stats()
+        print(f"anchors: {stats['shared']} of {stats['values']} values shared, "
+              f"{stats['distinct_containers']} distinct blocks", file=sys.stderr)
+    return 1 if counts["invalid"] else 0
@@ -0,0 +1,117 @@
+import json
+import os
+import time
+from typing import Any, List, Tuple
+from ..core.cache_dir import user_cache_dir
+from ..core.yaml_query import Query, QueryIndex, iter_tree_entries
+from ..core.yaml_tree import iter_yaml_trees
+from .validate import iter_yaml_files
+
+# `contain query` answers path/value queries over every YAML file under the
+# given paths from a persistent inverted index (see core.yaml_query). Only
+# files whose size or mtime changed since the last run are parsed again, so
+# repeated queries over a large tree cost a stat per file plus the lookup.
+
+
+def default_index_path() -> str:
+    return os.path.join(user_cache_dir(), "query-index.marshal")
+
+
+def index_file(path: str) -> Tuple[str, List[List[Tuple[Any, Any]]] | None, str | None]:
+    """Parse one file into per-document entry lists. Runs inside pool workers, so it never raises."""
+    try:
+        return path, [list(iter_tree_entries(tree)) for tree in iter_yaml_trees(path)], None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def update_index(index: QueryIndex, paths: List[str], jobs: int | None = None) -> Tuple[List[str], List[str]]:
+    """
+    Bring index up to date for the YAML files under paths.
+
+    Returns (files, errors): the absolute paths searched, in walk order, and
+    one message per file that could not be read or parsed. Unparseable files
+    are indexed as empty so they are retried only once they change.
+    """
+    files, errors, stale = [], [], []
+    stats = {}
+    for path in iter_yaml_files(paths):
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            index.remove_file(path)
+            errors.append(f"{path}: {e}")
+            continue
+        files.append(path)
+        stats[path] = (st.st_size, st.st_mtime_ns)
+        if not index.file_is_current(path, st.st_size, st.st_mtime_ns):
+            stale.append(path)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(stale) <= 1:
+        parsed = list(map(index_file, stale))
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing is slow to import
+        with ProcessPoolExecutor(max_workers=min(jobs, len(stale))) as pool:
+            parsed = list(pool.map(index_file, stale, chunksize=max(1, len(stale) // (jobs * 4))))
+    for path, documents, error in parsed:
+        if error is not None:
+            errors.append(f"{path}: {error}")
+        index.add_file(path, *stats[path], documents or [])
+    return files, errors
+
+
+def run_query(expression: str, paths: List[str], index_path: str | None = None, rebuild: bool = False,
+              output: str = "text", files_only: bool = False, jobs: int | None = None) -> int:
+    """Entry point for `contain query`; exit code 0 with matches, 1 without, 2 on error."""
+    try:
+        query = Query(expression)
+    except ValueError as e:
+        print(f"error: {e}")
+        return 2
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        print(f"error: no such file or directory: {missing[0]}")
+        return 2
+
+    start = time.perf_counter()
+    index_path = index_path or default_index_path()
+    index = QueryIndex() if rebuild else QueryIndex.load(index_path)
+    files, errors = update_index(index, paths, jobs=jobs)
+    indexed = time.perf_counter()
+    hits = index.query(query, files=files)
+    finished = time.perf_counter()
+    try:
+        if index.modified:
+            index.save(index_path)
+    except (OSError, ValueError) as e:
+        print(f"warning: could not write index: {e}")
+
+    if output == "json":
+        print(json.dumps({
+            "query": expression,
+            "matches": [dict(h.to_dict(), file=os.path.relpath(h.file)) for h in hits],
+            "errors": errors,
+            "summary": {"files": len(files), "matches": len(hits),
+                        "index_seconds": round(indexed - start, 6),
+                        "query_seconds": round(finished - indexed, 6)},
+        }, indent=2, default=str))
+    elif files_only:
+        for name in dict.fromkeys(h.file for h in hits):
+            print(os.path.relpath(name))
+    else:
+        for hit in hits:
+            print(_format_hit(hit, multi=index.document_count(hit.file) > 1))
+        for error in errors:
+            print(f"warning: {error}")
+        print(f"\n{len(hits)} matches in {len(files)} files "
+              f"(query {(finished - indexed) * 1000:.1f} ms, index update {indexed - start:.2f} s)")
+    return 0 if hits else 1
+
+
+def _format_hit(hit, multi: bool) -> str:
+    location = os.path.relpath(hit.file) + (f"[{hit.document}]" if multi else "")
+    if hit.is_collection:
+        return f"{location}  {hit.path}"
+    return f"{location}  {hit.path} = {json.dumps(hit.value, default=str)}"
@@ -0,0 +1,223 @@
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import yaml
+from ..core.cache_dir import user_cache_dir
+from ..core.file_index import DEFAULT_IGNORE, YAML_SUFFIXES
+from ..core.yaml_io import SafeLoader, atomic_open
+from ..schemas.registry import detect_schema, schema_by_name, schema_errors
+
+# `contain validate` checks every YAML file under the given paths against the
+# schema each document is detected as (or a forced --schema). Results are
+# cached by content hash, so a re-run only parses and validates files whose
+# bytes changed; files whose size and mtime are unchanged are not even read.
+
+# Bump when detection or validation rules change to invalidate cached results.
+VALIDATOR_VERSION = 2
+
+STATUSES = ("valid", "invalid", "error", "skipped")
+
+
+def default_cache_path() -> str:
+    return os.path.join(user_cache_dir(), "validate.json")
+
+
+def iter_yaml_files(paths: Iterable[str], ignore: Iterable[str] = DEFAULT_IGNORE) -> Iterator[str]:
+    """Yield YAML files under paths (files are yielded as given), skipping ignored and hidden dirs."""
+    ignore = tuple(ignore)
+    for root in paths:
+        if not os.path.isdir(root):
+            yield root
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith(".")
+                                 and not any(fnmatch.fnmatch(d, p) for p in ignore))
+            for name in sorted(filenames):
+                if name.endswith(YAML_SUFFIXES):
+                    yield os.path.join(dirpath, name)
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """
+    On-disk JSON cache of validation results.
+
+    files maps an absolute path to (size, mtime_ns, sha256) so unchanged files
+    skip hashing; results maps "sha256:schema" to the stored result, so a file
+    that was touched, renamed or copied without changing still hits.
+    """
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self.files: Dict[str, List[Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        if path is None:
+            return
+        try:
+            with open(path, 'r') as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(raw, dict) and raw.get("version") == VALIDATOR_VERSION:
+            self.files = raw.get("files", {})
+            self.results = raw.get("results", {})
+
+    def content_hash(self, path: str) -> str:
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.files.get(key)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        digest = _hash_file(path)
+        self.files[key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        result = self.results.get(key)
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        self.results[key] = {k: result[k] for k in ("schema", "status", "errors", "documents")}
+
+    def save(self):
+        if self.path is None:
+            return
+        live = {entry[2] for entry in self.files.values()}
+        results = {k: v for k, v in self.results.items() if k.split(":", 1)[0] in live}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with atomic_open(self.path) as f:
+            json.dump({"version": VALIDATOR_VERSION, "files": self.files, "results": results}, f)
+
+
+def validate_documents(documents: List[Any], schema_name: str | None = None) -> Tuple[str | None, str, List[str]]:
+    """Validate parsed documents; returns (schema names, status, errors)."""
+    forced = None
+    if schema_name is not None:
+        forced = schema_by_name(schema_name)
+    names: List[str] = []
+    errors: List[str] = []
+    for i, doc in enumerate(documents):
+        if doc is None:
+            continue
+        schema = forced or detect_schema(doc)
+        if schema is None:
+            continue
+        if schema.name not in names:
+            names.append(schema.name)
+        prefix = f"document {i}: " if len(documents) > 1 else ""
+        errors.extend(prefix + e for e in schema_errors(schema, doc))
+    if not names:
+        return None, "skipped", []
+    return ",".join(names), "invalid" if errors else "valid", errors
+
+
+def validate_file(path: str, schema_name: str | None = None) -> Dict[str, Any]:
+    """Parse and validate one file. Runs inside pool workers, so it never raises."""
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"path": path, "schema": None, "status": "error", "errors": [], "documents": 0}
+    try:
+        with open(path, 'r') as f:
+            documents = list(yaml.load_all(f, Loader=SafeLoader))
+        result["documents"] = len(documents)
+        result["schema"], result["status"], result["errors"] = validate_documents(documents, schema_name)
+    except Exception as e:
+        result["errors"] = [f"{type(e).__name__}: {e}"]
+    result["seconds"] = time.perf_counter() - start
+    result["cached"] = False
+    return result
+
+
+def _validate_star(args):
+    return validate_file(*args)
+
+
+def validate_paths(paths: List[str], schema_name: str | None = None, jobs: int | None = None,
+                   cache: ValidationCache | None = None) -> List[Dict[str, Any]]:
+    """Validate every YAML file under paths; results are in path order."""
+    cache = cache or ValidationCache(None)
+    results: List[Dict[str, Any] | None] = []
+    pending: List[Tuple[int, str, str]] = []
+    for path in iter_yaml_files(paths):
+        start = time.perf_counter()
+        try:
+            key = f"{cache.content_hash(path)}:{schema_name or 'auto'}"
+        except OSError as e:
+            results.append({"path": path, "schema": None, "status": "error", "errors": [str(e)],
+                            "documents": 0, "seconds": time.perf_counter() - start, "cached": False})
+            continue
+        hit = cache.get(key)
+        if hit is not None:
+            results.append({"path": path, **hit, "seconds": time.perf_counter() - start, "cached": True})
+        else:
+            pending.append((len(results), path, key))
+            results.append(None)
+
+    tasks = [(path, schema_name) for _, path, _ in pending]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        fresh = list(map(_validate_star, tasks))
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing is slow to import
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+            fresh = list(pool.map(_validate_star, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    for (index, _, key), result in zip(pending, fresh):
+        results[index] = result
+        # parse errors are cached too: the same bytes fail the same way
+        cache.put(key, result)
+    return results  # type: ignore[return-value]
+
+
+def summarize(results: List[Dict[str, Any]], seconds: float, cache_hits: int) -> Dict[str, Any]:
+    counts = {status: 0 for status in STATUSES}
+    for result in results:
+        counts[result["status"]] += 1
+    return {"files": len(results), **counts, "cached": cache_hits, "seconds": round(seconds, 6)}
+
+
+def run_validate(paths: List[str], schema_name: str | None = None, jobs: int | None = None,
+                 output: str = "text", cache_path: str | None = None, use_cache: bool = True) -> int:
+    """Entry point for `contain validate`; returns the process exit code."""
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing:
+        print(f"error: no such file or directory: {missing[0]}")
+        return 2
+
+    start = time.perf_counter()
+    cache = ValidationCache((cache_path or default_cache_path()) if use_cache else None)
+    results = validate_paths(paths, schema_name=schema_name, jobs=jobs, cache=cache)
+    summary = summarize(results, time.perf_counter() - start, cache.hits)
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"warning: could not write cache: {e}")
+
+    if output == "json":
+        print(json.dumps({"files": results, "summary": summary}, indent=2))
+    else:
+        _report(results, summary)
+    return 1 if summary["invalid"] or summary["error"] else 0
+
+
+def _report(results: List[Dict[str, Any]], summary: Dict[str, Any]):
+    for result in results:
+        note = result["schema"] or "no schema detected"
+        timing = "cached" if result["cached"] else f"{result['seconds'] * 1000:.1f} ms"
+        print(f"{result['status']:<8} {result['path']}  ({note}, {timing})")
+        for error in result["errors"]:
+            print(f"         - {error}")
+    print(f"\n{summary['files']} files: {summary['valid']} valid, {summary['invalid']} invalid, "
+          f"{summary['error']} errors, {summary['skipped']} skipped "
+          f"({summary['cached']} cached, {summary['seconds']:.2f} s)")
@@ -1,11 +1,80 @@
-from rich.console import Console
-from rich.align import Align
-from .yaml_cli.banner import print_ascii_banner
-from .ui.menu import Menu
+import argparse
+import sys
 
-console = Console()
+# Keep module-level imports to the standard library: each subcommand imports
+# what it needs, so `contain validate ...` never loads rich or the menu, and
+# the interactive UI is imported only when no subcommand is given.
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="contain", description="ContainCraft - YAML Builder CLI. "
+                                     "Run without a command for the interactive menu.")
+    parser.add_argument("--profile", action="store_true",
+                        help="time parsing, tree building, rendering and I/O; write a Chrome trace and print a summary on exit")
+    parser.add_argument("--profile-output", default="containcraft-profile.json", metavar="FILE",
+                        help="trace file written by --profile (default: containcraft-profile.json)")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    apply_cmd = commands.add_parser("apply", help="apply a patch of set/append/delete operations to many files")
+    apply_cmd.add_argument("patch", help="YAML patch file (list of {op, path, value, match})")
+    apply_cmd.add_argument("files", nargs="+", help="files or glob patterns (** is recursive)")
+    apply_cmd.add_argument("--dry-run", action="store_true", help="print a diff instead of writing files")
+    apply_cmd.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+
+    validate_cmd = commands.add_parser("validate", help="validate YAML files against their detected schema")
+    validate_cmd.add_argument("paths", nargs="+", help="files or directories (searched recursively)")
+    validate_cmd.add_argument("--schema", choices=["docker-compose", "kubernetes", "kafka"], default=None,
+                              help="validate every document against this schema instead of detecting it")
+    validate_cmd.add_argument("--format", choices=["text", "json"], default="text", dest="output",
+                              help="output format (json includes per-file timings)")
+    validate_cmd.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    validate_cmd.add_argument("--cache", default=None, help="result cache file (default: ~/.cache/containcraft/validate.json)")
+    validate_cmd.add_argument("--no-cache", action="store_true", help="do not read or write the result cache")
+
+    diff_cmd = commands.add_parser("diff", help="show the paths that differ between two YAML files")
+    diff_cmd.add_argument("old", help="original file")
+    diff_cmd.add_argument("new", help="changed file")
+    diff_cmd.add_argument("--format", choices=["text", "json"], default="text", dest="output",
+                          help="output format (json includes full old/new values)")
+    diff_cmd.add_argument("--width", type=int, default=60, help="truncate values to this many characters (text)")
+
+    query_cmd = commands.add_parser("query", help="find keys and values across YAML files via a persistent index")
+    query_cmd.add_argument("expression", help='path pattern with optional "== value" or "^= prefix", '
+                                              'e.g. "services.*.image ^= nginx"')
+    query_cmd.add_argument("paths", nargs="*", default=["."], help="files or directories (default: .)")
+    query_cmd.add_argument("--format", choices=["text", "json"], default="text", dest="output", help="output format")
+    query_cmd.add_argument("-l", "--files-with-matches", action="store_true", dest="files_only",
+                           help="only print the names of files with matches")
+    query_cmd.add_argument("-j", "--jobs", type=int, default=None, help="worker processes for indexing (default: CPU count)")
+    query_cmd.add_argument("--index", default=None, help="index file (default: ~/.cache/containcraft/query-index.marshal)")
+    query_cmd.add_argument("--rebuild", action="store_true", help="discard the saved index and build it again")
+
+    generate_cmd = commands.add_parser("generate", help="generate Compose, Kubernetes or Kafka files from a parameter matrix")
+    generate_cmd.add_argument("params", help="parameter file (schema, output, matrix, zip, document, item)")
+    generate_cmd.add_argument("-o", "--output", default=None, help="output path template, overrides the file's ('-' for stdout)")
+    generate_cmd.add_argument("--no-validate", action="store_true", help="skip validating generated documents")
+    generate_cmd.add_argument("--dry-run", action="store_true", help="build and validate without writing files")
+    generate_cmd.add_argument("--anchors", action="store_true", help="write repeated blocks once, with YAML anchors and aliases")
+
+    load_cmd = commands.add_parser("load", help="show the tree of a YAML file, optionally redrawing it as the file changes")
+    load_cmd.add_argument("file", help="YAML file (single document)")
+    load_cmd.add_argument("--watch", action="store_true", help="poll the file and update the tree in place until Ctrl+C")
+    load_cmd.add_argument("--interval", type=float, default=0.5, help="seconds between polls with --watch (default: 0.5)")
+    load_cmd.add_argument("--depth", type=int, default=None, help="only show this many levels of the tree")
+    load_cmd.add_argument("--intern", action="store_true",
+                          help="share one object for every repeated key, scalar and block (less memory for repetitive files)")
+
+    cache_cmd = commands.add_parser("cache", help="show or clear the parsed-document cache")
+    cache_cmd.add_argument("--clear", action="store_true", help="delete every cached snapshot")
+
+    return parser
+
+def interactive():
+    from rich.console import Console
+    from rich.align import Align
+    from .yaml_cli.banner import print_ascii_banner
+    from .ui.menu import Menu
+
+    console = Console()
     console.clear()
     banner = print_ascii_banner()
     for line in banner.splitlines():
@@ -16,7 +85,58 @@ def main():
     menu = Menu()
     menu.main_menu()
 
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        run(args)
+        return
+
+    from .core import profiling
+    profiling.enable()
+    try:
+        with profiling.span(f"contain {args.command or 'menu'}", "cli"):
+            run(args)
+    finally:
+        profiling.finish(args.profile_output)
+        doc_cache = sys.modules.get("containcraft.core.doc_cache")
+        if doc_cache is not None and doc_cache.default_cache() is not None:
+            print(doc_cache.format_stats(doc_cache.default_cache().stats()), file=sys.stderr)
+
+def run(args):
+    if args.command == "apply":
+        from .batch.apply import run_apply
+        sys.exit(run_apply(args.patch, args.files, dry_run=args.dry_run, jobs=args.jobs))
+
+    if args.command == "validate":
+        from .batch.validate import run_validate
+        sys.exit(run_validate(args.paths, schema_name=args.schema, jobs=args.jobs, output=args.output,
+                              cache_path=args.cache, use_cache=not args.no_cache))
+
+    if args.command == "diff":
+        from .batch.diff import run_diff
+        sys.exit(run_diff(args.old, args.new, output=args.output, width=args.width))
+
+    if args.command == "query":
+        from .batch.query import run_query
+        sys.exit(run_query(args.expression, args.paths, index_path=args.index, rebuild=args.rebuild,
+                           output=args.output, files_only=args.files_only, jobs=args.jobs))
+
+    if args.command == "generate":
+        from .batch.generate import run_generate
+        sys.exit(run_generate(args.params, output=args.output, validate=not args.no_validate, dry_run=args.dry_run,
+                              anchors=args.anchors))
+
+    if args.command == "load":
+        from .ui.watch import run_load
+        sys.exit(run_load(args.file, watch=args.watch, interval=args.interval, max_depth=args.depth,
+                          intern=args.intern))
+
+    if args.command == "cache":
+        from .core.doc_cache import run_cache
+        sys.exit(run_cache(clear=args.clear))
+
+    interactive()
+
 if __name__ == "__main__":
     main()
 
-
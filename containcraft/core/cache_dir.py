@@ -0,0 +1,8 @@
+# core/cache_dir.py
+import os
+
+
+def user_cache_dir() -> str:
+    """Per-user cache directory ($XDG_CACHE_HOME/containcraft or ~/.cache/containcraft)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "containcraft")
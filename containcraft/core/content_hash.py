@@ -0,0 +1,113 @@
+# core/content_hash.py
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+# Merkle-style content digests for YAML data.
+#
+#   scalar  -> H("V" type:repr)
+#   mapping -> H("M" entry digests in order), entry = H("K" key digest, value digest)
+#   list    -> H("S" item digests in order)
+#
+# A YamlNode's subtree hash is the entry digest of its key and value, so a
+# tree and the dict it was built from hash alike. Digests are stable across
+# processes (unlike hash()), type-exact (1, 1.0 and True differ) and 16 bytes.
+
+DIGEST_SIZE = 16
+
+
+def _h(tag: bytes, *parts: bytes) -> bytes:
+    h = hashlib.blake2b(tag, digest_size=DIGEST_SIZE)
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+
+def scalar_digest(value: Any) -> bytes:
+    return _h(b"V", f"{type(value).__name__}:{value!r}".encode("utf-8", "surrogatepass"))
+
+
+def entry_digest(key: Any, value_digest: bytes) -> bytes:
+    return _h(b"K", scalar_digest(key), value_digest)
+
+
+def mapping_digest(entry_digests: List[bytes]) -> bytes:
+    return _h(b"M", *entry_digests)
+
+
+def sequence_digest(item_digests: List[bytes]) -> bytes:
+    return _h(b"S", *item_digests)
+
+
+class HashMemo:
+    """
+    Digests of containers by identity.
+
+    Edited documents are persistent snapshots that share unchanged subtrees
+    with the original (see edit.persistent), so with one memo hashing an
+    edited snapshot after its original only hashes the copied paths. Entries
+    hold a reference to their container so ids are not reused while cached.
+    """
+
+    def __init__(self):
+        self._digests: Dict[int, Tuple[Any, bytes]] = {}
+
+    def get(self, value: Any) -> bytes | None:
+        entry = self._digests.get(id(value))
+        return entry[1] if entry is not None and entry[0] is value else None
+
+    def put(self, value: Any, digest: bytes):
+        self._digests[id(value)] = (value, digest)
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+def value_digest(value: Any, memo: HashMemo | None = None) -> bytes:
+    """Digest of a loaded YAML value; iterative, so depth is not limited by recursion."""
+    memo = memo if memo is not None else HashMemo()
+    if not isinstance(value, (dict, list)):
+        return scalar_digest(value)
+    known = memo.get(value)
+    if known is not None:
+        return known
+
+    # post-order: (container, child iterator, collected digests)
+    stack: List[Tuple[Any, Any, List[bytes]]] = [(value, _children(value), [])]
+    while True:
+        container, children, digests = stack[-1]
+        child = next(children, _DONE)
+        if child is _DONE:
+            stack.pop()
+            if isinstance(container, dict):
+                keys = list(container)
+                digest = mapping_digest([entry_digest(k, d) for k, d in zip(keys, digests)])
+            else:
+                digest = sequence_digest(digests)
+            memo.put(container, digest)
+            if not stack:
+                return digest
+            stack[-1][2].append(digest)
+            continue
+        if isinstance(child, (dict, list)):
+            known = memo.get(child)
+            if known is None:
+                stack.append((child, _children(child), []))
+                continue
+            digests.append(known)
+        else:
+            digests.append(scalar_digest(child))
+
+
+_DONE = object()
+
+
+def _children(container: Any):
+    return iter(container.values() if isinstance(container, dict) else container)
+
+
+def documents_differ(old: Any, new: Any, memo: HashMemo | None = None) -> bool:
+    """Type-exact change check: same object, or equal digests, means unchanged."""
+    if old is new:
+        return False
+    memo = memo if memo is not None else HashMemo()
+    return value_digest(old, memo) != value_digest(new, memo)
@@ -0,0 +1,331 @@
+# core/doc_cache.py
+import hashlib
+import io
+import marshal
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+from .cache_dir import user_cache_dir
+from .profiling import span
+
+# Parsed documents, cached in two tiers so that opening the same file again
+# skips the YAML parser:
+#
+# - memory: an LRU of documents keyed by (absolute path, size, mtime_ns) and
+#   bounded by their estimated resident size. A hit costs one stat().
+# - disk: binary snapshots under ~/.cache/containcraft/documents keyed by
+#   the hash of the file's bytes, so a new process, a touched file or a copy
+#   with the same content still hits. A hit costs reading and hashing the
+#   file and unmarshalling the snapshot, several times faster than parsing.
+#   Past a total size, the least recently used snapshots are removed down to
+#   three quarters of it. The total is a running count (the directory is
+#   scanned once, then only when evicting), so a write does not cost time
+#   proportional to the number of snapshots.
+#
+# Snapshots are written with marshal; documents marshal cannot write (dates
+# and timestamps from YAML) fall back to pickle. Both keep shared (aliased)
+# objects shared. Cached documents are handed out as-is, so callers must not
+# modify them in place (edits copy the changed path, see edit.persistent).
+#
+# CONTAINCRAFT_DOC_CACHE=memory keeps only the memory tier and =0 turns the
+# cache off.
+
+# Bump when what a snapshot holds changes (or parsing does) to invalidate them.
+CACHE_VERSION = 1
+
+MEMORY_MAX_BYTES = 64_000_000
+DISK_MAX_BYTES = 256_000_000
+
+# Files modified this recently may change again within the same mtime tick
+# without their size changing, so their (path, size, mtime) key is not
+# trusted; they are still found by content hash in the disk tier.
+_RACY_NS = 2_000_000_000
+
+# magic, cache version, marshal format version; then _MARSHAL or _PICKLE and the payload
+_HEADER = b"ccdoc" + bytes([CACHE_VERSION, marshal.version])
+_MARSHAL = b"m"
+_PICKLE = b"p"
+_SUFFIX = ".snapshot"
+
+Key = Tuple[str, int, int]
+
+# returned by DocumentCache.get when a document is not cached (None is a valid document)
+MISSING = object()
+
+
+def _resident_size(value: Any) -> int:
+    """Estimated bytes held by value and everything it references, shared objects once."""
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+def _decode(data: bytes) -> str:
+    # the text open(path, 'r') would have read: default encoding, universal newlines
+    return io.TextIOWrapper(io.BytesIO(data)).read()
+
+
+class DocumentCache:
+    """
+    Parsed documents by file, in memory (LRU by bytes) and on disk (snapshots
+    by content hash). disk_dir=None keeps the memory tier only and
+    memory_max_bytes=0 the disk tier only.
+    """
+
+    def __init__(self, disk_dir: str | None = None, memory_max_bytes: int = MEMORY_MAX_BYTES,
+                 disk_max_bytes: int = DISK_MAX_BYTES):
+        self.disk_dir = disk_dir
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        # key -> (document, estimated bytes)
+        self._memory: "OrderedDict[Key, Tuple[Any, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        # bytes in disk_dir, None until first needed; other processes'
+        # writes are only counted at the next scan
+        self._disk_bytes: int | None = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_writes = 0
+        self.evictions = 0
+
+    def load(self, path: str, parse: Callable[[str], Any]) -> Any:
+        """The document in path, from a cache tier if possible, else parse(text)."""
+        return self._lookup(path, parse)
+
+    def get(self, path: str) -> Any:
+        """The cached document for path, or MISSING; never parses."""
+        return self._lookup(path, None)
+
+    def peek(self, path: str) -> Any:
+        """The document for path if it is in the memory tier, else MISSING; costs one stat()."""
+        st = os.stat(path)
+        if time.time_ns() - st.st_mtime_ns <= _RACY_NS:
+            return MISSING
+        entry = self._memory.get((os.path.abspath(path), st.st_size, st.st_mtime_ns))
+        return entry[0] if entry is not None else MISSING
+
+    def _lookup(self, path: str, parse: Callable[[str], Any] | None) -> Any:
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        stable = time.time_ns() - st.st_mtime_ns > _RACY_NS
+        if stable:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+
+        with open(path, 'rb') as f:
+            with span("doc_cache.read", "io", path=path):
+                data = f.read()
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest() if self.disk_dir else None
+        document = self._read_snapshot(digest) if digest else MISSING
+        if document is MISSING:
+            if parse is None:
+                return MISSING
+            self.misses += 1
+            document = parse(_decode(data))
+            if digest:
+                self._write_snapshot(digest, document)
+        else:
+            self.disk_hits += 1
+        if stable:
+            self._remember(key, document)
+        return document
+
+    def _remember(self, key: Key, document: Any):
+        if self.memory_max_bytes <= 0:
+            return
+        size = _resident_size(document)
+        if size > self.memory_max_bytes:
+            return
+        for stale in [k for k in self._memory if k[0] == key[0]]:
+            self._memory_bytes -= self._memory.pop(stale)[1]
+        self._memory[key] = (document, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+            self.evictions += 1
+
+    def _snapshot_path(self, digest: str) -> str:
+        return os.path.join(self.disk_dir, digest + _SUFFIX)
+
+    def _read_snapshot(self, digest: str) -> Any:
+        path = self._snapshot_path(digest)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return MISSING
+        with span("doc_cache.unmarshal", "parse", bytes=len(data)):
+            document = self._unpack(data)
+        if document is MISSING:
+            _unlink(path)
+            return MISSING
+        try:
+            # the mtime records use, for least-recently-used eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return document
+
+    @staticmethod
+    def _unpack(data: bytes) -> Any:
+        start = len(_HEADER)
+        if not data.startswith(_HEADER) or len(data) <= start:
+            return MISSING
+        kind, body = data[start:start + 1], memoryview(data)[start + 1:]
+        try:
+            if kind == _MARSHAL:
+                return marshal.loads(body)
+            if kind == _PICKLE:
+                import pickle  # only for documents with dates or timestamps
+                return pickle.loads(body)
+        except Exception:
+            pass
+        return MISSING
+
+    def _write_snapshot(self, digest: str, document: Any):
+        try:
+            kind, body = _MARSHAL, marshal.dumps(document)
+        except ValueError:
+            import pickle
+            try:
+                kind, body = _PICKLE, pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                return
+        from .yaml_io import atomic_open
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._snapshots())
+        try:
+            os.makedirs(self.disk_dir, mode=0o700, exist_ok=True)
+            with atomic_open(self._snapshot_path(digest), 'wb') as f:
+                f.write(_HEADER + kind)
+                f.write(body)
+        except OSError:
+            # a read-only or full cache directory only costs the speedup
+            return
+        self.disk_writes += 1
+        self._disk_bytes += len(_HEADER) + len(kind) + len(body)
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_snapshots()
+
+    def _snapshots(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every snapshot, oldest first."""
+        found = []
+        try:
+            entries = list(os.scandir(self.disk_dir))
+        except OSError:
+            return found
+        for entry in entries:
+            if entry.name.endswith(_SUFFIX):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                found.append((st.st_mtime, st.st_size, entry.path))
+        found.sort()
+        return found
+
+    def _evict_snapshots(self):
+        snapshots = self._snapshots()
+        total = sum(size for _, size, _ in snapshots)
+        # leave room for several more writes before the next scan
+        target = self.disk_max_bytes * 3 // 4
+        if total <= self.disk_max_bytes:
+            target = total
+        for _, size, path in snapshots:
+            if total <= target:
+                break
+            _unlink(path)
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
+
+    def disk_usage(self) -> Tuple[int, int]:
+        """(snapshots, bytes) in the disk tier."""
+        if self.disk_dir is None:
+            return 0, 0
+        snapshots = self._snapshots()
+        return len(snapshots), sum(size for _, size, _ in snapshots)
+
+    def clear(self):
+        """Drop both tiers."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.disk_dir is not None:
+            for _, _, path in self._snapshots():
+                _unlink(path)
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_writes": self.disk_writes,
+            "evictions": self.evictions,
+        }
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+_default: DocumentCache | None = None
+
+
+def default_cache() -> DocumentCache | None:
+    """The process-wide cache load_yaml uses (None when CONTAINCRAFT_DOC_CACHE=0)."""
+    global _default
+    mode = os.environ.get("CONTAINCRAFT_DOC_CACHE", "")
+    if mode == "0":
+        return None
+    if _default is None:
+        disk_dir = None if mode == "memory" else os.path.join(user_cache_dir(), "documents")
+        _default = DocumentCache(disk_dir)
+    return _default
+
+
+def format_stats(stats: Dict[str, int]) -> str:
+    lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+    return (f"document cache: {lookups} loads, {stats['memory_hits']} memory hits, "
+            f"{stats['disk_hits']} disk hits, {stats['misses']} parsed; "
+            f"{stats['memory_entries']} documents ({stats['memory_bytes'] / 1e6:.1f} MB) in memory")
+
+
+def run_cache(clear: bool = False) -> int:
+    """Entry point for `contain cache`; returns the process exit code."""
+    cache = default_cache()
+    if cache is None or cache.disk_dir is None:
+        print("the on-disk document cache is off (CONTAINCRAFT_DOC_CACHE)")
+        return 0
+    snapshots, size = cache.disk_usage()
+    if clear:
+        cache.clear()
+        print(f"removed {snapshots} snapshots ({size / 1e6:.1f} MB) from {cache.disk_dir}")
+    else:
+        print(f"{cache.disk_dir}: {snapshots} snapshots, {size / 1e6:.1f} MB "
+              f"(limit {cache.disk_max_bytes / 1e6:.0f} MB)")
+    return 0
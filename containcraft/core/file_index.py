@@ -0,0 +1,266 @@
+# core/file_index.py
+import bisect
+import fnmatch
+import heapq
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+YAML_SUFFIXES = (".yaml", ".yml")
+DEFAULT_IGNORE = (".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox")
+
+# Lookups older than this trigger a background refresh.
+REFRESH_INTERVAL = 2.0
+
+# A directory modified within this many seconds of being scanned may change
+# again without its mtime moving (coarse timestamps), so it is rescanned on
+# the next refresh rather than trusted.
+_RACY_SECONDS = 2.0
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _stem(name: str) -> str:
+    return os.path.splitext(name)[0]
+
+
+def _order(rel: str) -> Tuple[int, str]:
+    # shallowest first, then alphabetical: the resolution order for name clashes
+    return rel.count(os.sep), rel
+
+
+def read_ignore_file(path: str) -> List[str]:
+    """Patterns from a .gitignore-style file (negations are not supported and skipped)."""
+    try:
+        with open(path, 'r') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    patterns = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith(("#", "!")):
+            patterns.append(line.strip("/"))
+    return patterns
+
+
+class _Dir:
+    __slots__ = ("mtime_ns", "files", "subdirs")
+
+    def __init__(self, mtime_ns: int, files: List[str], subdirs: List[str]):
+        self.mtime_ns = mtime_ns
+        self.files = files
+        self.subdirs = subdirs
+
+
+class FileIndex:
+    """
+    An index of the YAML files under a root directory.
+
+    The first scan runs in a background thread (start()). Later refreshes only
+    stat directories and rescan the ones whose mtime changed, since adding,
+    removing or renaming an entry updates its parent directory's mtime.
+    Lookups by name, relative path or stem are dictionary hits; fuzzy
+    suggestions use a trigram index over file stems.
+    """
+
+    def __init__(self, root: str = ".", ignore: Iterable[str] = DEFAULT_IGNORE,
+                 suffixes: Tuple[str, ...] = YAML_SUFFIXES, use_gitignore: bool = True):
+        self.root = os.path.abspath(root)
+        self.suffixes = suffixes
+        self.ignore = tuple(ignore)
+        if use_gitignore:
+            self.ignore += tuple(read_ignore_file(os.path.join(self.root, ".gitignore")))
+        self._dirs: Dict[str, _Dir] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self._by_stem: Dict[str, List[str]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._gram_count: Dict[str, int] = {}
+        # _lock guards the lookup tables; _walk_lock serializes refreshes, which
+        # only hold _lock while applying one directory's changes
+        self._lock = threading.Lock()
+        self._walk_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._refreshed_at = 0.0
+
+    # --- scanning -----------------------------------------------------------
+
+    def _ignored(self, name: str, rel: str) -> bool:
+        return any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(rel, p) for p in self.ignore)
+
+    def _scan(self, rel: str) -> _Dir:
+        files, subdirs = [], []
+        path = os.path.join(self.root, rel)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with os.scandir(path) as entries:
+            for entry in entries:
+                child = os.path.join(rel, entry.name) if rel else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith(".") and not self._ignored(entry.name, child):
+                            subdirs.append(entry.name)
+                    elif entry.name.endswith(self.suffixes) and not self._ignored(entry.name, child):
+                        files.append(entry.name)
+                except OSError:
+                    continue
+        if time.time_ns() - mtime_ns < _RACY_SECONDS * 1e9:
+            mtime_ns = -1
+        return _Dir(mtime_ns, sorted(files), sorted(subdirs))
+
+    def _add(self, rel: str):
+        name = os.path.basename(rel).lower()
+        stem = _stem(name)
+        bisect.insort(self._by_name.setdefault(name, []), rel, key=_order)
+        paths = self._by_stem.setdefault(stem, [])
+        if not paths:
+            grams = _trigrams(stem)
+            self._gram_count[stem] = len(grams)
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(stem)
+        bisect.insort(paths, rel, key=_order)
+
+    def _remove(self, rel: str):
+        name = os.path.basename(rel).lower()
+        stem = _stem(name)
+        self._by_name[name].remove(rel)
+        if not self._by_name[name]:
+            del self._by_name[name]
+        self._by_stem[stem].remove(rel)
+        if not self._by_stem[stem]:
+            del self._by_stem[stem]
+            del self._gram_count[stem]
+            for gram in _trigrams(stem):
+                self._trigrams[gram].discard(stem)
+
+    def _drop_tree(self, rel: str):
+        prefix = rel + os.sep
+        for key in [k for k in self._dirs if k == rel or k.startswith(prefix)]:
+            d = self._dirs.pop(key)
+            for name in d.files:
+                self._remove(os.path.join(key, name) if key else name)
+
+    def refresh(self):
+        """Bring the index up to date, rescanning only directories whose mtime changed."""
+        with self._walk_lock:
+            stack = [""]
+            while stack:
+                rel = stack.pop()
+                old = self._dirs.get(rel)
+                try:
+                    mtime_ns = os.stat(os.path.join(self.root, rel)).st_mtime_ns
+                    if old is not None and old.mtime_ns == mtime_ns:
+                        stack.extend(os.path.join(rel, s) if rel else s for s in old.subdirs)
+                        continue
+                    new = self._scan(rel)
+                except OSError:
+                    with self._lock:
+                        self._drop_tree(rel)
+                    continue
+                old_files = set(old.files) if old else set()
+                with self._lock:
+                    for name in old_files.difference(new.files):
+                        self._remove(os.path.join(rel, name) if rel else name)
+                    for name in new.files:
+                        if name not in old_files:
+                            self._add(os.path.join(rel, name) if rel else name)
+                    if old is not None:
+                        for sub in set(old.subdirs).difference(new.subdirs):
+                            self._drop_tree(os.path.join(rel, sub) if rel else sub)
+                self._dirs[rel] = new
+                stack.extend(os.path.join(rel, s) if rel else s for s in new.subdirs)
+            self._refreshed_at = time.monotonic()
+        self._ready.set()
+
+    def start(self) -> "FileIndex":
+        """Build the index in a background thread; lookups wait for it to finish."""
+        self._refresh_async()
+        return self
+
+    def _refresh_async(self):
+        if self._walk_lock.locked():
+            return
+        threading.Thread(target=self.refresh, name="containcraft-file-index", daemon=True).start()
+
+    def _current(self):
+        if not self._ready.is_set():
+            self._ready.wait()
+        elif time.monotonic() - self._refreshed_at > REFRESH_INTERVAL:
+            self._refresh_async()
+
+    # --- lookups ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return sum(len(paths) for paths in self._by_name.values())
+
+    def find(self, name: str) -> List[str]:
+        """
+        Files matching a name or a trailing relative path, relative to root.
+
+        Matching is case-insensitive. "compose.yaml" also matches compose.yml
+        when no exact name exists. Several matches are ordered deterministically:
+        exact case first, then the shallowest path, then alphabetically.
+        """
+        self._current()
+        matches = self._find(name)
+        if not matches:
+            # may have been created since the last refresh: one stat pass
+            self.refresh()
+            matches = self._find(name)
+        return matches
+
+    def _find(self, name: str) -> List[str]:
+        name = os.path.normpath(name)
+        if name.startswith(os.pardir) or os.path.isabs(name):
+            return []
+        base = os.path.basename(name)
+        key = base.lower()
+        with self._lock:
+            candidates = list(self._by_name.get(key, ()))
+            if not candidates and key.endswith(self.suffixes):
+                candidates = list(self._by_stem.get(_stem(key), ()))
+        folder = os.path.dirname(name).lower()
+        if folder:
+            tail = os.sep + folder + os.sep
+            candidates = [c for c in candidates if (os.sep + c[:c.rfind(os.sep) + 1].lower()).endswith(tail)]
+        # lists are kept in _order; move names that match only ignoring case last
+        exact = [c for c in candidates if c.endswith(base)]
+        if len(exact) != len(candidates):
+            exact.extend(c for c in candidates if not c.endswith(base))
+        return exact
+
+    def suggest(self, name: str, limit: int = 5) -> List[str]:
+        """Files whose stems are closest to name's stem (trigram similarity)."""
+        self._current()
+        stem = _stem(os.path.basename(name).lower())
+        grams = _trigrams(stem)
+        shared: Counter = Counter()
+        with self._lock:
+            for gram in grams:
+                shared.update(self._trigrams.get(gram, ()))
+            # Dice coefficient over trigram sets
+            total = len(grams)
+            counts = self._gram_count
+            scores = {s: 2 * n / (total + counts[s]) for s, n in shared.items()}
+            best = heapq.nsmallest(limit, scores, key=lambda s: (-scores[s], s))
+            result: List[str] = []
+            for s in best:
+                if scores[s] >= 0.3:
+                    result.extend(self._by_stem[s])
+        return result[:limit]
+
+
+_shared: Dict[str, FileIndex] = {}
+
+
+def shared_index(root: str = ".") -> FileIndex:
+    """The process-wide index for root, started in the background on first use."""
+    root = os.path.abspath(root)
+    index = _shared.get(root)
+    if index is None:
+        index = _shared[root] = FileIndex(root).start()
+    return index
@@ -0,0 +1,164 @@
+import hashlib
+import sys
+from typing import Any, Dict, List, Tuple
+from .content_hash import scalar_digest
+
+# Hash-consing for loaded YAML. Generated manifests repeat the same keys,
+# scalars and whole subtrees (labels in metadata, selector and template;
+# identical environment blocks across services) and a plain load makes a
+# separate Python object for every copy. InternTable.intern() rebuilds a
+# document so that equal strings are one object, equal scalars are one
+# object, and equal containers are one object shared by every place they
+# occur: a table keyed by a Merkle digest of the (already interned)
+# children finds each repeat in O(1).
+#
+# Shared containers are only safe because nothing edits a loaded document
+# in place: the editor and the batch tools copy the path they change (see
+# edit.persistent). Code that mutates documents must not intern them.
+#
+# The table also decides which repeats become YAML anchors when the
+# document is dumped with it (yaml_io's table= arguments): a shared
+# container of at least ALIAS_MIN_NODES nodes is written once with an
+# anchor and aliased afterwards. Anchors never cross documents.
+
+ALIAS_MIN_NODES = 3
+
+_MAPPING = b"M"
+_SEQUENCE = b"S"
+
+
+def _digest(tag: bytes, parts: List[bytes]) -> bytes:
+    h = hashlib.blake2b(tag, digest_size=16)
+    for part in parts:
+        h.update(part)
+    return h.digest()
+
+
+class InternTable:
+    """
+    Canonical objects for scalars and container subtrees, shared across
+    every document interned with the same table.
+    """
+
+    def __init__(self, alias_min_nodes: int = ALIAS_MIN_NODES):
+        self.alias_min_nodes = alias_min_nodes
+        # (type, value or float repr) -> (canonical scalar, digest)
+        self._scalars: Dict[Tuple[type, Any], Tuple[Any, bytes]] = {}
+        # subtree digest -> (canonical container, node count)
+        self._containers: Dict[bytes, Tuple[Any, int]] = {}
+        # id(canonical container) -> node count, for the alias policy
+        self._sizes: Dict[int, int] = {}
+        self._dumpers: Dict[type, type] = {}
+        self.values_seen = 0
+        self.values_shared = 0
+        self.bytes_saved = 0
+        self.distinct_scalars = 0
+        self.distinct_containers = 0
+
+    def clear(self):
+        """
+        Forget every canonical object, keeping the statistics. Documents
+        interned before and after no longer share objects; writers that
+        stream documents clear between them so the table stays bounded by
+        the largest document.
+        """
+        self._scalars.clear()
+        self._containers.clear()
+        self._sizes.clear()
+
+    def _scalar(self, value: Any) -> Tuple[Any, bytes]:
+        # floats by repr: 0.0 == -0.0 (and NaN != NaN) would merge or split them
+        key = (float, repr(value)) if type(value) is float else (type(value), value)
+        try:
+            entry = self._scalars.get(key)
+        except TypeError:
+            # unhashable scalars (e.g. a set from a !!set tag) are left alone
+            return value, scalar_digest(value)
+        if entry is None:
+            canonical = sys.intern(value) if type(value) is str else value
+            entry = self._scalars[key] = (canonical, scalar_digest(canonical))
+            self.distinct_scalars += 1
+        if entry[0] is not value:
+            self.values_shared += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return entry
+
+    def intern(self, value: Any) -> Any:
+        """Return value rebuilt from canonical objects (value itself is not modified)."""
+        if not isinstance(value, (dict, list)):
+            self.values_seen += 1
+            return self._scalar(value)[0]
+        # post-order: (container, item iterator, interned (key, child, digest, size) entries)
+        stack: List[Tuple[Any, Any, list]] = [(value, _items(value), [])]
+        while True:
+            container, items, done = stack[-1]
+            item = next(items, None)
+            if item is not None:
+                key, child = item
+                if isinstance(child, (dict, list)):
+                    stack.append((child, _items(child), []))
+                    done.append(key)
+                else:
+                    self.values_seen += 1
+                    canonical, digest = self._scalar(child)
+                    done.append((key, canonical, digest, 1))
+                continue
+            stack.pop()
+            entry = self._container(container, done)
+            if not stack:
+                return entry[1]
+            parent_done = stack[-1][2]
+            parent_done[-1] = (parent_done[-1],) + entry[1:]
+
+    def _container(self, container: Any, done: list) -> Tuple[Any, Any, bytes, int]:
+        self.values_seen += 1
+        size = 1 + sum(entry[3] for entry in done)
+        if isinstance(container, dict):
+            self.values_seen += len(done)
+            keys = [self._scalar(key) for key, _, _, _ in done]
+            digest = _digest(_MAPPING, [part for (_, kd), (_, _, vd, _) in zip(keys, done) for part in (kd, vd)])
+        else:
+            digest = _digest(_SEQUENCE, [vd for _, _, vd, _ in done])
+        found = self._containers.get(digest)
+        if found is not None:
+            self.values_shared += 1
+            self.bytes_saved += sys.getsizeof(container)
+            return (None, found[0], digest, found[1])
+        if isinstance(container, dict):
+            canonical: Any = {k: v for (k, _), (_, v, _, _) in zip(keys, done)}
+        else:
+            canonical = [v for _, v, _, _ in done]
+        self._containers[digest] = (canonical, size)
+        self._sizes[id(canonical)] = size
+        self.distinct_containers += 1
+        return (None, canonical, digest, size)
+
+    def ignore_aliases(self, data: Any) -> bool:
+        """Alias policy for dumping: True means write data in full wherever it occurs."""
+        if not isinstance(data, (dict, list)):
+            return True
+        size = self._sizes.get(id(data))
+        # containers the table did not build keep PyYAML's default (alias if shared)
+        return size is not None and size < self.alias_min_nodes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "values": self.values_seen,
+            "shared": self.values_shared,
+            "distinct_scalars": self.distinct_scalars,
+            "distinct_containers": self.distinct_containers,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def dumper(self, base: type) -> type:
+        """A subclass of the Dumper class base that follows this table's alias policy."""
+        dumper = self._dumpers.get(base)
+        if dumper is None:
+            table = self
+            dumper = self._dumpers[base] = type(f"Anchored{base.__name__}", (base,), {
+                "ignore_aliases": lambda self, data: table.ignore_aliases(data)})
+        return dumper
+
+
+def _items(container: Any):
+    return iter(container.items()) if isinstance(container, dict) else enumerate(container)
@@ -1,25 +1,14 @@
 from typing import Any,Optional,Dict,List
+from .yaml_path import compile_path
 
 class JSONModel:
-    def __inti__(self,initial=None):
+    def __init__(self,initial=None):
         self.data : Dict[str,Any]=initial or {}
     def get(self,path:str)->Any:
-        keys=path.split(".")
-        ref=self.data
-        for k in keys:
-            ref=ref[k]
-        return ref
+        return compile_path(path).get(self.data)
     def set(self,path:str,value:Any):
-        keys=path.split(".")
-        ref=self.data
-        for k in keys:
-            ref=ref.setdefault(k,{})
-        ref[keys[-1]]=value
+        compile_path(path).set(self.data,value,create=True)
     def delete(self,path:str):
-        keys=path.split(".")
-        ref=self.data
-        for k in keys[::-1]:
-            ref=ref[k]
-        del ref[keys[-1]]
+        compile_path(path).delete(self.data)
     def to_dict(self)->Dict[str,Any]:
         return self.data
@@ -0,0 +1,246 @@
+# core/lazy_tree.py
+from typing import Any, Iterator, List, Sequence
+import yaml
+from yaml.events import (AliasEvent, DocumentEndEvent, DocumentStartEvent, MappingEndEvent,
+                         MappingStartEvent, ScalarEvent, SequenceEndEvent, SequenceStartEvent,
+                         StreamEndEvent)
+from yaml.nodes import ScalarNode
+from .yaml_io import SafeLoader, loads_yaml
+from .yaml_node import SequenceNode, YamlNode
+from .profiling import profiled
+from .yaml_tree import YamlTree
+
+# A lazy tree is built from PyYAML parse events rather than a constructed
+# dict. Only one level is built at a time: every nested collection is
+# remembered as a span of the source text and its events are skipped, so
+# opening a file costs one pass of the (C) parser and no Python objects for
+# the nested content. Expanding a node re-parses just its span.
+
+# resolver/constructor used for individual scalars
+_scalars = SafeLoader("")
+
+
+class _NeedsEagerLoad(Exception):
+    """Raised when a document uses aliases, merge keys or complex keys."""
+
+
+class _Span:
+    __slots__ = ("text", "start", "end", "column", "is_mapping")
+
+    def __init__(self, text: str, start: int, end: int, column: int, is_mapping: bool):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.column = column
+        self.is_mapping = is_mapping
+
+    def source(self) -> str:
+        # Pad the first line back to its original column so block
+        # collections keep their indentation when parsed on their own.
+        return " " * self.column + self.text[self.start:self.end]
+
+
+def _construct_scalar(event: ScalarEvent) -> Any:
+    tag = event.tag
+    if tag is None or tag == "!":
+        tag = _scalars.resolve(ScalarNode, event.value, event.implicit)
+    if tag == "tag:yaml.org,2002:merge":
+        raise _NeedsEagerLoad("merge key")
+    node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+    return _scalars.construct_document(node)
+
+
+_DEPTH_CHANGE = {MappingStartEvent: 1, SequenceStartEvent: 1,
+                 MappingEndEvent: -1, SequenceEndEvent: -1}
+
+
+def _skip_collection(events: Iterator, text: str, start_event) -> _Span:
+    """Consume the events of a collection whose start event was just read."""
+    depth = 1
+    event = start_event
+    depth_change = _DEPTH_CHANGE.get
+    for event in events:
+        cls = type(event)
+        if cls is ScalarEvent:
+            continue
+        if cls is AliasEvent:
+            raise _NeedsEagerLoad("alias")
+        depth += depth_change(cls, 0)
+        if not depth:
+            break
+    mark = start_event.start_mark
+    return _Span(text, mark.index, event.end_mark.index, mark.column,
+                 isinstance(start_event, MappingStartEvent))
+
+
+def _value_from(events: Iterator, text: str, event) -> Any:
+    """Return a scalar value or a _Span for the value starting at event."""
+    if isinstance(event, ScalarEvent):
+        return _construct_scalar(event)
+    if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+        return _skip_collection(events, text, event)
+    raise _NeedsEagerLoad(type(event).__name__)
+
+
+def _read_mapping(events: Iterator, text: str) -> List[YamlNode]:
+    """Build one level of children; events must be positioned after MappingStart."""
+    children = []
+    while True:
+        event = next(events)
+        if isinstance(event, MappingEndEvent):
+            return children
+        if not isinstance(event, ScalarEvent):
+            raise _NeedsEagerLoad("complex key")
+        key = _construct_scalar(event)
+        children.append(_node(key, _value_from(events, text, next(events))))
+
+
+def _read_sequence(events: Iterator, text: str) -> List[YamlNode]:
+    """Build the items of a sequence; events must be positioned after SequenceStart."""
+    children = []
+    while True:
+        event = next(events)
+        if isinstance(event, SequenceEndEvent):
+            return children
+        children.append(_node(len(children), _value_from(events, text, event)))
+
+
+def _node(key: Any, value: Any) -> YamlNode:
+    if not isinstance(value, _Span):
+        return YamlNode(key, value)
+    return LazyYamlNode(key, value) if value.is_mapping else LazySequenceNode(key, value)
+
+
+class LazyYamlNode(YamlNode):
+    """
+    A YamlNode whose children (mapping entries, or items for a
+    LazySequenceNode) are built from the source text the first time they
+    are accessed.
+    """
+
+    __slots__ = ("_span",)
+
+    def __init__(self, key: str, span: _Span):
+        super().__init__(key)
+        self._span = span
+
+    @property
+    def children(self) -> Sequence[YamlNode]:
+        if self._span is not None:
+            self._expand()
+        return YamlNode.children.fget(self)
+
+    def child(self, key: Any) -> YamlNode | None:
+        if self._span is not None:
+            self._expand()
+        return super().child(key)
+
+    def add_child(self, child: YamlNode):
+        if self._span is not None:
+            self._expand()
+        super().add_child(child)
+
+    def is_expanded(self) -> bool:
+        return self._span is None
+
+    def is_leaf(self) -> bool:
+        # answer without expanding
+        if self._span is not None:
+            return False
+        return super().is_leaf()
+
+    def _expand(self):
+        span, self._span = self._span, None
+        source = span.source()
+        start, read = (MappingStartEvent, _read_mapping) if span.is_mapping else (SequenceStartEvent, _read_sequence)
+        try:
+            events = yaml.parse(source, Loader=SafeLoader)
+            while not isinstance(next(events), start):
+                pass
+            children = read(events, source)
+        except _NeedsEagerLoad:
+            children = _eager_children(loads_yaml(source))
+        for child in children:
+            YamlNode.add_child(self, child)
+
+    def materialize(self):
+        """Build the whole subtree now, with a single parse of its span."""
+        span, self._span = self._span, None
+        if span is None:
+            return
+        for child in _eager_children(loads_yaml(span.source())):
+            YamlNode.add_child(self, child)
+
+
+class LazySequenceNode(LazyYamlNode, SequenceNode):
+    """A SequenceNode whose items are built from the source text on first access."""
+
+    __slots__ = ()
+
+
+def _eager_children(data: dict | list) -> List[YamlNode]:
+    builder = YamlTree()
+    items = data.items() if isinstance(data, dict) else enumerate(data)
+    return [builder.dict_to_tree(k, v) for k, v in items]
+
+
+def _tree_from_events(events: Iterator, text: str) -> YamlTree:
+    """Build a lazy tree for the document whose DocumentStartEvent was just read."""
+    tree = YamlTree()
+    event = next(events)
+    if isinstance(event, MappingStartEvent):
+        children = _read_mapping(events, text)
+        if len(children) == 1:
+            tree.root = children[0]
+            tree._virtual_root = False
+        else:
+            tree.root = YamlNode("root")
+            tree._virtual_root = True
+            for child in children:
+                tree.root.add_child(child)
+    else:
+        tree.root = _node("root", _value_from(events, text, event))
+        tree._virtual_root = True
+    if not isinstance(next(events), DocumentEndEvent):
+        raise _NeedsEagerLoad("unexpected event")
+    return tree
+
+
+def iter_lazy_trees_from_text(text: str) -> Iterator[YamlTree]:
+    """Yield one lazily expanded YamlTree per document in text."""
+    events = yaml.parse(text, Loader=SafeLoader)
+    for event in events:
+        if isinstance(event, StreamEndEvent):
+            return
+        if not isinstance(event, DocumentStartEvent):
+            continue
+        start = event.start_mark.index
+        if event.tags or event.version:
+            # %TAG/%YAML directives would not apply to re-parsed spans
+            yield from _eager_rest(text, start)
+            return
+        try:
+            yield _tree_from_events(events, text)
+        except _NeedsEagerLoad:
+            yield from _eager_rest(text, start)
+            return
+
+
+def _eager_rest(text: str, start: int) -> Iterator[YamlTree]:
+    """Fallback: build ordinary trees for the documents from start onwards."""
+    for doc in yaml.load_all(text[start:], Loader=SafeLoader):
+        tree = YamlTree()
+        tree.load_from_dict(doc)
+        yield tree
+
+
+def iter_lazy_trees(path: str) -> Iterator[YamlTree]:
+    with open(path, 'r') as f:
+        text = f.read()
+    yield from iter_lazy_trees_from_text(text)
+
+
+@profiled("lazy_tree.load_lazy_tree", "tree")
+def load_lazy_tree(path: str) -> YamlTree | None:
+    """Open the first document of path as a lazily expanded YamlTree."""
+    return next(iter_lazy_trees(path), None)
@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+from _thread import get_ident
+from functools import wraps
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+# Named timing spans around the expensive steps (parsing, tree building,
+# rendering, highlighting, disk I/O). Nothing is recorded until enable() is
+# called: span() then hands back one shared no-op context manager and a
+# @profiled function costs a single flag check on top of the call, so the
+# instrumentation can stay in place permanently. `contain --profile` enables
+# it, writes a Chrome trace (chrome://tracing, ui.perfetto.dev) and prints a
+# per-span summary on exit. Only the current process is recorded; worker
+# processes of the batch commands are not (use -j 1 to profile them).
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# (name, category, start ns, duration ns, thread id, args)
+Event = Tuple[str, str, int, int, int, Dict[str, Any] | None]
+
+_enabled = False
+_events: List[Event] = []
+_origin = time.perf_counter_ns()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any] | None):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        _events.append((self.name, self.category, self.start, end - self.start, get_ident(), self.args))
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, category: str = "containcraft", **args: Any):
+    """Context manager timing the enclosed block as one span (a no-op while disabled)."""
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name, category, args or None)
+
+
+def profiled(name: str, category: str = "containcraft") -> Callable[[F], F]:
+    """Decorator recording every call of a function as a span."""
+    def decorate(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name, category, None):
+                return fn(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def clear():
+    _events.clear()
+
+
+def events() -> List[Event]:
+    return list(_events)
+
+
+def chrome_trace(recorded: List[Event] | None = None) -> Dict[str, Any]:
+    """The spans in Chrome trace-event format (complete "X" events, microseconds)."""
+    pid = os.getpid()
+    trace: List[Dict[str, Any]] = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                                    "args": {"name": "contain " + " ".join(sys.argv[1:])}}]
+    for name, category, start, duration, tid, args in (_events if recorded is None else recorded):
+        event = {"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                 "ts": (start - _origin) / 1000, "dur": duration / 1000}
+        if args:
+            event["args"] = {k: v if isinstance(v, (int, float, bool)) or v is None else str(v)
+                             for k, v in args.items()}
+        trace.append(event)
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path: str):
+    import json  # only needed when a trace is written
+
+    from .yaml_io import atomic_open
+    with atomic_open(path) as f:
+        json.dump(chrome_trace(), f)
+
+
+def summary(recorded: List[Event] | None = None) -> List[Tuple[str, int, float, float, float]]:
+    """
+    (name, calls, total ms, self ms, max ms) per span name, by total time.
+
+    Self time excludes spans nested inside the span on the same thread, so
+    the self column adds up to the time actually spent in each step.
+    """
+    by_thread: Dict[int, List[Event]] = {}
+    for event in (_events if recorded is None else recorded):
+        by_thread.setdefault(event[4], []).append(event)
+
+    stats: Dict[str, List[float]] = {}
+
+    def close(entry):
+        (name, _, _, duration, _, _), children = entry
+        row = stats.setdefault(name, [0, 0.0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += duration
+        row[2] += duration - children
+        row[3] = max(row[3], duration)
+
+    for thread_events in by_thread.values():
+        # parents start no later and end no earlier than their children
+        thread_events.sort(key=lambda e: (e[2], -e[3]))
+        stack: List[list] = []
+        for event in thread_events:
+            while stack and stack[-1][0][2] + stack[-1][0][3] <= event[2]:
+                close(stack.pop())
+            if stack:
+                stack[-1][1] += event[3]
+            stack.append([event, 0])
+        while stack:
+            close(stack.pop())
+
+    rows = [(name, int(calls), total / 1e6, own / 1e6, longest / 1e6)
+            for name, (calls, total, own, longest) in stats.items()]
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def format_summary(rows: List[Tuple[str, int, float, float, float]]) -> str:
+    if not rows:
+        return "no spans recorded"
+    width = max(len("span"), *(len(row[0]) for row in rows))
+    lines = [f"{'span':<{width}}  {'calls':>7}  {'total ms':>10}  {'self ms':>10}  {'max ms':>10}"]
+    for name, calls, total, own, longest in rows:
+        lines.append(f"{name:<{width}}  {calls:>7}  {total:>10.2f}  {own:>10.2f}  {longest:>10.2f}")
+    return "\n".join(lines)
+
+
+def finish(path: str):
+    """Stop recording, write the trace to path and print the summary to stderr."""
+    disable()
+    write_chrome_trace(path)
+    print(format_summary(summary()), file=sys.stderr)
+    print(f"profile: {len(_events)} spans written to {path}", file=sys.stderr)
@@ -1,16 +1,91 @@
+from typing import Any, Dict, Iterator, List, Tuple
 from .yaml_node import YamlNode
+from .profiling import profiled
 
-def render_tree(node: YamlNode, indent: str = "") -> str:
-    """Render the YAML tree as indented lines.
+def _label(node: YamlNode) -> str:
+    return f"{node.display_key()}: {node.value}" if node.is_leaf() else node.display_key()
 
-    Note: we must append child blocks as lists of lines, not extend with the
-    raw string, otherwise Python will iterate characters and print vertically.
+def iter_render_lines(node: YamlNode, indent: str = "", max_depth: int | None = None) -> Iterator[str]:
+    """Yield the indented lines of the tree one at a time.
+
+    Uses an explicit stack of child iterators instead of recursion, so each
+    line is produced exactly once, memory stays O(depth) and there is no
+    recursion limit on deeply nested documents. Nodes deeper than max_depth
+    are not visited (so lazy subtrees stay unexpanded) and their parents are
+    marked with "...".
+    """
+    if max_depth is not None and max_depth < 1:
+        yield indent + _label(node) + ("" if node.is_leaf() else " ...")
+        return
+    yield indent + _label(node)
+    stack = [(iter(node.children), 1)]
+    while stack:
+        children, depth = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+        if max_depth is not None and depth >= max_depth:
+            yield indent + "  " * depth + _label(child) + ("" if child.is_leaf() else " ...")
+            continue
+        yield indent + "  " * depth + _label(child)
+        if child.children:
+            stack.append((iter(child.children), depth + 1))
+
+@profiled("renderer.render_tree", "render")
+def render_tree(node: YamlNode, indent: str = "", max_depth: int | None = None) -> str:
+    """Render the YAML tree as indented lines."""
+    return "\n".join(iter_render_lines(node, indent, max_depth))
+
+
+class IncrementalRenderer:
+    """
+    The lines of render_tree, reusing the lines of every subtree whose
+    content digest (YamlNode.subtree_hash) is unchanged since the previous
+    render() call, so re-rendering an edited or reloaded tree only formats
+    the subtrees that changed. Only the previous call's lines are kept.
     """
-    label = f"{node.key}: {node.value}" if node.is_leaf() else node.key
-    lines = [indent + label]
 
-    for child in node.children:
-        child_block = render_tree(child, indent + "  ")
-        lines.extend(child_block.splitlines())
+    def __init__(self, max_depth: int | None = None):
+        self.max_depth = max_depth
+        # (subtree digest, displayed key, depth) -> lines
+        self._lines: Dict[Tuple[bytes, str, int], List[str]] = {}
+        self.rendered = 0
+        self.reused = 0
 
-    return "\n".join(lines)
+    @profiled("renderer.incremental_render", "render")
+    def render(self, node: YamlNode) -> List[str]:
+        previous, current = self._lines, {}
+        self.rendered = self.reused = 0
+        max_depth = self.max_depth
+        lines: List[str] = []
+        # frames are [node, depth, cache key, child iterator, lines so far]
+        stack: List[List[Any]] = [[node, 0, None, None, None]]
+        while stack:
+            frame = stack[-1]
+            node, depth, key, children, done = frame
+            if children is None:
+                key = (node.subtree_hash(), node.display_key(), depth)
+                done = previous.get(key) or current.get(key)
+                if done is not None:
+                    self.reused += 1
+                else:
+                    self.rendered += 1
+                    line = "  " * depth + _label(node)
+                    if node.children and (max_depth is None or depth < max_depth):
+                        frame[2:] = [key, iter(node.children), [line]]
+                        continue
+                    done = [line + ("" if node.is_leaf() or max_depth is None or depth < max_depth else " ...")]
+            else:
+                child = next(children, None)
+                if child is not None:
+                    stack.append([child, depth + 1, None, None, None])
+                    continue
+            current[key] = done
+            stack.pop()
+            if stack:
+                stack[-1][4].extend(done)
+            else:
+                lines = done
+        self._lines = current
+        return lines
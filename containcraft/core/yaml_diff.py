@@ -0,0 +1,135 @@
+# core/yaml_diff.py
+import json
+from difflib import SequenceMatcher
+from typing import Any, Iterator, List, Tuple
+from .yaml_io import dumps_yaml
+from .yaml_path import PathPart, format_path
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+_MISSING = object()
+
+
+class DiffEntry:
+    """One difference between two documents: kind, path parts, old and new value."""
+
+    __slots__ = ("kind", "parts", "old", "new")
+
+    def __init__(self, kind: str, parts: Tuple[PathPart, ...], old: Any = None, new: Any = None):
+        self.kind = kind
+        self.parts = parts
+        self.old = old
+        self.new = new
+
+    @property
+    def path(self) -> str:
+        return format_path(self.parts) or "(document)"
+
+    def to_dict(self) -> dict:
+        entry = {"kind": self.kind, "path": self.path}
+        if self.kind != ADDED:
+            entry["old"] = self.old
+        if self.kind != REMOVED:
+            entry["new"] = self.new
+        return entry
+
+    def __repr__(self) -> str:
+        return f"DiffEntry({self.kind!r}, {self.path!r}, {self.old!r}, {self.new!r})"
+
+
+def _same(a: Any, b: Any) -> bool:
+    # 1 == True and 1 == 1.0 in Python, but not in YAML
+    return a is b or (type(a) is type(b) and a == b)
+
+
+def _fingerprint(item: Any) -> Any:
+    # hashable stand-in for aligning sequence items
+    return repr(item) if isinstance(item, (dict, list)) else (type(item), item)
+
+
+def iter_diff(old: Any, new: Any, parts: Tuple[PathPart, ...] = ()) -> Iterator[DiffEntry]:
+    """
+    Yield the differences between old and new, in document order.
+
+    Subtrees that are the same object are skipped without being visited, so
+    comparing an edited snapshot with its original (see edit.persistent)
+    only walks the edited paths. Mappings are compared by key; sequences of
+    equal length item by item, otherwise by aligning equal items so an
+    insertion or removal is reported once rather than as a shifted tail.
+    """
+    stack: List[Tuple[Any, Any, Tuple[PathPart, ...]]] = [(old, new, parts)]
+    while stack:
+        a, b, parts = stack.pop()
+        if a is b:
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            pending = []
+            for key, value in a.items():
+                other = b.get(key, _MISSING)
+                if other is _MISSING:
+                    yield DiffEntry(REMOVED, parts + (key,), old=value)
+                else:
+                    pending.append((value, other, parts + (key,)))
+            for key, value in b.items():
+                if key not in a:
+                    pending.append((_MISSING, value, parts + (key,)))
+            stack.extend(reversed(pending))
+        elif isinstance(a, list) and isinstance(b, list):
+            stack.extend(reversed(list(_list_pairs(a, b, parts))))
+        elif a is _MISSING:
+            yield DiffEntry(ADDED, parts, new=b)
+        elif b is _MISSING:
+            yield DiffEntry(REMOVED, parts, old=a)
+        elif not _same(a, b):
+            yield DiffEntry(CHANGED, parts, old=a, new=b)
+
+
+def _list_pairs(a: list, b: list, parts: Tuple[PathPart, ...]) -> Iterator[Tuple[Any, Any, Tuple[PathPart, ...]]]:
+    if len(a) == len(b):
+        for i, (x, y) in enumerate(zip(a, b)):
+            yield x, y, parts + (i,)
+        return
+    matcher = SequenceMatcher(None, [_fingerprint(x) for x in a], [_fingerprint(y) for y in b], autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for k in range(paired):
+            yield a[i1 + k], b[j1 + k], parts + (j1 + k,)
+        for i in range(i1 + paired, i2):
+            yield a[i], _MISSING, parts + (i,)
+        for j in range(j1 + paired, j2):
+            yield _MISSING, b[j], parts + (j,)
+
+
+def diff_documents(old: Any, new: Any) -> List[DiffEntry]:
+    """All differences between two documents (see iter_diff)."""
+    return list(iter_diff(old, new))
+
+
+def summarize_value(value: Any, width: int = 60) -> str:
+    """A one-line rendering of value for diff listings."""
+    if isinstance(value, dict) and value:
+        return f"{{{len(value)} keys}}"
+    if isinstance(value, list) and value:
+        return f"[{len(value)} items]"
+    if isinstance(value, str) and "\n" in value:
+        text = json.dumps(value)  # a valid YAML double-quoted scalar, on one line
+    else:
+        text = dumps_yaml(value).strip()
+        if text.endswith("\n..."):
+            text = text[:-4]
+        # long scalars are folded over several lines; unfold them
+        text = " ".join(line.strip() for line in text.splitlines())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def format_entry(entry: DiffEntry, width: int = 60) -> str:
+    """Plain one-line form: "+ path: new", "- path: old" or "~ path: old -> new"."""
+    if entry.kind == ADDED:
+        return f"+ {entry.path}: {summarize_value(entry.new, width)}"
+    if entry.kind == REMOVED:
+        return f"- {entry.path}: {summarize_value(entry.old, width)}"
+    return f"~ {entry.path}: {summarize_value(entry.old, width)} -> {summarize_value(entry.new, width)}"
@@ -1,16 +1,253 @@
+import os
+import stat
 import yaml
-from typing import Dict,Any
+from contextlib import contextmanager
+from typing import IO,Dict,Any,Iterable,Iterator,Tuple
+from .doc_cache import default_cache
+from .interning import InternTable
+from .profiling import profiled, span
+
+class PureSafeDumper(yaml.SafeDumper):
+    """
+    The pure-Python dumper with the two rules where it disagrees with
+    libyaml changed to libyaml's, so both backends write the same bytes.
+    """
+
+    def expect_document_start(self, first=False):
+        # libyaml never closes a stream that ends in a plain scalar with
+        # '...'; drop the marker so both backends match.
+        if isinstance(self.event, yaml.StreamEndEvent):
+            self.open_ended = False
+        super().expect_document_start(first)
+
+    def check_simple_key(self):
+        # libyaml writes "key: value" instead of "? key" for any one-line key
+        # of at most 128 UTF-8 bytes, empty ones included, and counts the tag
+        # only when it is written.
+        event = self.event
+        length = 0
+        if isinstance(event, yaml.ScalarEvent):
+            if self.analysis is None:
+                self.analysis = self.analyze_scalar(event.value)
+            if self.analysis.multiline:
+                return False
+            length = len(event.value.encode("utf-8", "surrogatepass"))
+            explicit_tag = not any(event.implicit)
+        elif isinstance(event, yaml.SequenceStartEvent):
+            if not self.check_empty_sequence():
+                return False
+            explicit_tag = not event.implicit
+        elif isinstance(event, yaml.MappingStartEvent):
+            if not self.check_empty_mapping():
+                return False
+            explicit_tag = not event.implicit
+        elif isinstance(event, yaml.AliasEvent):
+            explicit_tag = False
+        else:
+            return False
+        if event.anchor is not None:
+            length += len(self.prepare_anchor(event.anchor))
+        if explicit_tag and event.tag is not None:
+            length += len(self.prepare_tag(event.tag))
+        return length <= 128
+
+
+# Pick the libyaml-backed loader/dumper when PyYAML was built against it and
+# fall back to the pure-Python classes otherwise. CONTAINCRAFT_PURE_YAML=1
+# forces the fallback (handy when comparing the two backends).
+_FORCE_PURE = os.environ.get("CONTAINCRAFT_PURE_YAML", "") not in ("", "0")
+
+try:
+    if _FORCE_PURE:
+        raise ImportError("pure-Python YAML backend forced")
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader
+    SafeDumper = PureSafeDumper
+    LIBYAML_AVAILABLE = False
+
+YAML_BACKEND = "libyaml" if LIBYAML_AVAILABLE else "python"
+
+# Every option the emitters could disagree on is pinned so that both
+# backends produce byte-identical output. Lines are not wrapped: the two
+# emitters fold long (and escaped) scalars at different points.
+_DUMP_OPTIONS: Dict[str, Any] = {
+    "sort_keys": False,
+    "default_flow_style": False,
+    "allow_unicode": False,
+    "indent": 2,
+    "width": 2 ** 31 - 1,
+    "line_break": "\n",
+    "explicit_start": False,
+    "explicit_end": False,
+}
+
+# The functions below take an optional InternTable (core.interning): loads
+# then return hash-consed documents, and dumps write the subtrees the table
+# shares once, with an anchor, and as aliases everywhere else.
+
+def _dumper(table: InternTable | None) -> type:
+    return SafeDumper if table is None else table.dumper(SafeDumper)
+
+@profiled("yaml_io.loads_yaml", "parse")
+def loads_yaml(text: str) -> Any:
+    """Parse a single YAML document from a string."""
+    return yaml.load(text, Loader=SafeLoader)
+
+@profiled("yaml_io.dumps_yaml", "serialize")
+def dumps_yaml(data: Any, table: InternTable | None = None) -> str:
+    """Serialize data to a YAML string using the shared options."""
+    return yaml.dump(data, Dumper=_dumper(table), **_DUMP_OPTIONS)
+
+@profiled("yaml_io.dumps_yaml_all", "serialize")
+def dumps_yaml_all(documents: Iterable[Any], table: InternTable | None = None) -> str:
+    """Serialize several documents as one '---' separated stream."""
+    return yaml.dump_all(documents, Dumper=_dumper(table), **_DUMP_OPTIONS)
+
+def _parse(text: str) -> Any:
+    with span("yaml_io.parse", "parse", chars=len(text)):
+        return yaml.load(text, Loader=SafeLoader)
 
 #first laod
-def load_yaml(path:str | None)->Dict[str,Any] | None:
+@profiled("yaml_io.load_yaml", "io")
+def load_yaml(path:str | None, table: InternTable | None = None, cache: bool = True)->Dict[str,Any] | None:
+    """Parse the document in path, reusing an earlier parse from the document cache (core.doc_cache) when possible."""
     yaml_data=None
     if path is not None and path!="":
-        with open(path,'r') as f:
-            yaml_data=yaml.safe_load(f)
+        documents = default_cache() if cache else None
+        if documents is not None:
+            yaml_data=documents.load(path, _parse)
+        else:
+            with open(path,'r') as f:
+                with span("yaml_io.read", "io", path=path):
+                    text=f.read()
+            yaml_data=_parse(text)
+        if table is not None:
+            with span("yaml_io.intern", "parse"):
+                yaml_data=table.intern(yaml_data)
     return yaml_data
 #then dump
-def save_yaml(path:str | None,data:Dict[str,Any] | None)->None:
+@profiled("yaml_io.save_yaml", "io")
+def save_yaml(path:str | None,data:Dict[str,Any] | None, table: InternTable | None = None)->None:
    if path is not None and path!="":
         with open(path,'w') as f:
-          yaml.safe_dump(data=data,stream=f,sort_keys=False,default_flow_style=False)
-    
\ No newline at end of file
+          yaml.dump(data, stream=f, Dumper=_dumper(table), **_DUMP_OPTIONS)
+
+# multi-document streams
+
+def iter_yaml_documents(path: str, table: InternTable | None = None) -> Iterator[Any]:
+    """Yield the documents of a '---' separated stream one at a time."""
+    with open(path, 'r') as f:
+        # yaml.load_all, with a span per document that excludes the consumer
+        loader = SafeLoader(f)
+        try:
+            while True:
+                with span("yaml_io.parse_document", "parse", path=path):
+                    if not loader.check_data():
+                        break
+                    document = loader.get_data()
+                    if table is not None:
+                        document = table.intern(document)
+                yield document
+        finally:
+            loader.dispose()
+
+def document_label(doc: Any) -> str | None:
+    """Return 'kind/name' for Kubernetes-style documents, else None."""
+    if not isinstance(doc, dict):
+        return None
+    kind = doc.get("kind")
+    metadata = doc.get("metadata")
+    name = metadata.get("name") if isinstance(metadata, dict) else None
+    if kind is None or name is None:
+        return None
+    return f"{kind}/{name}"
+
+def parse_document_selector(text: str) -> int | str:
+    """A selector is either a zero-based index or a 'kind/name' label."""
+    text = text.strip()
+    if text.lstrip("-").isdigit():
+        return int(text)
+    return text
+
+@profiled("yaml_io.find_document", "parse")
+def find_document(path: str, selector: int | str,
+                  documents: Iterator[Tuple[int, Any]] | None = None) -> Tuple[int, Any] | None:
+    """Stream through path and return (index, document) for the selector.
+
+    Only the document being inspected is held in memory. documents, if
+    given, is a partly read enumerate(iter_yaml_documents(path)) to search
+    instead of starting over; it is left positioned after the match, so
+    the caller can keep reading from there.
+    """
+    if isinstance(selector, int) and selector < 0:
+        return None
+    if documents is None:
+        documents = enumerate(iter_yaml_documents(path))
+    for index, doc in documents:
+        if isinstance(selector, int):
+            if index == selector:
+                return index, doc
+        elif document_label(doc) == selector:
+            return index, doc
+    return None
+
+@profiled("yaml_io.is_multi_document", "parse")
+def is_multi_document(path: str) -> bool:
+    """True when path holds more than one document.
+
+    Only parse events are inspected (nothing is constructed), and scanning
+    stops at the start of the second document.
+    """
+    with open(path, 'r') as f:
+        starts = 0
+        for event in yaml.parse(f, Loader=SafeLoader):
+            if isinstance(event, yaml.DocumentStartEvent):
+                starts += 1
+                if starts > 1:
+                    return True
+    return False
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w'):
+    """Write to a temp file next to path and rename it over path on success.
+
+    Readers never observe a half-written file, and the original file mode is kept.
+    """
+    import tempfile  # pulls in random and shutil; only needed when writing
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".containcraft-", suffix=".tmp")
+    try:
+        if os.path.exists(path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+@profiled("yaml_io.write_yaml_documents", "serialize")
+def write_yaml_documents(stream: IO[str], documents: Iterable[Any], table: InternTable | None = None) -> None:
+    """Serialize documents to an open text stream one at a time."""
+    yaml.dump_all(documents, stream=stream, Dumper=_dumper(table), **_DUMP_OPTIONS)
+
+def save_yaml_documents(path: str, documents: Iterable[Any], table: InternTable | None = None) -> None:
+    """Stream documents into path without building the whole stream in memory."""
+    with atomic_open(path) as f:
+        write_yaml_documents(f, documents, table)
+
+@profiled("yaml_io.replace_document", "io")
+def replace_document(path: str, index: int, document: Any) -> None:
+    """Rewrite document number index in a stream, streaming the others through."""
+    save_yaml_documents(
+        path,
+        (document if i == index else doc for i, doc in enumerate(iter_yaml_documents(path))),
+    )
@@ -1,22 +1,251 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
+from .content_hash import entry_digest, mapping_digest, sequence_digest, value_digest
+
+_NO_CHILDREN: tuple = ()
+
+# default value of YamlNode: the node is a mapping, not a scalar
+_MAPPING: Any = object()
+
+# Mappings with fewer children than this are searched linearly; larger ones
+# get a key -> child dict on the first lookup, kept up to date from then on.
+INDEX_MIN_CHILDREN = 8
 
 class YamlNode:
     """
     A general N-ary tree node representing a YAML structure.
     Each node has:
-    - a key (string)
+    - a key (string, or the item index inside a SequenceNode)
     - a value (primitive or None)
-    - children (for nested dicts)
+    - children (for nested dicts; see SequenceNode for lists)
+
+    YamlNode(key) is a mapping and YamlNode(key, value) a scalar leaf, also
+    when value is None: a YAML null stays a leaf and is not an empty mapping.
+
+    Nodes use __slots__ and leaves share one empty children tuple, so a
+    node costs a fixed ~80 bytes instead of a __dict__ plus an empty list.
+
+    child(key) is O(1): a mapping with many children indexes them by key on
+    the first lookup, and add_child, remove_child, replace_child and rename
+    keep that index current.
+
+    Each node caches a content digest of its subtree (subtree_hash). Changes
+    made through set_value, add_child, remove_child, replace_child and
+    rename clear the cached digests of the node and its ancestors, so after
+    an edit only the changed path is rehashed. Assigning node.value directly
+    does not; it is meant for building trees, before anything has been hashed.
     """
 
-    def __init__(self, key: str, value: Any = None):
+    __slots__ = ("key", "value", "_leaf", "_children", "_parent", "_hash", "_index")
+
+    def __init__(self, key: str, value: Any = _MAPPING):
+        self._leaf: bool = value is not _MAPPING
         self.key: str = key
-        self.value: Any = value     
-        self.children: List["YamlNode"] = []
+        self.value: Any = value if self._leaf else None
+        self._children: List["YamlNode"] | None = None
+        self._parent: YamlNode | None = None
+        self._hash: bytes | None = None
+        self._index: Dict[Any, "YamlNode"] | None = None
+
+    @property
+    def children(self) -> Sequence["YamlNode"]:
+        return self._children if self._children is not None else _NO_CHILDREN
+
+    @property
+    def parent(self) -> Optional["YamlNode"]:
+        return self._parent
 
     def add_child(self, child: "YamlNode"):
         """Add a YAML node as a child."""
-        self.children.append(child)
+        if isinstance(child._parent, SequenceNode):
+            # an item's digest leaves out its key; as a mapping entry it must not
+            child._hash = None
+        child._parent = self
+        if self._children is None:
+            self._children = [child]
+        else:
+            self._children.append(child)
+        if self._index is not None:
+            self._index.setdefault(child.key, child)
+        self._invalidate()
+
+    def remove_child(self, child: "YamlNode"):
+        if child not in self.children:
+            raise ValueError(f"{child.key!r} is not a child of {self.key!r}")
+        self._children.remove(child)
+        self._unindex(child)
+        child._parent = None
+        self._invalidate()
+
+    def replace_child(self, old: "YamlNode", new: "YamlNode"):
+        """Put new in old's place (same position and key)."""
+        if old._parent is not self:
+            raise ValueError(f"{old.key!r} is not a child of {self.key!r}")
+        children = self._children
+        position = next(i for i, c in enumerate(children) if c is old)
+        self._unindex(old)
+        old._parent = None
+        new.key = old.key
+        new._parent = self
+        new._hash = None
+        children[position] = new
+        if self._index is not None:
+            self._index.setdefault(new.key, new)
+        self._invalidate()
+
+    def child(self, key: Any) -> Optional["YamlNode"]:
+        """The child with this key, or None. YAML integer keys also match "0" and vice versa."""
+        children = self._children
+        if not children:
+            return None
+        index = self._index
+        if index is None:
+            if len(children) < INDEX_MIN_CHILDREN:
+                for c in children:
+                    if c.key == key:
+                        return c
+                return self._child_alias(key, {c.key: c for c in children})
+            index = self._index = {}
+            for c in children:
+                index.setdefault(c.key, c)
+        found = index.get(key)
+        return found if found is not None else self._child_alias(key, index)
+
+    @staticmethod
+    def _child_alias(key: Any, index: Dict[Any, "YamlNode"]) -> Optional["YamlNode"]:
+        if isinstance(key, int) and not isinstance(key, bool):
+            return index.get(str(key))
+        if isinstance(key, str) and key.lstrip("-").isdigit():
+            return index.get(int(key))
+        return None
+
+    def rename(self, key: Any):
+        """Change this node's key, keeping the parent's index current."""
+        parent = self._parent
+        if isinstance(parent, SequenceNode):
+            raise TypeError("sequence items are keyed by position and cannot be renamed")
+        if parent is not None:
+            parent._unindex(self)
+        self.key = key
+        if parent is not None and parent._index is not None:
+            parent._index.setdefault(key, self)
+        self._hash = None
+        self._invalidate()
+
+    def _unindex(self, child: "YamlNode"):
+        index = self._index
+        if index is not None and index.get(child.key) is child:
+            del index[child.key]
+            # a duplicate key further down (invalid YAML, but possible) takes over
+            for c in self._children:
+                if c.key == child.key and c is not child:
+                    index[c.key] = c
+                    break
+
+    def display_key(self) -> str:
+        """The key as the tree views show it: "[3]" for sequence items."""
+        return f"[{self.key}]" if isinstance(self._parent, SequenceNode) else str(self.key)
+
+    def set_value(self, value: Any):
+        """Replace the value and mark the subtree hashes on the path to the root stale."""
+        self.value = value
+        self._invalidate()
+
+    def _invalidate(self):
+        # A cached hash implies cached hashes below it, so once a node with no
+        # cached hash is reached, everything above it is already stale.
+        node = self
+        while node is not None and node._hash is not None:
+            node._hash = None
+            node = node._parent
+
+    def subtree_hash(self) -> bytes:
+        """
+        Content digest of this node's key and everything below it (see
+        core.content_hash). Equal digests mean equal subtrees; computed once
+        and cached until the subtree changes. Items of a SequenceNode hash
+        their value only, so removing an item does not rehash the ones after it.
+        """
+        if self._hash is not None:
+            return self._hash
+        stack = [(self, iter(self.children), [])]
+        while stack:
+            node, children, digests = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if node.is_leaf():
+                    # by the scalar itself: a null leaf is not an empty mapping
+                    digest = value_digest(node.value)
+                elif isinstance(node, SequenceNode):
+                    digest = sequence_digest(digests)
+                else:
+                    digest = mapping_digest(digests)
+                if not isinstance(node._parent, SequenceNode):
+                    digest = entry_digest(node.key, digest)
+                node._hash = digest
+                if stack:
+                    stack[-1][2].append(digest)
+            elif child._hash is not None:
+                digests.append(child._hash)
+            else:
+                stack.append((child, iter(child.children), []))
+        return self._hash
+
+    def is_leaf(self) -> bool:
+        return self._leaf
+
+    def materialize(self):
+        """Build any lazily loaded content. Plain nodes are always complete."""
+
+
+class SequenceNode(YamlNode):
+    """
+    A YAML sequence. Its children are the items, keyed by their index, so
+    child(i), appending and removing the last item are O(1); removing an
+    earlier item renumbers the items after it.
+    """
+
+    __slots__ = ()
+
+    def add_child(self, child: YamlNode):
+        """Append an item; its key becomes its index."""
+        child.key = len(self.children)
+        child._hash = None
+        YamlNode.add_child(self, child)
+
+    def remove_child(self, child: YamlNode):
+        children = self.children
+        position = child.key
+        if not (isinstance(position, int) and 0 <= position < len(children) and children[position] is child):
+            raise ValueError(f"{child.key!r} is not an item of {self.key!r}")
+        del self._children[position]
+        for i in range(position, len(children)):
+            children[i].key = i
+        child._parent = None
+        child._hash = None
+        self._invalidate()
+
+    def replace_child(self, old: YamlNode, new: YamlNode):
+        if old._parent is not self:
+            raise ValueError(f"{old.key!r} is not an item of {self.key!r}")
+        new.key = old.key
+        new._parent = self
+        new._hash = None
+        self._children[old.key] = new
+        old._parent = None
+        old._hash = None
+        self._invalidate()
+
+    def child(self, key: Any) -> Optional[YamlNode]:
+        """The item at index key (negative counts from the end; "3" works too)."""
+        if isinstance(key, str) and key.lstrip("-").isdigit():
+            key = int(key)
+        if not isinstance(key, int) or isinstance(key, bool):
+            return None
+        children = self.children
+        if -len(children) <= key < len(children):
+            return children[key]
+        return None
 
     def is_leaf(self) -> bool:
-        return self.value is not None
+        return False
@@ -0,0 +1,172 @@
+from functools import lru_cache
+from typing import Any, Tuple
+
+# Path syntax shared by JSONModel, the editor and the batch tools:
+#   services.web.image            dotted keys
+#   services.web.ports[0]         list index
+#   cluster.brokers."broker.id"   quoted key containing dots
+#   cluster["broker.id"]          bracketed quoted key
+# Paths are compiled once into a CompiledPath and memoized, so code that
+# touches the same paths repeatedly never re-parses them.
+
+PathPart = str | int
+
+_QUOTES = "\"'"
+_SPECIAL = set(".[]\"'\\")
+
+
+def _read_quoted(path: str, i: int) -> Tuple[str, int]:
+    """Read a quoted key starting at path[i]; return (key, index after quote)."""
+    quote = path[i]
+    buf = []
+    i += 1
+    while i < len(path):
+        c = path[i]
+        if c == "\\" and i + 1 < len(path):
+            buf.append(path[i + 1])
+            i += 2
+        elif c == quote:
+            return "".join(buf), i + 1
+        else:
+            buf.append(c)
+            i += 1
+    raise ValueError(f"Unterminated quote in path {path!r}")
+
+
+def parse_path(path: str) -> Tuple[PathPart, ...]:
+    """Split a path string into keys (str) and list indices (int)."""
+    parts: list = []
+    n = len(path)
+    i = 0
+    if n == 0:
+        return ()
+
+    while True:
+        # one dotted segment: a quoted key, a plain key, or nothing before '['
+        if path[i] in _QUOTES:
+            key, i = _read_quoted(path, i)
+            parts.append(key)
+        else:
+            j = i
+            while j < n and path[j] not in ".[":
+                j += 1
+            if j == i and (j == n or path[j] != "["):
+                raise ValueError(f"Empty segment in path {path!r}")
+            if j > i:
+                parts.append(path[i:j])
+            i = j
+
+        # any number of [index] / ["key"] suffixes
+        while i < n and path[i] == "[":
+            if i + 1 < n and path[i + 1] in _QUOTES:
+                key, i = _read_quoted(path, i + 1)
+                if i >= n or path[i] != "]":
+                    raise ValueError(f"Expected ']' in path {path!r}")
+                parts.append(key)
+                i += 1
+                continue
+            j = path.find("]", i)
+            if j < 0:
+                raise ValueError(f"Unterminated '[' in path {path!r}")
+            index = path[i + 1:j].strip()
+            parts.append(int(index) if index.lstrip("-").isdigit() else index)
+            i = j + 1
+
+        if i == n:
+            return tuple(parts)
+        if path[i] != ".":
+            raise ValueError(f"Unexpected {path[i]!r} at position {i} in path {path!r}")
+        i += 1
+        if i == n:
+            raise ValueError(f"Trailing '.' in path {path!r}")
+
+
+def format_path(parts: Tuple[PathPart, ...]) -> str:
+    """Inverse of parse_path: render parts as a canonical path string."""
+    out = []
+    for part in parts:
+        if isinstance(part, int):
+            out.append(f"[{part}]")
+            continue
+        text = str(part)
+        if text == "" or any(c in _SPECIAL for c in text):
+            text = '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+        out.append(text if not out else "." + text)
+    return "".join(out)
+
+
+def resolve_key(container: Any, part: PathPart) -> Any:
+    """Map a path part onto the actual key or index used by container.
+
+    Dict lookups fall back between "0" and 0 so YAML integer keys work, and
+    list indices may be written either as [0] or .0.
+    """
+    if isinstance(container, dict):
+        if part in container:
+            return part
+        if isinstance(part, int) and str(part) in container:
+            return str(part)
+        if isinstance(part, str) and part.lstrip("-").isdigit() and int(part) in container:
+            return int(part)
+        return part
+    if isinstance(container, list):
+        try:
+            return int(part)
+        except ValueError:
+            raise KeyError(f"Invalid list index {part!r}") from None
+    raise KeyError(f"Cannot navigate into {type(container).__name__}")
+
+
+class CompiledPath:
+    """A pre-parsed path with accessors for plain dict/list documents."""
+
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str, parts: Tuple[PathPart, ...]):
+        self.text = text
+        self.parts = parts
+
+    def __repr__(self) -> str:
+        return f"CompiledPath({self.text!r})"
+
+    def __str__(self) -> str:
+        return self.text
+
+    def get(self, data: Any) -> Any:
+        cur = data
+        for p in self.parts:
+            cur = cur[resolve_key(cur, p)]
+        return cur
+
+    def exists(self, data: Any) -> bool:
+        try:
+            self.get(data)
+        except (KeyError, IndexError, TypeError):
+            return False
+        return True
+
+    def _parent(self, data: Any, create: bool) -> Any:
+        if not self.parts:
+            raise KeyError("Empty path")
+        cur = data
+        for p in self.parts[:-1]:
+            key = resolve_key(cur, p)
+            if create and isinstance(cur, dict) and key not in cur:
+                cur[key] = {}
+            cur = cur[key]
+        return cur
+
+    def set(self, data: Any, value: Any, create: bool = False):
+        """Store value in place; create=True adds missing intermediate mappings."""
+        parent = self._parent(data, create)
+        parent[resolve_key(parent, self.parts[-1])] = value
+
+    def delete(self, data: Any):
+        parent = self._parent(data, False)
+        del parent[resolve_key(parent, self.parts[-1])]
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> CompiledPath:
+    """Parse path once; repeated calls with the same string hit the cache."""
+    return CompiledPath(path, parse_path(path))
@@ -0,0 +1,365 @@
+# core/yaml_query.py
+import bisect
+import gc
+import marshal
+import os
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import yaml
+from .yaml_io import atomic_open, loads_yaml
+from .yaml_path import PathPart, format_path, parse_path
+from .yaml_tree import YamlTree
+
+# Query syntax (paths use the editor's notation, see core.yaml_path):
+#
+#   services.*.image                  every service's image
+#   services.*.image == nginx:1.25    ... equal to a value (parsed as YAML: 3, true, "3")
+#   **.image ^= nginx                 any image, at any depth, starting with "nginx"
+#   **.KAFKA_BROKER_ID                every key with that name
+#   spec.template.spec.containers[*].name
+#
+# "*" matches one key or index, "**" any number of them, and a key may be a
+# glob ("svc-*"). The index maps key names, scalar values and distinct paths
+# to entries, so a query only looks at the entries its most selective part
+# can match instead of re-reading any file.
+
+INDEX_VERSION = 2
+
+Parts = Tuple[PathPart, ...]
+# (type tag, value): type-exact and marshal-able; None marks a collection
+ValueKey = Tuple[str, Any] | None
+
+_OPERATORS = ("==", "^=")
+_QUOTES = "\"'"
+
+
+def value_key(value: Any) -> ValueKey:
+    if isinstance(value, (dict, list)):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return type(value).__name__, value
+    return "str", str(value)  # dates, timestamps, ...
+
+
+def _part_key(part: Any) -> PathPart:
+    """A path part as the index stores it: marshal-able, with other keys (dates, ...) as text."""
+    if part is None or isinstance(part, (str, int, float)):
+        return part
+    return str(part)
+
+
+def _is_glob(segment: PathPart) -> bool:
+    return isinstance(segment, str) and any(c in segment for c in "*?[")
+
+
+class Query:
+    """A parsed query: a path pattern and an optional (operator, value) predicate."""
+
+    __slots__ = ("text", "pattern", "operator", "value")
+
+    def __init__(self, text: str):
+        self.text = text
+        pattern, self.operator, literal = _split_predicate(text)
+        self.pattern: Parts = parse_path(pattern)
+        self.value: Any = None
+        if self.operator == "^=":
+            # prefixes are plain text unless quoted: "^= 1.2" is not the float 1.2
+            self.value = loads_yaml(literal) if literal[:1] in _QUOTES else literal
+            self.value = str(self.value)
+        elif self.operator == "==":
+            try:
+                self.value = loads_yaml(literal) if literal else ""
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid query value {literal!r}: {e.problem or e}") from None
+            if isinstance(self.value, (dict, list)):
+                raise ValueError(f"Query values must be scalars: {literal!r}")
+
+    def matches_path(self, parts: Parts) -> bool:
+        """Whether parts matches the pattern ("**" backtracks over any number of parts)."""
+        pattern = self.pattern
+        p = i = 0
+        star_p = star_i = -1
+        while i < len(parts):
+            if p < len(pattern) and pattern[p] == "**":
+                star_p, star_i = p, i
+                p += 1
+            elif p < len(pattern) and _segment_matches(pattern[p], parts[i]):
+                p += 1
+                i += 1
+            elif star_p >= 0:
+                star_i += 1
+                p, i = star_p + 1, star_i
+            else:
+                return False
+        while p < len(pattern) and pattern[p] == "**":
+            p += 1
+        return p == len(pattern)
+
+    def matches_value(self, key: ValueKey) -> bool:
+        if self.operator is None:
+            return True
+        if key is None:
+            return False
+        if self.operator == "==":
+            return key == value_key(self.value)
+        return key[0] == "str" and key[1].startswith(self.value)
+
+
+def _segment_matches(segment: PathPart, part: PathPart) -> bool:
+    if segment == "*":
+        return True
+    if _is_glob(segment):
+        return fnmatchcase(str(part), segment)
+    return str(segment) == str(part)
+
+
+def _split_predicate(text: str) -> Tuple[str, str | None, str]:
+    """Split "pattern op value" at the first operator outside quotes."""
+    quote = None
+    for i, c in enumerate(text):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in _QUOTES:
+            quote = c
+        elif text.startswith(_OPERATORS, i):
+            return text[:i].strip(), text[i:i + 2], text[i + 2:].strip()
+    return text.strip(), None, ""
+
+
+class QueryHit:
+    __slots__ = ("file", "document", "parts", "value", "is_collection")
+
+    def __init__(self, file: str, document: int, parts: Parts, key: ValueKey):
+        self.file = file
+        self.document = document
+        self.parts = parts
+        self.is_collection = key is None
+        self.value = None if key is None else key[1]
+
+    @property
+    def path(self) -> str:
+        return format_path(self.parts)
+
+    def to_dict(self) -> dict:
+        hit = {"file": self.file, "document": self.document, "path": self.path}
+        if not self.is_collection:
+            hit["value"] = self.value
+        return hit
+
+
+def iter_tree_entries(tree: YamlTree) -> Iterator[Tuple[Parts, ValueKey]]:
+    """(path parts, value key) for every node of a tree, including list items."""
+    if tree.root is not None and tree._virtual_root and tree.root.is_leaf():
+        yield from _iter_value_entries((), tree.root.value)
+        return
+    stack = [((), iter(tree.top_level()))]
+    while stack:
+        parts, nodes = stack[-1]
+        node = next(nodes, None)
+        if node is None:
+            stack.pop()
+            continue
+        path = parts + (node.key,)
+        if node.is_leaf():
+            yield from _iter_value_entries(path, node.value)
+        else:
+            yield path, None
+            stack.append((path, iter(node.children)))
+
+
+def _iter_value_entries(parts: Parts, value: Any) -> Iterator[Tuple[Parts, ValueKey]]:
+    stack = [(parts, value)]
+    while stack:
+        path, item = stack.pop()
+        if path:
+            yield path, value_key(item)
+        if isinstance(item, dict):
+            stack.extend((path + (k,), v) for k, v in reversed(list(item.items())))
+        elif isinstance(item, list):
+            stack.extend((path + (i,), v) for i, v in reversed(list(enumerate(item))))
+
+
+class QueryIndex:
+    """
+    Inverted indexes over the documents of many files.
+
+    Entries are (file id, document, path id, value key). Lookups go through
+    key text (str() of the last path part, so 80 and "80" alike) -> entries, value key -> entries and path id -> entries;
+    string values are also kept sorted for prefix queries. Re-indexing a
+    file retires its old id (its entries are skipped) and the index is
+    compacted once retired entries make up a quarter of it.
+    """
+
+    def __init__(self):
+        self.files: List[List[Any]] = []          # [path, size, mtime_ns, live, entries, documents]
+        self.paths: List[Parts] = []
+        self.entries: List[Tuple[int, int, int, ValueKey]] = []
+        self.by_key: Dict[str, List[int]] = {}
+        self.by_value: Dict[ValueKey, List[int]] = {}
+        self.by_path: List[List[int]] = []
+        self._file_ids: Dict[str, int] = {}
+        self._path_ids: Dict[Parts, int] = {}
+        self._strings: List[str] | None = None
+        self.dead_entries = 0
+        self.modified = False
+
+    # --- building -----------------------------------------------------------
+
+    def file_is_current(self, path: str, size: int, mtime_ns: int) -> bool:
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            return False
+        _, old_size, old_mtime, live, _, _ = self.files[file_id]
+        return live and old_size == size and old_mtime == mtime_ns
+
+    def remove_file(self, path: str):
+        file_id = self._file_ids.pop(path, None)
+        if file_id is not None and self.files[file_id][3]:
+            self.files[file_id][3] = False
+            self.modified = True
+            self.dead_entries += self.files[file_id][4]
+
+    def add_file(self, path: str, size: int, mtime_ns: int,
+                 documents: Iterable[Iterable[Tuple[Parts, ValueKey]]]):
+        """Index one file's documents, given as entry iterables (see iter_tree_entries)."""
+        self.remove_file(path)
+        file_id = len(self.files)
+        self._file_ids[path] = file_id
+        count = doc_count = 0
+        for doc_index, entries in enumerate(documents):
+            doc_count += 1
+            for parts, key in entries:
+                self._add_entry(file_id, doc_index, parts, key)
+                count += 1
+        self.files.append([path, size, mtime_ns, True, count, doc_count])
+        self._strings = None
+        self.modified = True
+
+    def add_tree(self, path: str, document: int, tree: YamlTree):
+        """Index a single already loaded tree as document number document of path."""
+        file_id = self._file_ids.get(path)
+        if file_id is None:
+            file_id = self._file_ids[path] = len(self.files)
+            self.files.append([path, 0, 0, True, 0, 0])
+        self.files[file_id][5] = max(self.files[file_id][5], document + 1)
+        for parts, key in iter_tree_entries(tree):
+            self._add_entry(file_id, document, parts, key)
+            self.files[file_id][4] += 1
+        self._strings = None
+
+    def _add_entry(self, file_id: int, doc_index: int, parts: Parts, key: ValueKey):
+        path_id = self._path_ids.get(parts)
+        if path_id is None:
+            # only paths with keys marshal cannot write (dates) are stored differently
+            parts = tuple(_part_key(part) for part in parts)
+            path_id = self._path_ids.get(parts)
+            if path_id is None:
+                path_id = self._path_ids[parts] = len(self.paths)
+                self.paths.append(parts)
+                self.by_path.append([])
+        entry_id = len(self.entries)
+        self.entries.append((file_id, doc_index, path_id, key))
+        self.by_path[path_id].append(entry_id)
+        # by text, as the editor's notation has it: "releases.80" finds the key 80
+        self.by_key.setdefault(str(parts[-1]), []).append(entry_id)
+        if key is not None:
+            self.by_value.setdefault(key, []).append(entry_id)
+
+    def compact(self):
+        """Drop retired files and their entries, renumbering what is left."""
+        files, paths, entries = self.files, self.paths, self.entries
+        self.__init__()
+        new_ids: Dict[int, int] = {}
+        for old_id, (path, size, mtime_ns, live, count, doc_count) in enumerate(files):
+            if live:
+                new_ids[old_id] = self._file_ids[path] = len(self.files)
+                self.files.append([path, size, mtime_ns, True, count, doc_count])
+        for file_id, doc_index, path_id, key in entries:
+            if file_id in new_ids:
+                self._add_entry(new_ids[file_id], doc_index, paths[path_id], key)
+
+    # --- querying -----------------------------------------------------------
+
+    def document_count(self, path: str) -> int:
+        file_id = self._file_ids.get(path)
+        return 0 if file_id is None else self.files[file_id][5]
+
+    def _string_values(self) -> List[str]:
+        if self._strings is None:
+            self._strings = sorted(v for t, v in (k for k in self.by_value) if t == "str")
+        return self._strings
+
+    def _candidates(self, query: Query) -> Iterable[int]:
+        if query.operator == "==":
+            return self.by_value.get(value_key(query.value), ())
+        if query.operator == "^=":
+            strings = self._string_values()
+            lo = bisect.bisect_left(strings, query.value)
+            hi = bisect.bisect_left(strings, query.value + "\U0010ffff")
+            return (e for s in strings[lo:hi] for e in self.by_value[("str", s)])
+        last = query.pattern[-1] if query.pattern else None
+        if last is not None and last not in ("*", "**") and not _is_glob(last):
+            return self.by_key.get(str(last), ())
+        return (e for path_id, parts in enumerate(self.paths) if query.matches_path(parts)
+                for e in self.by_path[path_id])
+
+    def query(self, query: Query | str, files: Iterable[str] | None = None) -> List[QueryHit]:
+        """Entries matching query, optionally only from the given files, in file/document order."""
+        if isinstance(query, str):
+            query = Query(query)
+        allowed = None
+        if files is not None:
+            allowed = {self._file_ids[f] for f in files if f in self._file_ids}
+        path_ok: Dict[int, bool] = {}
+        hits = []
+        for entry_id in self._candidates(query):
+            file_id, doc_index, path_id, key = self.entries[entry_id]
+            if not self.files[file_id][3] or (allowed is not None and file_id not in allowed):
+                continue
+            ok = path_ok.get(path_id)
+            if ok is None:
+                ok = path_ok[path_id] = query.matches_path(self.paths[path_id])
+            if ok and query.matches_value(key):
+                hits.append((file_id, doc_index, entry_id))
+        hits.sort()
+        return [QueryHit(self.files[f][0], d, self.paths[self.entries[e][2]], self.entries[e][3])
+                for f, d, e in hits]
+
+    # --- persistence --------------------------------------------------------
+
+    def save(self, path: str):
+        if self.dead_entries * 4 > len(self.entries):
+            self.compact()
+        state = (INDEX_VERSION, self.files, self.paths, self.entries, self.by_key,
+                 list(self.by_value.items()), self.by_path)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with atomic_open(path, "wb") as f:
+            f.write(marshal.dumps(state))
+
+    @classmethod
+    def load(cls, path: str) -> "QueryIndex":
+        """Load a saved index; a missing, unreadable or outdated file gives an empty one."""
+        index = cls()
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # one read (marshal.load on a file reads in small chunks), and no
+            # collector passes while hundreds of thousands of tuples are created
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                state = marshal.loads(data)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+        except (OSError, EOFError, ValueError, TypeError):
+            return index
+        if not isinstance(state, tuple) or not state or state[0] != INDEX_VERSION:
+            return index
+        _, index.files, index.paths, index.entries, index.by_key, by_value, index.by_path = state
+        index.by_value = dict(by_value)
+        index._file_ids = {f[0]: i for i, f in enumerate(index.files) if f[3]}
+        index._path_ids = {parts: i for i, parts in enumerate(index.paths)}
+        index.dead_entries = sum(f[4] for f in index.files if not f[3])
+        return index
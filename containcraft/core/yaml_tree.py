@@ -1,6 +1,10 @@
 # core/yaml_tree.py
-from typing import Any, Dict,Optional
-from .yaml_node import YamlNode
+from typing import Any, Dict,Iterator,Optional, Sequence, Tuple
+from .yaml_node import SequenceNode, YamlNode
+from .yaml_io import iter_yaml_documents
+from .yaml_path import PathPart, compile_path, format_path
+from .content_hash import mapping_digest, sequence_digest, value_digest
+from .profiling import profiled
 
 class YamlTree:
     def __init__(self):
@@ -8,30 +12,122 @@ class YamlTree:
         self._virtual_root: bool = False
 
     def set_root(self, key: str, value=None):
-        self.root = YamlNode(key, value)
+        """Start the tree with a mapping root, or a scalar root if value is given."""
+        self.root = YamlNode(key) if value is None else YamlNode(key, value)
 
     def get_root(self) -> YamlNode | None:
         return self.root
 
+    def materialize(self):
+        """Force every lazily loaded subtree (see core.lazy_tree) to be built."""
+        if self.root is None:
+            return
+        self.root.materialize()
+        stack = [iter(self.root.children)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+            child.materialize()
+            if child.children:
+                stack.append(iter(child.children))
+
+    def digest(self) -> bytes:
+        """
+        Content digest of the whole document: equal to
+        content_hash.value_digest(self.tree_to_dict()), and O(1) once the
+        subtree hashes are cached.
+        """
+        if self.root is None:
+            return value_digest(None)
+        if not self._virtual_root:
+            return mapping_digest([self.root.subtree_hash()])
+        if self.root.is_leaf():
+            return value_digest(self.root.value)
+        digests = [child.subtree_hash() for child in self.root.children]
+        return sequence_digest(digests) if isinstance(self.root, SequenceNode) else mapping_digest(digests)
+
+    def changed_paths(self, other: "YamlTree") -> Iterator[Tuple[Any, ...]]:
+        """
+        Yield the key paths that differ between this tree and other, visiting
+        only subtrees whose hashes differ. A path present on one side only is
+        yielded once, without descending into it.
+        """
+        if self.digest() == other.digest():
+            return
+        # entries are (path, None) to report a path or (path, (mine, theirs)) to compare children
+        stack: list = [((), (self.top_level(), other.top_level()))]
+        while stack:
+            parts, nested = stack.pop()
+            if nested is None:
+                yield parts
+                continue
+            a_children, b_children = nested
+            b_by_key = {child.key: child for child in b_children}
+            pending = []
+            for a in a_children:
+                b = b_by_key.pop(a.key, None)
+                if b is None or a.is_leaf() or b.is_leaf() or isinstance(a, SequenceNode) != isinstance(b, SequenceNode):
+                    if b is None or a.subtree_hash() != b.subtree_hash():
+                        pending.append((parts + (a.key,), None))
+                elif a.subtree_hash() != b.subtree_hash():
+                    pending.append((parts + (a.key,), (a.children, b.children)))
+            pending.extend((parts + (key,), None) for key in b_by_key)
+            stack.extend(reversed(pending))
+
+    def top_level(self) -> Sequence[YamlNode]:
+        """The nodes for the document's top-level keys."""
+        if self.root is None or (self._virtual_root and self.root.is_leaf()):
+            return ()
+        return self.root.children if self._virtual_root else (self.root,)
+
     
+    @profiled("yaml_tree.dict_to_tree", "tree")
     def dict_to_tree(self, key: str, data: Any) -> YamlNode:
-        node = YamlNode(key)
-
-        if isinstance(data, dict):
-            # nested dict
-            for k, v in data.items():
-                child = self.dict_to_tree(k, v)
-                node.add_child(child)
+        """Convert nested dicts and lists to nodes using an explicit stack (no recursion limit)."""
+        node = _new_node(key, data)
+        if not isinstance(data, (dict, list)):
+            return node
 
-        else:
-            # leaf node
-            node.value = data
+        # Every node is new, so children are linked directly instead of
+        # through add_child (there is no index or cached hash to update).
+        stack = [(node, _items(data))]
+        while stack:
+            parent, items = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+            k, v = item
+            if isinstance(v, dict):
+                child = YamlNode(k)
+                stack.append((child, iter(v.items())))
+            elif isinstance(v, list):
+                child = SequenceNode(k)
+                stack.append((child, enumerate(v)))
+            else:
+                child = YamlNode(k, v)
+            child._parent = parent
+            if parent._children is None:
+                parent._children = [child]
+            else:
+                parent._children.append(child)
 
         return node
 
+    @profiled("yaml_tree.load_from_dict", "tree")
     def load_from_dict(self, data: Dict[str, Any]):
         """Build tree from dictionary (YAML loaded)."""
-        if len(data) == 1:
+        if isinstance(data, list):
+            # A document that is a bare list becomes a sequence root.
+            self.root = self.dict_to_tree("root", data)
+            self._virtual_root = True
+        elif not isinstance(data, dict):
+            # A scalar document becomes a leaf root.
+            self.root = YamlNode("root", data)
+            self._virtual_root = True
+        elif len(data) == 1:
             root_key = list(data.keys())[0]
             self.root = self.dict_to_tree(root_key, data[root_key])
             self._virtual_root = False
@@ -44,18 +140,17 @@ class YamlTree:
                 self.root.add_child(child)
 
     
+    @profiled("yaml_tree.tree_to_dict", "tree")
     def tree_to_dict(self, node: YamlNode | None = None):
         node = node or self.root
 
         if node is None:
             raise ValueError("Node cannot be None")
 
-        if node.is_leaf():
+        if node.is_leaf() and node is not self.root:
             return node.value
 
-        result = {}
-        for child in node.children:
-            result[child.key] = self.tree_to_dict(child)
+        result = node_value(node)
 
         # If we built a virtual root to accommodate multiple top-level keys,
         # unwrap it when converting back to dict for serialization.
@@ -63,3 +158,159 @@ class YamlTree:
             return result
 
         return {node.key: result}
+
+    # Path access. Paths start at the top-level keys, as in the editor
+    # ("services.web.ports[3]"), and each step is one O(1) child lookup, so
+    # the cost depends on the depth of the path, not on how many siblings
+    # the nodes along it have. Missing keys raise KeyError and out-of-range
+    # items IndexError, like the same operations on the loaded dict.
+
+    def find(self, path: str | Sequence[PathPart]) -> YamlNode | None:
+        """The node at path, or None."""
+        try:
+            return self._existing(_parts(path))
+        except (KeyError, IndexError):
+            return None
+
+    def get(self, path: str | Sequence[PathPart]) -> Any:
+        """The value at path, converted back to plain dicts and lists."""
+        return node_value(self._existing(_parts(path)))
+
+    def set(self, path: str | Sequence[PathPart], value: Any) -> YamlNode:
+        """Store value at path, adding the last key if it is missing; returns its node."""
+        parts = _parts(path)
+        if not parts:
+            raise KeyError("Empty path")
+        parent = self._top() if len(parts) == 1 else self._existing(parts[:-1])
+        node = parent.child(parts[-1])
+        if node is None:
+            if isinstance(parent, SequenceNode):
+                raise IndexError(f"list index {parts[-1]!r} out of range")
+            if parent.is_leaf():
+                raise KeyError(f"Cannot navigate into {type(parent.value).__name__}")
+            node = self.dict_to_tree(parts[-1], value)
+            parent.add_child(node)
+        elif node.is_leaf() and not isinstance(value, (dict, list)):
+            node.set_value(value)
+        else:
+            new = self.dict_to_tree(node.key, value)
+            parent.replace_child(node, new)
+            node = new
+        return node
+
+    def append(self, path: str | Sequence[PathPart], value: Any) -> YamlNode:
+        """Append value to the sequence at path; returns the new item's node."""
+        node = self._existing(_parts(path))
+        if not isinstance(node, SequenceNode):
+            raise TypeError(f"{format_path(_parts(path))} is not a list")
+        item = self.dict_to_tree(0, value)
+        node.add_child(item)
+        return item
+
+    def delete(self, path: str | Sequence[PathPart]):
+        """Remove the key or item at path."""
+        parts = _parts(path)
+        if not parts:
+            raise KeyError("Empty path")
+        node = self._existing(parts)
+        if node is self.root:
+            self.root = None
+            self._virtual_root = False
+        else:
+            node.parent.remove_child(node)
+
+    def rename(self, path: str | Sequence[PathPart], key: Any):
+        """Give the mapping entry at path a new key; its subtree stays as it is."""
+        parts = _parts(path)
+        node = self._existing(parts) if parts else None
+        if node is None or isinstance(node.parent, SequenceNode):
+            raise KeyError(f"{format_path(parts)} is not a mapping entry")
+        parent = node.parent
+        if parent is not None and parent.child(key) not in (None, node):
+            raise KeyError(f"{key!r} already exists")
+        node.rename(key)
+
+    def _existing(self, parts: Tuple[PathPart, ...]) -> YamlNode:
+        if self._virtual_root:
+            node, rest = self.root, parts
+        elif self.root is not None and parts and _key_matches(self.root.key, parts[0]):
+            node, rest = self.root, parts[1:]
+        else:
+            raise KeyError(format_path(parts))
+        for part in rest:
+            child = node.child(part)
+            if child is None:
+                if isinstance(node, SequenceNode):
+                    raise IndexError(f"list index {part!r} out of range")
+                if node.is_leaf():
+                    raise KeyError(f"Cannot navigate into {type(node.value).__name__}")
+                raise KeyError(format_path(parts))
+            node = child
+        return node
+
+    def _top(self) -> YamlNode:
+        """The node holding the top-level keys; a single-key root gets a virtual root above it."""
+        if self.root is None:
+            self.root = YamlNode("root")
+            self._virtual_root = True
+        elif not self._virtual_root:
+            top = self.root
+            self.root = YamlNode("root")
+            self._virtual_root = True
+            self.root.add_child(top)
+        return self.root
+
+
+def _new_node(key: Any, data: Any) -> YamlNode:
+    if isinstance(data, list):
+        return SequenceNode(key)
+    if isinstance(data, dict):
+        return YamlNode(key)
+    return YamlNode(key, data)
+
+
+def _items(data: Any) -> Iterator[Tuple[Any, Any]]:
+    return iter(data.items()) if isinstance(data, dict) else enumerate(data)
+
+
+def _parts(path: str | Sequence[PathPart]) -> Tuple[PathPart, ...]:
+    return compile_path(path).parts if isinstance(path, str) else tuple(path)
+
+
+def _key_matches(key: Any, part: PathPart) -> bool:
+    return key == part or YamlNode._child_alias(part, {key: True}) is not None
+
+
+def node_value(node: YamlNode) -> Any:
+    """The plain value (scalar, dict or list) a node and its subtree stand for."""
+    if node.is_leaf():
+        return node.value
+    result: Any = [] if isinstance(node, SequenceNode) else {}
+    stack = [(iter(node.children), result, isinstance(node, SequenceNode))]
+    while stack:
+        children, out, is_list = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+        if child.is_leaf():
+            value = child.value
+        elif isinstance(child, SequenceNode):
+            value = []
+            stack.append((iter(child.children), value, True))
+        else:
+            value = {}
+            stack.append((iter(child.children), value, False))
+        if is_list:
+            out.append(value)
+        else:
+            out[child.key] = value
+    return result
+
+
+def iter_yaml_trees(path: str) -> Iterator[YamlTree]:
+    """Yield one YamlTree per document of a multi-document stream."""
+    for doc in iter_yaml_documents(path):
+        tree = YamlTree()
+        tree.load_from_dict(doc)
+        yield tree
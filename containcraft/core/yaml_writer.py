@@ -0,0 +1,405 @@
+# core/yaml_writer.py
+from typing import Any, Dict, List, Set, Tuple
+import yaml
+from yaml.events import (AliasEvent, DocumentStartEvent, MappingEndEvent, MappingStartEvent,
+                         ScalarEvent, SequenceEndEvent, SequenceStartEvent)
+from .yaml_io import (SafeDumper, SafeLoader, atomic_open, dumps_yaml, is_multi_document,
+                      loads_yaml, replace_document)
+from .yaml_path import PathPart
+from .profiling import profiled
+
+# An edit-aware writer. Instead of dumping a whole document after an edit,
+# the old and new documents are compared, the source spans of the changed
+# nodes are located from parse events, and only those spans are rewritten:
+# comments, quoting and layout everywhere else are kept byte for byte.
+#
+# Handled in place: changing a value, deleting a mapping key or a sequence
+# item, adding a mapping key, and appending to a sequence, in block style;
+# anything inside a flow collection ({...} / [...]) rewrites that
+# collection on one line. Everything else (root-level replacements, aliases,
+# entries that share a line with a "- " marker, ...) falls back to a full
+# dump. Every rewritten region is re-parsed and compared with the new
+# document before the text is used, so a bad splice becomes a fallback
+# rather than a corrupted file.
+
+Parts = Tuple[PathPart, ...]
+Change = Tuple[str, Parts, Any]
+
+
+class _Fallback(Exception):
+    """The change cannot be made by rewriting spans; dump the document instead."""
+
+
+def _same(a: Any, b: Any) -> bool:
+    return a is b or (type(a) is type(b) and a == b)
+
+
+def document_changes(old: Any, new: Any) -> List[Change]:
+    """
+    Describe how to turn old into new as (op, parts, value) changes.
+
+    ops are "set" (replace a value), "delete", "add" (a new mapping key at
+    the end) and "append" (new sequence items). Unchanged subtrees are
+    skipped by identity first, so this is cheap for edited snapshots that
+    share structure with the original (see edit.persistent).
+    """
+    changes: List[Change] = []
+    stack: List[Tuple[Any, Any, Parts]] = [(old, new, ())]
+    while stack:
+        a, b, parts = stack.pop()
+        if a is b:
+            continue
+        if isinstance(a, dict) and isinstance(b, dict):
+            common = [k for k in b if k in a]
+            new_keys = list(b)
+            if not common or [k for k in a if k in b] != common or new_keys[:len(common)] != common:
+                # replaced wholesale, reordered, or new keys in the middle
+                changes.append(("set", parts, b))
+                continue
+            changes.extend(("delete", parts + (k,), None) for k in a if k not in b)
+            changes.extend(("add", parts + (k,), b[k]) for k in new_keys[len(common):])
+            stack.extend((a[k], b[k], parts + (k,)) for k in reversed(common))
+        elif isinstance(a, list) and isinstance(b, list):
+            if len(b) >= len(a):
+                changes.extend(("append", parts + (i,), b[i]) for i in range(len(a), len(b)))
+                stack.extend((a[i], b[i], parts + (i,)) for i in reversed(range(len(a))))
+                continue
+            i = next((i for i in range(len(b)) if not _same(a[i], b[i])), len(b))
+            if b and len(b) == len(a) - 1 and all(_same(a[j + 1], b[j]) for j in range(i, len(b))):
+                changes.append(("delete", parts + (i,), None))
+            else:
+                changes.append(("set", parts, b))
+        elif not _same(a, b):
+            changes.append(("set", parts, b))
+    return changes
+
+
+class _Node:
+    __slots__ = ("start", "end", "column", "key_start", "kind", "flow", "style", "count")
+
+    def __init__(self, event, key_start: int | None):
+        self.start = event.start_mark.index
+        self.column = event.start_mark.column
+        self.key_start = key_start
+        self.end = self.start
+        self.count = 0
+        if isinstance(event, ScalarEvent):
+            self.kind = "scalar"
+            self.flow = False
+            self.style = event.style
+        else:
+            self.kind = "mapping" if isinstance(event, MappingStartEvent) else "sequence"
+            self.flow = bool(event.flow_style)
+            self.style = None
+
+
+class _Frame:
+    __slots__ = ("node", "is_mapping", "flow", "parts", "expect_key", "key", "key_start", "count")
+
+    def __init__(self, node: _Node | None, is_mapping: bool, flow: bool, parts: Parts | None):
+        self.node = node
+        self.is_mapping = is_mapping
+        self.flow = flow
+        self.parts = parts
+        self.expect_key = True
+        self.key = None
+        self.key_start = None
+        self.count = 0
+
+
+def _locate(text: str, index: int, wanted: Set[Parts]) -> Dict[Parts, _Node]:
+    """
+    Source spans of the nodes at the wanted paths (str-ified parts) in
+    document number index. A block collection's end is the end of its last
+    content, so trailing comments and blank lines stay outside it.
+    """
+    found: Dict[Parts, _Node] = {}
+    doc = -1
+    stack: List[_Frame] = []
+    last_end = 0
+    open_nodes = 0
+    for event in yaml.parse(text, Loader=SafeLoader):
+        cls = type(event)
+        if cls is DocumentStartEvent:
+            doc += 1
+            if doc > index:
+                break
+            continue
+        if doc != index:
+            continue
+        if cls is AliasEvent:
+            raise _Fallback("alias")
+        if cls is MappingEndEvent or cls is SequenceEndEvent:
+            frame = stack.pop()
+            if frame.flow:
+                last_end = event.end_mark.index
+            if frame.node is not None:
+                frame.node.end = last_end
+                frame.node.count = frame.count
+                open_nodes -= 1
+                if not open_nodes and len(found) == len(wanted):
+                    break  # everything wanted is found and closed
+            continue
+        if cls is not ScalarEvent and cls is not MappingStartEvent and cls is not SequenceStartEvent:
+            continue
+
+        parts: Parts | None = ()
+        key_start = None
+        if stack:
+            top = stack[-1]
+            if top.parts is None:
+                parts = None
+            elif top.is_mapping:
+                if top.expect_key:
+                    if cls is not ScalarEvent:
+                        raise _Fallback("complex key")
+                    top.key = event.value
+                    top.key_start = event.start_mark.index
+                    top.expect_key = False
+                    last_end = event.end_mark.index
+                    continue
+                parts = top.parts + (top.key,)
+                key_start = top.key_start
+                top.expect_key = True
+                top.count += 1
+            else:
+                parts = top.parts + (str(top.count),)
+                top.count += 1
+            if parts is not None and parts not in wanted:
+                parts = None
+        elif () not in wanted:
+            parts = None
+        node = None
+        if parts is not None:
+            node = found[parts] = _Node(event, key_start)
+        if cls is ScalarEvent:
+            last_end = event.end_mark.index
+            if node is not None:
+                node.end = last_end
+                if not open_nodes and len(found) == len(wanted):
+                    break
+        else:
+            if node is not None:
+                open_nodes += 1
+            stack.append(_Frame(node, cls is MappingStartEvent, bool(event.flow_style), parts))
+    return found
+
+
+def _inline(value: Any) -> str:
+    """value as a one-line YAML flow node."""
+    text = yaml.dump([value], Dumper=SafeDumper, default_flow_style=True, width=1 << 30,
+                     allow_unicode=False, sort_keys=False)
+    return text.strip()[1:-1]
+
+
+def _scalar(value: Any) -> str:
+    """value as a scalar in block context (plain where possible, unlike _inline)."""
+    text = yaml.dump(value, Dumper=SafeDumper, width=1 << 30, allow_unicode=False)
+    if text.endswith("\n...\n"):
+        text = text[:-4]
+    return text.rstrip("\n")
+
+
+def _is_block(value: Any) -> bool:
+    return isinstance(value, (dict, list)) and bool(value)
+
+
+def _indent(text: str, column: int, first: bool = True) -> str:
+    pad = " " * column
+    lines = text.splitlines(keepends=True)
+    return "".join(line if (i == 0 and not first) or line == "\n" else pad + line
+                   for i, line in enumerate(lines))
+
+
+def _line_start(text: str, i: int) -> int:
+    return text.rfind("\n", 0, i) + 1
+
+
+def _line_end(text: str, i: int) -> int:
+    """Index just past the line containing position i (block scalars end after their newline)."""
+    if i > 0 and text[i - 1] == "\n":
+        return i
+    nl = text.find("\n", i)
+    return len(text) if nl < 0 else nl + 1
+
+
+def _item_value(value: Any, column: int) -> str:
+    """Text for a sequence item's value placed after "- " at column - 2."""
+    if _is_block(value):
+        return _indent(dumps_yaml(value), column, first=False)
+    return (_inline(value) if isinstance(value, (dict, list)) else _scalar(value)) + "\n"
+
+
+def _splices(text: str, node: Dict[Parts, _Node], op: str, parts: Parts, value: Any) -> List[Tuple[int, int, str]]:
+    """Text replacements (start, end, new) for one change."""
+    key = tuple(str(p) for p in parts)
+    parent = node[key[:-1]] if key else None
+    target = node.get(key)
+
+    if op in ("add", "append"):
+        if parent is None or parent.kind != ("mapping" if op == "add" else "sequence"):
+            raise _Fallback(op)
+        at = _line_end(text, parent.end)
+        lead = "" if at == 0 or text[at - 1] == "\n" else "\n"
+        if op == "add":
+            return [(at, at, lead + _indent(dumps_yaml({parts[-1]: value}), parent.column))]
+        return [(at, at, lead + " " * parent.column + "- " + _item_value(value, parent.column + 2))]
+
+    if target is None or parent is None:
+        raise _Fallback("document root")
+
+    if op == "delete":
+        if parent.count <= 1:
+            raise _Fallback("last entry")
+        start = target.key_start if parent.kind == "mapping" else target.start
+        begin = _line_start(text, start)
+        prefix = text[begin:start]
+        if parent.kind == "mapping" and prefix.strip() == "-":
+            # first key of a sequence item: pull the next key up behind the "- "
+            after = _line_end(text, target.end)
+            column = start - begin
+            following = text[after:after + column + 1]
+            if len(following) == column + 1 and not following[:column].strip() and following[column] not in " #\n":
+                return [(start, after + column, "")]
+            raise _Fallback("key shares a line")
+        if parent.kind == "mapping" and prefix.strip():
+            raise _Fallback("key shares a line")
+        if parent.kind == "sequence" and prefix.strip() != "-":
+            raise _Fallback("item shares a line")
+        return [(begin, _line_end(text, target.end), "")]
+
+    # set
+    if target.flow:
+        return [(target.start, target.end, _inline(value))]
+    if target.kind == "scalar" and target.style not in ("|", ">") and not _is_block(value):
+        scalar = _inline(value) if isinstance(value, (dict, list)) else _scalar(value)
+        return [(target.start, target.end, scalar)]
+    end = _line_end(text, target.end)
+    if parent.kind == "mapping":
+        column = target.key_start - _line_start(text, target.key_start)
+        entry = _indent(dumps_yaml({parts[-1]: value}), column, first=False)
+        return [(target.key_start, end, entry)]
+    return [(target.start, end, _item_value(value, target.column))]
+
+
+def _promote(changes: List[Change], node: Dict[Parts, _Node], new: Any) -> List[Change]:
+    """Turn changes inside flow collections into a rewrite of the outermost one."""
+    result: List[Change] = []
+    promoted: Set[Parts] = set()
+    for op, parts, value in changes:
+        for depth in range(len(parts)):
+            ancestor = node.get(tuple(str(p) for p in parts[:depth]))
+            if ancestor is not None and ancestor.flow:
+                flow_parts = parts[:depth]
+                if flow_parts not in promoted:
+                    promoted.add(flow_parts)
+                    value = new
+                    for p in flow_parts:
+                        value = value[p]
+                    result.append(("set", flow_parts, value))
+                break
+        else:
+            result.append((op, parts, value))
+    return result
+
+
+def _verify(text: str, edits: List[Tuple[int, int, str]], node: Dict[Parts, _Node],
+            parents: Set[Parts], new: Any) -> bool:
+    """
+    Re-parse each outermost edited collection on its own, with the edits
+    applied, and compare it with the new document. Block collections parse
+    the same standalone, so only the regions that changed are constructed,
+    not the whole file.
+    """
+    for parts in parents:
+        if any(parts[:i] in parents for i in range(len(parts))):
+            continue  # checked as part of an enclosing region
+        region = node[tuple(str(p) for p in parts)]
+        begin, stop = _line_start(text, region.start), _line_end(text, region.end)
+        out = []
+        if text[begin:region.start].strip():
+            # starts after a "- " or a key: pad the first line back to its column
+            begin = region.start
+            out.append(" " * region.column)
+        pos = begin
+        for start, end, new_text in edits:
+            if begin <= start and end <= stop:
+                out.append(text[pos:start])
+                out.append(new_text)
+                pos = end
+        out.append(text[pos:stop])
+        expected = new
+        for p in parts:
+            expected = expected[p]
+        try:
+            if loads_yaml("".join(out)) != expected:
+                return False
+        except yaml.YAMLError:
+            return False
+    return True
+
+
+def render_edits(text: str, old: Any, new: Any, index: int = 0) -> str | None:
+    """
+    Return text with document number index changed from old to new by
+    rewriting only the changed spans, or None if that is not possible.
+    """
+    changes = document_changes(old, new)
+    if not changes:
+        return text
+    wanted: Set[Parts] = set()
+    for op, parts, _ in changes:
+        key = tuple(str(p) for p in parts)
+        # added keys and appended items are not in the source yet
+        wanted.update(key[:i] for i in range(len(key) + (op not in ("add", "append"))))
+    try:
+        node = _locate(text, index, wanted)
+        edits = []
+        parents: Set[Parts] = set()
+        for order, (op, parts, value) in enumerate(_promote(changes, node, new)):
+            # insertions at one position: before any rewrite starting there,
+            # and entries of inner collections before those of outer ones
+            edits.extend(((start, start != end, -len(parts), order), end, new_text)
+                         for start, end, new_text in _splices(text, node, op, parts, value))
+            parents.add(parts[:-1])
+    except (_Fallback, KeyError, yaml.YAMLError):
+        return None
+
+    edits.sort(key=lambda e: e[0])
+    spans = [(order[0], end, new_text) for order, end, new_text in edits]
+    out = []
+    pos = 0
+    for start, end, new_text in spans:
+        if start < pos:
+            return None  # overlapping rewrites
+        out.append(text[pos:start])
+        out.append(new_text)
+        pos = end
+    out.append(text[pos:])
+    if not _verify(text, spans, node, parents, new):
+        return None
+    return "".join(out)
+
+
+@profiled("yaml_writer.save_yaml_edits", "io")
+def save_yaml_edits(path: str, old: Any, new: Any, index: int = 0) -> bool:
+    """
+    Save the edited document number index of path, rewriting only what
+    changed where possible; falls back to dumping the file. The file is
+    replaced atomically either way. Returns True if the edit was in place.
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+    result = render_edits(text, old, new, index)
+    if result is None:
+        if is_multi_document(path):
+            replace_document(path, index, new)
+            return False
+        result = dumps_yaml(new)
+        in_place = False
+    else:
+        in_place = True
+    if result != text:
+        with atomic_open(path) as f:
+            f.write(result)
+    return in_place
@@ -1,67 +1,87 @@
-import yaml
 import os
-import copy
 import tempfile
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
-from typing import Any
+from rich.text import Text
+from typing import Any, Sequence
+from ..core.yaml_diff import ADDED, CHANGED, REMOVED, iter_diff, summarize_value
+from ..core.yaml_io import dumps_yaml
+from ..core.yaml_path import compile_path
+from ..core.profiling import profiled
+from .history import EditHistory, DEFAULT_HISTORY_BYTES
+from .persistent import assoc_in, dissoc_in, append_in
+from .render_cache import RenderCache
 
 console = Console()
 
+# Documents longer than this open in viewport mode (only the region around
+# the last edited path is drawn); "v" toggles, "p" pages the whole document.
+VIEWPORT_MIN_LINES = 200
+
 def _get_by_path(data, path):
-    parts = _split_path(path)
-    cur = data
-    for p in parts:
-        if isinstance(cur, dict):
-            cur = cur[p]
-        elif isinstance(cur, list):
-            cur = cur[int(p)]
-        else:
-            raise KeyError(f"Cannot navigate into {type(cur).__name__}")
-    return cur
+    return compile_path(path).get(data)
 
 def _set_by_path(data, path, value):
-    parts = _split_path(path)
-    cur = data
-    for p in parts[:-1]:
-        if isinstance(cur, dict):
-            cur = cur[p]
-        elif isinstance(cur, list):
-            cur = cur[int(p)]
-    cur[parts[-1]] = value
+    compile_path(path).set(data, value)
 
 def _del_by_path(data, path):
-    parts = _split_path(path)
-    cur = data
-    for p in parts[:-1]:
-        if isinstance(cur, dict):
-            cur = cur[p]
-        elif isinstance(cur, list):
-            cur = cur[int(p)]
-    del cur[parts[-1]]
+    compile_path(path).delete(data)
 
 def _split_path(path):
-    """Parse path like 'a.b.c' or 'arr[0].field'"""
-    segments = []
-    for seg in path.split("."):
-        if "[" in seg and seg.endswith("]"):
-            name, idx = seg[:-1].split("[")
-            if name:
-                segments.append(name)
-            segments.append(idx)
-        else:
-            segments.append(seg)
-    return segments
+    """Parse path like 'a.b.c', 'arr[0].field' or 'cluster."broker.id"'"""
+    return list(compile_path(path).parts)
 
+@profiled("edit.pretty", "serialize")
 def _pretty(data):
-    return yaml.safe_dump(data, sort_keys=False, default_flow_style=False)
+    return dumps_yaml(data)
+
+# At most this many changed paths are listed in the save preview.
+PREVIEW_MAX_CHANGES = 200
 
+_DIFF_STYLES = {ADDED: ("+", "green"), REMOVED: ("-", "red"), CHANGED: ("~", "yellow")}
+
+@profiled("edit.preview", "render")
 def _preview(old, new):
-    console.print("\n[bold red]BEFORE[/]")
-    console.print(Panel(Syntax(_pretty(old), "yaml", theme="monokai"), border_style="red"))
-    console.print("\n[bold green]AFTER[/]")
-    console.print(Panel(Syntax(_pretty(new), "yaml", theme="monokai"), border_style="green"))
+    """List only the changed paths between the original and working documents."""
+    lines = []
+    total = 0
+    for entry in iter_diff(old, new):
+        total += 1
+        if total > PREVIEW_MAX_CHANGES:
+            continue
+        marker, style = _DIFF_STYLES[entry.kind]
+        line = Text(f"{marker} ", style=f"bold {style}")
+        line.append(entry.path, style="bold")
+        if entry.kind == CHANGED:
+            line.append(f": {summarize_value(entry.old)}", style="red")
+            line.append(" -> ")
+            line.append(summarize_value(entry.new), style="green")
+        else:
+            line.append(f": {summarize_value(entry.new if entry.kind == ADDED else entry.old)}", style=style)
+        lines.append(line)
+    if total > PREVIEW_MAX_CHANGES:
+        lines.append(Text(f"... and {total - PREVIEW_MAX_CHANGES} more", style="dim"))
+    if not lines:
+        lines.append(Text("No changes", style="dim"))
+    title = f"{total} change{'s' if total != 1 else ''}"
+    console.print(Panel(Text("\n").join(lines), title=title, border_style="cyan", expand=False))
+
+def _show_document(cache: RenderCache, doc, viewport: bool, focus: Sequence):
+    """Draw the document, or only the lines around focus in viewport mode."""
+    lines = cache.lines(doc)
+    if not viewport:
+        console.print(Text("\n").join(lines))
+        return
+    height = max(console.size.height - 16, 10)
+    center = cache.line_of(doc, focus)
+    start = max(0, min(center - height // 2, len(lines) - height))
+    end = min(len(lines), start + height)
+    console.print(f"[dim]lines {start + 1}-{end} of {len(lines)} (v: full view, p: pager)[/]")
+    console.print(Text("\n").join(lines[start:end]))
+
+def _page_document(cache: RenderCache, doc):
+    with console.pager(styles=True):
+        console.print(Text("\n").join(cache.lines(doc)))
 
 def _show_keys(data, prefix=""):
     """Show available keys in a dict/list"""
@@ -72,23 +92,36 @@ def _show_keys(data, prefix=""):
         for i in range(len(data)):
             console.print(f"  [cyan]{prefix}[{i}][/]")
 
-def edit_yaml_session(data: dict | None) -> dict | None:
+def edit_yaml_session(data: dict | None, max_history_bytes: int | None = DEFAULT_HISTORY_BYTES) -> dict | None:
+    """Interactive editor over data; returns the edited document or None.
+
+    Edits are path-copying, so data itself is never modified and undo/redo
+    just switch between shared snapshots. max_history_bytes caps the memory
+    retained by the undo history (None for unlimited).
+    """
     original = data
-    working = copy.deepcopy(original)
-    history = []
+    history = EditHistory(original, max_bytes=max_history_bytes)
+    # Redraws reuse the cached dump/highlight until the snapshot changes.
+    cache = RenderCache()
+    viewport = len(cache.lines(original)) > VIEWPORT_MIN_LINES
+    focus: Sequence = ()
 
     while True:
+        working = history.current
         console.clear()
         console.print(Panel("YAML Editor", style="bold cyan"))
-        console.print(Syntax(_pretty(working), "yaml", theme="monokai"))
+        _show_document(cache, working, viewport, focus)
         console.print("\n[bold]Actions:[/]\n"
                       "1) Set value at path\n"
                       "2) Append to list\n"
                       "3) Delete key\n"
                       "4) Show available keys\n"
                       "5) Undo last change\n"
-                      "6) Preview diff & save\n"
-                      "7) Cancel")
+                      "6) Redo last undone change\n"
+                      "7) Preview diff & save\n"
+                      "8) Cancel\n"
+                      "v) Toggle viewport / full document\n"
+                      "p) Page through the document")
 
         choice = console.input("[bold white]Enter choice number> [/]").strip()
 
@@ -97,43 +130,38 @@ def edit_yaml_session(data: dict | None) -> dict | None:
             path = console.input("Full path to value> ").strip()
             val = console.input("New value (string)> ")
             try:
-                history.append(copy.deepcopy(working))
-                _set_by_path(working, path, val)
+                history.commit(*assoc_in(working, compile_path(path).parts, val))
+                focus = compile_path(path).parts
                 console.print(f"[green]✓ Updated {path}[/]")
                 input("Press Enter to continue")
             except Exception as e:
                 console.print(f"[red]Error: {e}[/]")
-                working = history.pop()  # rollback
                 input("Press Enter to continue")
 
         elif choice == "2":
             path = console.input("List path (e.g., services.kafka.ports)> ").strip()
             val = console.input("Value to append> ")
             try:
-                history.append(copy.deepcopy(working))
-                lst = _get_by_path(working, path)
-                if not isinstance(lst, list):
-                    console.print("[red]Not a list[/]")
-                    working = history.pop()
-                else:
-                    lst.append(val)
-                    console.print(f"[green]✓ Appended to {path}[/]")
-                    input("Press Enter to continue")
+                history.commit(*append_in(working, compile_path(path).parts, val))
+                focus = compile_path(path).parts
+                console.print(f"[green]✓ Appended to {path}[/]")
+                input("Press Enter to continue")
+            except TypeError:
+                console.print("[red]Not a list[/]")
+                input("Press Enter to continue")
             except Exception as e:
                 console.print(f"[red]Error: {e}[/]")
-                working = history.pop()
                 input("Press Enter to continue")
 
         elif choice == "3":
             path = console.input("Path to delete> ").strip()
             try:
-                history.append(copy.deepcopy(working))
-                _del_by_path(working, path)
+                history.commit(*dissoc_in(working, compile_path(path).parts))
+                focus = compile_path(path).parts
                 console.print(f"[green]✓ Deleted {path}[/]")
                 input("Press Enter to continue")
             except Exception as e:
                 console.print(f"[red]Error: {e}[/]")
-                working = history.pop()
                 input("Press Enter to continue")
 
         elif choice == "4":
@@ -148,15 +176,14 @@ def edit_yaml_session(data: dict | None) -> dict | None:
                 _show_keys(cur, "")
                 if isinstance(cur, (dict, list)):
                     console.print(f"\n[yellow]Preview:[/]")
-                    console.print(Syntax(_pretty(cur), "yaml", theme="monokai"))
+                    console.print(Text("\n").join(cache.lines(cur)))
                 input("\nPress Enter to continue")
             except Exception as e:
                 console.print(f"[red]Error: {e}[/]")
                 input("Press Enter to continue")
 
         elif choice == "5":
-            if history:
-                working = history.pop()
+            if history.undo():
                 console.print("[green]✓ Undone[/]")
                 input("Press Enter to continue")
             else:
@@ -164,6 +191,14 @@ def edit_yaml_session(data: dict | None) -> dict | None:
                 input("Press Enter to continue")
 
         elif choice == "6":
+            if history.redo():
+                console.print("[green]✓ Redone[/]")
+                input("Press Enter to continue")
+            else:
+                console.print("[yellow]Nothing to redo[/]")
+                input("Press Enter to continue")
+
+        elif choice == "7":
             console.clear()
             _preview(original, working)
             if console.input("\n[bold white]Save changes? (y/n)> [/]").lower().startswith("y"):
@@ -172,10 +207,16 @@ def edit_yaml_session(data: dict | None) -> dict | None:
                 console.print("[yellow]Changes not saved[/]")
                 input("Press Enter to continue")
 
-        elif choice == "7":
+        elif choice == "8":
             console.print("[bold yellow]Discarding changes[/]")
             return None
 
+        elif choice.lower() == "v":
+            viewport = not viewport
+
+        elif choice.lower() == "p":
+            _page_document(cache, working)
+
         else:
             console.print("[red]Invalid choice[/]")
             input("Press Enter to continue")
@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Any, Deque, List, Tuple
+
+# Undo/redo entries only hold a reference to another root plus the bytes
+# that version keeps alive on its own, so the default budget covers
+# thousands of edits even on large documents.
+DEFAULT_HISTORY_BYTES = 64 * 1024 * 1024
+
+
+class EditHistory:
+    """
+    Undo/redo over immutable document snapshots.
+
+    Documents are produced by the path-copying helpers in
+    ``edit.persistent``, so a snapshot is just a root reference and undo/redo
+    are O(1) pointer switches. Each entry is charged the bytes copied by the
+    edit that separates it from its neighbour; the oldest undo entries are
+    dropped once the total exceeds ``max_bytes``.
+    """
+
+    def __init__(self, document: Any, max_bytes: int | None = DEFAULT_HISTORY_BYTES):
+        self.current: Any = document
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._undo: Deque[Tuple[Any, int]] = deque()
+        self._redo: List[Tuple[Any, int]] = []
+
+    def commit(self, document: Any, cost: int = 0):
+        """Make document current; cost is the bytes the edit copied."""
+        self._undo.append((self.current, cost))
+        self.bytes_used += cost
+        self.bytes_used -= sum(c for _, c in self._redo)
+        self._redo.clear()
+        self.current = document
+        self._evict()
+
+    def undo(self) -> bool:
+        if not self._undo:
+            return False
+        previous, cost = self._undo.pop()
+        self._redo.append((self.current, cost))
+        self.current = previous
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo:
+            return False
+        following, cost = self._redo.pop()
+        self._undo.append((self.current, cost))
+        self.current = following
+        return True
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        while self._undo and self.bytes_used > self.max_bytes:
+            _, cost = self._undo.popleft()
+            self.bytes_used -= cost
@@ -0,0 +1,78 @@
+import sys
+from typing import Any, Callable, Sequence, Tuple
+from ..core.yaml_path import PathPart, resolve_key
+
+# Persistent (path-copying) updates over plain dict/list documents.
+# An edit copies only the containers on the path from the root to the
+# modified node; every other subtree is shared with the previous version,
+# so older versions stay valid snapshots as long as nobody mutates them
+# in place. Each copied container is a full shallow copy, so an edit costs
+# the sum of the widths of the containers on its path, not O(depth): a
+# change under a mapping with 10k keys copies all 10k references.
+
+
+def _shallow_copy(container: Any) -> Any:
+    if isinstance(container, dict):
+        return dict(container)
+    if isinstance(container, list):
+        return list(container)
+    raise KeyError(f"Cannot navigate into {type(container).__name__}")
+
+
+def update_in(data: Any, parts: Sequence[PathPart], fn: Callable[[Any], Any]) -> Tuple[Any, int]:
+    """Replace the node at parts with fn(node), copying only its ancestors.
+
+    Returns the new root and the number of bytes of freshly copied
+    containers, which is what the new version costs on top of the old one.
+    Every ancestor is copied whole, so wide ancestors dominate that cost.
+    """
+    chain = [data]
+    for p in parts:
+        cur = chain[-1]
+        chain.append(cur[resolve_key(cur, p)])
+
+    node = fn(chain[-1])
+    copied = sys.getsizeof(node) if node is not chain[-1] else 0
+    for container, p in zip(reversed(chain[:-1]), reversed(parts)):
+        parent = _shallow_copy(container)
+        parent[resolve_key(parent, p)] = node
+        copied += sys.getsizeof(parent)
+        node = parent
+    return node, copied
+
+
+def assoc_in(data: Any, parts: Sequence[PathPart], value: Any) -> Tuple[Any, int]:
+    """Return a new document with value stored at parts."""
+    if not parts:
+        raise KeyError("Empty path")
+
+    def _set(parent):
+        parent = _shallow_copy(parent)
+        parent[resolve_key(parent, parts[-1])] = value
+        return parent
+
+    return update_in(data, parts[:-1], _set)
+
+
+def dissoc_in(data: Any, parts: Sequence[PathPart]) -> Tuple[Any, int]:
+    """Return a new document with the key or index at parts removed."""
+    if not parts:
+        raise KeyError("Empty path")
+
+    def _delete(parent):
+        parent = _shallow_copy(parent)
+        del parent[resolve_key(parent, parts[-1])]
+        return parent
+
+    return update_in(data, parts[:-1], _delete)
+
+
+def append_in(data: Any, parts: Sequence[PathPart], value: Any) -> Tuple[Any, int]:
+    """Return a new document with value appended to the list at parts."""
+
+    def _append(lst):
+        if not isinstance(lst, list):
+            raise TypeError("Not a list")
+        return lst + [value]
+
+    return update_in(data, parts, _append)
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence, Tuple
+import yaml
+from yaml.events import (AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent,
+                         SequenceEndEvent, SequenceStartEvent)
+from rich.syntax import Syntax
+from rich.text import Text
+from ..core.yaml_io import SafeLoader, dumps_yaml
+from ..core.yaml_path import PathPart
+from ..core.profiling import span
+
+_NODE_EVENTS = (ScalarEvent, AliasEvent, MappingStartEvent, SequenceStartEvent)
+_END_EVENTS = (MappingEndEvent, SequenceEndEvent)
+
+
+def _line_of_path(text: str, parts: Sequence[PathPart]) -> int | None:
+    """Return the 0-based line where the node at parts starts in text.
+
+    Walks parse events of the dumped document and stops as soon as the path
+    is reached, so nothing is constructed.
+    """
+    target = [str(p) for p in parts]
+    if not target:
+        return 0
+    # one entry per open collection: [is_mapping, current key/index, expecting_key]
+    stack: List[list] = []
+    for event in yaml.parse(text, Loader=SafeLoader):
+        if isinstance(event, _END_EVENTS):
+            stack.pop()
+            continue
+        if not isinstance(event, _NODE_EVENTS):
+            continue
+        if stack:
+            top = stack[-1]
+            if top[0]:
+                if top[2]:
+                    # mapping key: report the "key:" line for a matching path
+                    top[1] = event.value if isinstance(event, ScalarEvent) else None
+                    top[2] = False
+                    if len(stack) == len(target) and [str(e[1]) for e in stack] == target:
+                        return event.start_mark.line
+                    continue
+                top[2] = True
+            else:
+                top[1] += 1
+                if len(stack) == len(target) and [str(e[1]) for e in stack] == target:
+                    return event.start_mark.line
+        if isinstance(event, MappingStartEvent):
+            stack.append([True, None, True])
+        elif isinstance(event, SequenceStartEvent):
+            stack.append([False, -1, False])
+    return None
+
+
+class _Rendered:
+    __slots__ = ("doc", "text", "_lines", "_line_of")
+
+    def __init__(self, doc: Any):
+        # holding doc keeps its id() from being reused while cached
+        self.doc = doc
+        self.text = dumps_yaml(doc)
+        self._lines: List[Text] | None = None
+        self._line_of: Dict[Tuple[PathPart, ...], int | None] = {}
+
+
+class RenderCache:
+    """
+    Dumped and highlighted renderings of document snapshots.
+
+    Editor documents are immutable snapshots (see edit.persistent), so a
+    snapshot's identity is its version: a document is dumped and highlighted
+    once, however many times the screen is redrawn, previewed or paged.
+    """
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, _Rendered]" = OrderedDict()
+
+    def _get(self, doc: Any) -> _Rendered:
+        key = id(doc)
+        entry = self._entries.get(key)
+        if entry is None or entry.doc is not doc:
+            entry = self._entries[key] = _Rendered(doc)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return entry
+
+    def text(self, doc: Any) -> str:
+        return self._get(doc).text
+
+    def lines(self, doc: Any) -> List[Text]:
+        """Highlighted lines of the dumped document."""
+        entry = self._get(doc)
+        if entry._lines is None:
+            with span("edit.highlight", "render", lines=entry.text.count("\n")):
+                highlighted = Syntax(entry.text, "yaml", theme="monokai").highlight(entry.text)
+            entry._lines = list(highlighted.split("\n"))
+        return entry._lines
+
+    def line_of(self, doc: Any, parts: Sequence[PathPart]) -> int:
+        """Line of the deepest existing prefix of parts (0 if none)."""
+        entry = self._get(doc)
+        parts = tuple(parts)
+        for end in range(len(parts), 0, -1):
+            prefix = parts[:end]
+            if prefix not in entry._line_of:
+                entry._line_of[prefix] = _line_of_path(entry.text, prefix)
+            if entry._line_of[prefix] is not None:
+                return entry._line_of[prefix]
+        return 0
@@ -1,9 +1,14 @@
-
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
+from .spec import Spec, spec_errors
 
 class BaseSchema(ABC):
     name = "base"
+    # for generation: the build() parameter holding one entry per generated
+    # item (services, brokers), or None when every item is its own document
+    item_key: str | None = None
+    # declarative description of valid documents (see schemas.spec); compiled on first use
+    spec: Spec | None = None
 
     @abstractmethod
     def guide_user_input(self, ui) -> Dict[str, Any]:
@@ -16,3 +21,27 @@ class BaseSchema(ABC):
     @abstractmethod
     def default_structure(self) -> Dict[str, Any]:
         return {}
+
+    @property
+    def can_build(self) -> bool:
+        """Whether build() is available; only declarative schemas (with a spec) can generate."""
+        return self.spec is not None
+
+    def build(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a document from answers to the prompts, without asking (see batch.generate)."""
+        raise ValueError(f"{self.name} documents cannot be generated")
+
+    def detect(self, data) -> bool:
+        """Whether data looks like a document of this schema (for auto-detection)."""
+        return False
+
+    def errors(self, data) -> List[str]:
+        """Every problem with data as "path: message"; empty when valid or without a spec."""
+        return spec_errors(self.spec, data) if self.spec is not None else []
+
+    def check(self, data) -> bool:
+        """Raise ValueError listing every problem with data (see errors); True when valid."""
+        errors = self.errors(data)
+        if errors:
+            raise ValueError("\n".join(errors))
+        return True
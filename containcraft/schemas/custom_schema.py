@@ -1,13 +1,14 @@
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 from .base_schema import BaseSchema
-from ..core.yaml_node import YamlNode
+from ..core.yaml_node import SequenceNode, YamlNode
 from ..core.yaml_tree import YamlTree
-from ..ui.inputs import InputHandler
+if TYPE_CHECKING:
+    from ..ui.inputs import InputHandler
 
 class CustomSchema(BaseSchema):
     name = "custom"
 
-    def guide_user_input(self, ui: InputHandler) -> Dict[str, Any]:
+    def guide_user_input(self, ui: "InputHandler") -> Dict[str, Any]:
         ui.print_header("Custom YAML Builder")
         root_key = ui.get_string("Root key:")
         tree = YamlTree()
@@ -19,7 +20,7 @@ class CustomSchema(BaseSchema):
         self._build_obj(ui, tree.root)
         return tree.tree_to_dict()
 
-    def _build_obj(self, ui: InputHandler, parent: YamlNode) -> None:
+    def _build_obj(self, ui: "InputHandler", parent: YamlNode) -> None:
         while True:
             key = ui.get_string("Add key:")
             t = ui.get_choice("Type:", ["string", "number", "list", "object"])
@@ -29,7 +30,10 @@ class CustomSchema(BaseSchema):
             elif t == "number":
                 parent.add_child(YamlNode(key, ui.get_number("Number:")))
             elif t == "list":
-                parent.add_child(YamlNode(key, ui.get_list("Comma-separated items:")))
+                items = SequenceNode(key)
+                for item in ui.get_list("Comma-separated items:"):
+                    items.add_child(YamlNode(0, item))
+                parent.add_child(items)
             elif t == "object":
                 child = YamlNode(key)
                 parent.add_child(child)
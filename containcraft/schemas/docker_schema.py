@@ -1,41 +1,74 @@
 # schemas/docker_schema.py
 
 from .base_schema import BaseSchema
-from typing import Dict, Any,Literal
-from ..ui.inputs import InputHandler
-class DockerComposeSchema(BaseSchema):
-    name = "docker-compose"
-    #ui=InputHandler()
-    def guide_user_input(self, ui:InputHandler) -> Dict[str, Any]:
-        services = {}
-        ui.print_header("Create Docker Compose YAML")
+from .spec import AnyOf, Anything, Enum, ListOf, MapOf, Number, Port, Record, Scalar, Str, prompt_value
+from typing import Dict, Any,Literal, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..ui.inputs import InputHandler
+
+RESTART_POLICIES = ["no", "always", "on-failure", "unless-stopped"]
 
-        while True:
-            service_name = ui.get_string("Service name:")
-            image = ui.get_string("Docker image (e.g., nginx:latest):")
+# "KEY=value" items or a KEY: value mapping
+ENVIRONMENT = AnyOf(MapOf(Scalar()), ListOf(Str()), prompt="Environment variables:")
 
-            ports = ui.get_list("Ports (e.g., 8080:80), comma separated:")
-            volumes = ui.get_list("Volumes (e.g., ./data:/var/lib/mysql):")
-            env_vars = ui.get_key_value_pairs("Environment variables:")
-            restart = ui.get_choice("Restart policy:", ["no", "always", "on-failure"])
+SERVICE = Record({
+    "image": Str(prompt="Docker image (e.g., nginx:latest):"),
+    "build": AnyOf(Str(), Record({"context": Str(), "dockerfile": Str(), "args": AnyOf(MapOf(Scalar()), ListOf(Str()))})),
+    "command": AnyOf(Str(), ListOf(Str())),
+    "ports": ListOf(AnyOf(Port(), Record({"target": Port(), "published": AnyOf(Port(), Str())}, required=["target"])),
+                    prompt="Ports (e.g., 8080:80), comma separated:"),
+    "volumes": ListOf(AnyOf(Str(), Record({"type": Str(), "source": Str(), "target": Str()}, required=["target"])),
+                      prompt="Volumes (e.g., ./data:/var/lib/mysql):"),
+    "environment": ENVIRONMENT,
+    "env_file": AnyOf(Str(), ListOf(Str())),
+    "depends_on": AnyOf(ListOf(Str()), MapOf(Record({"condition": Enum(
+        ["service_started", "service_healthy", "service_completed_successfully"])}))),
+    "restart": AnyOf(Enum(RESTART_POLICIES), Str(pattern=r"^on-failure:\d+$", description="a restart policy"),
+                     prompt="Restart policy:"),
+    "networks": AnyOf(ListOf(Str()), MapOf(Anything())),
+    "container_name": Str(),
+}, alternatives=[("image", "build")])
 
-            services[service_name] = {
-                "image": image,
-                "ports": ports if ports else [],
-                "volumes": volumes if volumes else [],
-                "environment": env_vars if env_vars else {},
-                "restart": restart
-            }
+COMPOSE = Record({
+    "version": AnyOf(Str(), Number(), default="3"),
+    "services": MapOf(SERVICE, key_prompt="Service name:", more_prompt="Add another service?"),
+    "volumes": MapOf(Anything()),
+    "networks": MapOf(Anything()),
+}, required=["services"])
 
-            if not ui.get_yes_no("Add another service?"):
-                break
+class DockerComposeSchema(BaseSchema):
+    name = "docker-compose"
+    spec = COMPOSE
+    item_key = "services"
+    #ui=InputHandler()
+    def guide_user_input(self, ui: "InputHandler") -> Dict[str, Any]:
+        ui.print_header("Create Docker Compose YAML")
+        return self.build(prompt_value(COMPOSE, ui))
 
-        return {"version": "3", "services": services}
+    def build(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        {"version": ..., "services": ...} where services maps names to service
+        fields or is a list of fields with a "name"; ports, volumes, environment
+        and restart get their defaults.
+        """
+        services = params.get("services") or {}
+        if isinstance(services, list):
+            services = {s["name"]: {k: v for k, v in s.items() if k != "name"} for s in services}
+        built = {}
+        for service_name, fields in services.items():
+            # fresh containers per service: shared ones would be dumped as YAML aliases
+            service = {"image": "", "ports": [], "volumes": [], "environment": {}, "restart": "no"}
+            if "build" in fields and "image" not in fields:
+                del service["image"]
+            service.update(fields)
+            built[service_name] = service
+        return {"version": params.get("version", "3"), "services": built}
     
     def validate(self, data) -> bool:
-        if "services" not in data:
-            raise ValueError("Missing 'services' key")
-        return True
+        return self.check(data)
 
     def default_structure(self) -> Dict[str, Any]:
         return {"version": "3", "services": {}}
+
+    def detect(self, data) -> bool:
+        return isinstance(data, dict) and isinstance(data.get("services"), dict) and "apiVersion" not in data
@@ -1,24 +1,120 @@
 # schemas/k8s_schema.py
 
 from .base_schema import BaseSchema
-from typing import Dict, Any
-from ..ui.inputs import InputHandler
+from .spec import AnyOf, Anything, Enum, Int, ListOf, MapOf, Record, Str, Switch, prompt_value
+from typing import Dict, Any, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..ui.inputs import InputHandler
+
+DNS_LABEL = r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$"
+DNS_SUBDOMAIN = r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?(\.[a-z0-9]([-a-z0-9]*[a-z0-9])?)*$"
+PROTOCOLS = ["TCP", "UDP", "SCTP"]
+
+# label values must be strings: an unquoted 1 or true is rejected by the API server
+LABELS = MapOf(Str(), prompt="Labels:")
+
+METADATA = Record({
+    "name": Str(pattern=DNS_SUBDOMAIN, description="a lowercase DNS name", prompt="Metadata name:"),
+    "namespace": Str(pattern=DNS_LABEL, description="a lowercase DNS label"),
+    "labels": LABELS,
+    "annotations": MapOf(Str()),
+}, required=["name"])
+
+CONTAINER = Record({
+    "name": Str(pattern=DNS_LABEL, description="a lowercase DNS label", prompt="Container name:"),
+    "image": Str(prompt="Image:"),
+    "imagePullPolicy": Enum(["Always", "IfNotPresent", "Never"]),
+    "ports": ListOf(Record({
+        "containerPort": Int(min=1, max=65535),
+        "protocol": Enum(PROTOCOLS),
+        "name": Str(),
+    }, required=["containerPort"]), prompt="Container ports (80,443):"),
+    "env": ListOf(Record({"name": Str(), "value": Str(), "valueFrom": Anything()}, required=["name"])),
+    "command": ListOf(Str()),
+    "args": ListOf(Str()),
+}, required=["name"])
+
+POD_SPEC = Record({
+    "containers": ListOf(CONTAINER, min_items=1),
+    "initContainers": ListOf(CONTAINER),
+    "restartPolicy": Enum(["Always", "OnFailure", "Never"]),
+}, required=["containers"])
+
+DEPLOYMENT_SPEC = Record({
+    "replicas": Int(min=0, prompt="Replicas:"),
+    "selector": Record({"matchLabels": MapOf(Str())}),
+    "template": Record({"metadata": Record({"labels": MapOf(Str())}), "spec": POD_SPEC}, required=["spec"]),
+}, required=["selector", "template"])
+
+SERVICE_SPEC = Record({
+    "type": Enum(["ClusterIP", "NodePort", "LoadBalancer", "ExternalName"], prompt="Service type:"),
+    "selector": MapOf(Str()),
+    "ports": ListOf(Record({
+        "port": Int(min=1, max=65535),
+        "targetPort": AnyOf(Int(min=1, max=65535), Str()),
+        "nodePort": Int(min=1, max=65535),
+        "protocol": Enum(PROTOCOLS),
+        "name": Str(),
+    }, required=["port"]), prompt="Ports (80:80, 443:443):"),
+})
+
+KINDS = Enum(["Deployment", "Service"], prompt="Resource kind:")
+
+def _resource(spec: Record | None = None, spec_required: bool = False) -> Record:
+    fields = {"apiVersion": Str(), "kind": Str(), "metadata": METADATA}
+    if spec is not None:
+        fields["spec"] = spec
+    return Record(fields, required=["apiVersion", "kind", "metadata"] + (["spec"] if spec_required else []))
+
+RESOURCE = Switch("kind", {
+    "Deployment": _resource(DEPLOYMENT_SPEC, spec_required=True),
+    "Service": _resource(SERVICE_SPEC),
+}, otherwise=_resource())
+
+def _service_port(port) -> Dict[str, int]:
+    # "8080:80" is targetPort:port, as entered at the prompt; a single number is both
+    target, _, port = str(port).partition(":")
+    return {"port": int(port or target), "targetPort": int(target)}
+
 class KubernetesSchema(BaseSchema):
     name = "kubernetes"
+    spec = RESOURCE
 
-    def guide_user_input(self, ui:InputHandler) -> Dict[str, Any]:
+    def guide_user_input(self, ui: "InputHandler") -> Dict[str, Any]:
         ui.print_header("Create Kubernetes YAML")
 
-        kind = ui.get_choice("Resource kind:", ["Deployment", "Service"])
-        name = ui.get_string("Metadata name:")
-        labels = ui.get_key_value_pairs("Labels:")
+        params = {
+            "kind": prompt_value(KINDS, ui),
+            "name": prompt_value(METADATA.fields["name"], ui),
+            "labels": prompt_value(LABELS, ui),
+        }
+
+        if params["kind"] == "Deployment":
+            params["replicas"] = prompt_value(DEPLOYMENT_SPEC.fields["replicas"], ui)
+            params["container"] = prompt_value(CONTAINER.fields["name"], ui)
+            params["image"] = prompt_value(CONTAINER.fields["image"], ui)
+            params["ports"] = ui.get_list(CONTAINER.fields["ports"].prompt)
+            params["env"] = ui.get_key_value_pairs("Environment variables:")
+
+        if params["kind"] == "Service":
+            params["type"] = prompt_value(SERVICE_SPEC.fields["type"], ui)
+            params["ports"] = ui.get_list(SERVICE_SPEC.fields["ports"].prompt)
+
+        return self.build(params)
+
+    def build(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        A Deployment ({"kind", "name", "labels", "replicas", "container",
+        "image", "ports", "env"}) or a Service ({"kind", "name", "labels",
+        "type", "ports"}, ports as "targetPort:port" or a number).
+        """
+        kind = params.get("kind")
+        name = params.get("name", "")
+        labels = params.get("labels") or {}
+        ports = params.get("ports") or []
 
         if kind == "Deployment":
-            replicas = ui.get_number("Replicas:", min_val=1)
-            container_name = ui.get_string("Container name:")
-            image = ui.get_string("Image:")
-            ports = ui.get_list("Container ports (80,443):")
-            env_vars = ui.get_key_value_pairs("Environment variables:")
+            env_vars = params.get("env") or {}
 
             return {
                 "apiVersion": "apps/v1",
@@ -28,16 +124,16 @@ class KubernetesSchema(BaseSchema):
                     "labels": labels
                 },
                 "spec": {
-                    "replicas": replicas,
+                    "replicas": params.get("replicas", 1),
                     "selector": {
-                        "matchLabels": labels
+                        "matchLabels": dict(labels)
                     },
                     "template": {
-                        "metadata": {"labels": labels},
+                        "metadata": {"labels": dict(labels)},
                         "spec": {
                             "containers": [{
-                                "name": container_name,
-                                "image": image,
+                                "name": params.get("container") or name,
+                                "image": params.get("image", ""),
                                 "ports": [{"containerPort": int(p)} for p in ports],
                                 "env": [{"name": k, "value": v} for k, v in env_vars.items()]
                             }]
@@ -47,9 +143,6 @@ class KubernetesSchema(BaseSchema):
             }
 
         if kind == "Service":
-            service_type = ui.get_choice("Service type:", ["ClusterIP", "NodePort", "LoadBalancer"])
-            ports = ui.get_list("Ports (80:80, 443:443):")
-
             return {
                 "apiVersion": "v1",
                 "kind": "Service",
@@ -58,22 +151,18 @@ class KubernetesSchema(BaseSchema):
                     "labels": labels
                 },
                 "spec": {
-                    "type": service_type,
-                    "selector": labels,
-                    "ports": [
-                        {
-                            "port": int(p.split(":")[1]),
-                            "targetPort": int(p.split(":")[0])
-                        } for p in ports
-                    ]
+                    "type": params.get("type", "ClusterIP"),
+                    "selector": dict(labels),
+                    "ports": [_service_port(p) for p in ports]
                 }
             }
         return {}
 
     def validate(self, data) -> bool:
-        if "apiVersion" not in data:
-            raise ValueError("Missing 'apiVersion' key")
-        return True
+        return self.check(data)
 
     def default_structure(self) -> Dict[str, Any]:
         return {}
+
+    def detect(self, data) -> bool:
+        return isinstance(data, dict) and "apiVersion" in data and "kind" in data
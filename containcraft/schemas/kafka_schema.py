@@ -1,44 +1,84 @@
 # schemas/kafka_schema.py
 
 from .base_schema import BaseSchema
-from typing import Annotated,Any, Literal,Dict
-from ..ui.inputs import InputHandler
+from .spec import Int, MapOf, Record, Scalar, Str, prompt_value
+from typing import Annotated,Any, Literal,Dict, TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..ui.inputs import InputHandler
+
+LISTENERS = r"^[A-Za-z_]+://[^,:]*:\d+(,[A-Za-z_]+://[^,:]*:\d+)*$"
+
+BROKER = Record({
+    "broker.id": Int(min=0, prompt="Broker ID:"),
+    "listeners": Str(pattern=LISTENERS, description="a listener list like PLAINTEXT://:9092"),
+    "log.dirs": Str(prompt="Log directory (e.g., /kafka/logs):"),
+    "environment": MapOf(Scalar(), prompt="Environment vars:"),
+}, required=["broker.id"])
+
+KAFKA = Record({
+    "cluster": Record({
+        "zookeeper": Str(pattern=r"^$|^[^\s:,]+:\d+(,[^\s:,]+:\d+)*$", description="host:port",
+                         prompt="Zookeeper host (e.g., zookeeper:2181):"),
+        "brokers": MapOf(BROKER),
+    }, required=["brokers"]),
+}, required=["cluster"])
+
+BROKER_COUNT = Int(min=1, prompt="Number of brokers:")
+LISTENER_PORT = Int(min=1, max=65535, prompt="Listener port:")
+
 class KafkaSchema(BaseSchema):
     name = "kafka"
+    spec = KAFKA
+    item_key = "brokers"
 
-    def guide_user_input(self, ui:InputHandler)->Dict[str,Any]:
+    def guide_user_input(self, ui: "InputHandler")->Dict[str,Any]:
         ui.print_header("Create Kafka YAML")
 
-        brokers = {}
+        brokers = []
 
-        num_brokers = ui.get_number("Number of brokers:", min_val=1)
+        num_brokers = prompt_value(BROKER_COUNT, ui)
 
         for i in range(num_brokers):
             ui.print_header(f"Broker {i+1}")
 
-            broker_id = ui.get_number("Broker ID:", min_val=0)
-            port = ui.get_number("Listener port:", min_val=1)
-            log_dir = ui.get_string("Log directory (e.g., /kafka/logs):")
-            env_vars = ui.get_key_value_pairs("Environment vars:")
+            brokers.append({
+                "id": prompt_value(BROKER.fields["broker.id"], ui),
+                "port": prompt_value(LISTENER_PORT, ui),
+                "log_dir": prompt_value(BROKER.fields["log.dirs"], ui),
+                "environment": prompt_value(BROKER.fields["environment"], ui),
+            })
 
-            brokers[f"broker-{i+1}"] = {
-                "broker.id": broker_id,
-                "listeners": f"PLAINTEXT://:{port}",
-                "log.dirs": log_dir,
-                "environment": env_vars,
-            }
+        zookeeper = prompt_value(KAFKA.fields["cluster"].fields["zookeeper"], ui)
 
-        zookeeper = ui.get_string("Zookeeper host (e.g., zookeeper:2181):")
+        return self.build({"zookeeper": zookeeper, "brokers": brokers})
+
+    def build(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        {"zookeeper": "host:port", "brokers": [{"id", "port", "log_dir",
+        "environment", "name"}]}; brokers are named broker-1, broker-2, ...
+        unless they have a name.
+        """
+        brokers = {}
+        for i, broker in enumerate(params.get("brokers") or []):
+            brokers[broker.get("name") or f"broker-{i+1}"] = {
+                "broker.id": broker.get("id", i),
+                "listeners": f"PLAINTEXT://:{broker.get('port', 9092)}",
+                "log.dirs": broker.get("log_dir", ""),
+                "environment": broker.get("environment") or {},
+            }
 
         return {
             "cluster": {
-                "zookeeper": zookeeper,
+                "zookeeper": params.get("zookeeper", ""),
                 "brokers": brokers
             }
         }
 
     def validate(self, data)->bool:
-        return "cluster" in data and "brokers" in data["cluster"]
+        return self.check(data)
 
     def default_structure(self)->Dict[str,Any]:
         return {"cluster": {"zookeeper": "", "brokers": {}}}
+
+    def detect(self, data)->bool:
+        return isinstance(data, dict) and isinstance(data.get("cluster"), dict) and "brokers" in data["cluster"]
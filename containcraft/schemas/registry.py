@@ -0,0 +1,65 @@
+# schemas/registry.py
+import importlib
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+from .base_schema import BaseSchema
+
+# Menu label -> (schema name, module, class). Order matters for detect_schema:
+# the first schema whose detect() accepts a document wins; Custom never
+# auto-detects. Modules are imported the first time their schema is used, so
+# listing the menu or validating one kind of file does not load the others.
+_SCHEMA_TABLE: Dict[str, Tuple[str, str, str]] = {
+    "Docker Compose": ("docker-compose", ".docker_schema", "DockerComposeSchema"),
+    "Kubernetes": ("kubernetes", ".k8s_schema", "KubernetesSchema"),
+    "Kafka Configuration": ("kafka", ".kafka_schema", "KafkaSchema"),
+    "Custom": ("custom", ".custom_schema", "CustomSchema"),
+}
+
+
+class _LazySchemas(Mapping):
+    """Menu label -> schema instance, importing each schema module on first access."""
+
+    def __init__(self, table: Dict[str, Tuple[str, str, str]]):
+        self._table = table
+        self._loaded: Dict[str, BaseSchema] = {}
+
+    def __getitem__(self, label: str) -> BaseSchema:
+        schema = self._loaded.get(label)
+        if schema is None:
+            _, module, cls = self._table[label]
+            schema = self._loaded[label] = getattr(importlib.import_module(module, __package__), cls)()
+        return schema
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+SCHEMAS: Mapping[str, BaseSchema] = _LazySchemas(_SCHEMA_TABLE)
+
+
+def detect_schema(data: Any) -> BaseSchema | None:
+    """Return the schema a document belongs to, or None if none matches."""
+    for schema in SCHEMAS.values():
+        if schema.detect(data):
+            return schema
+    return None
+
+
+def schema_errors(schema: BaseSchema, data: Any) -> List[str]:
+    """Every problem with data under schema, as messages (all of them for declarative schemas)."""
+    if schema.spec is not None:
+        return schema.errors(data)
+    try:
+        if schema.validate(data) is False:
+            return [f"not a valid {schema.name} document"]
+    except (ValueError, KeyError, TypeError) as e:
+        return [str(e).strip("'\"")]
+    return []
+
+
+def schema_by_name(name: str) -> BaseSchema | None:
+    """The schema whose name (docker-compose, kubernetes, kafka, custom) is name."""
+    label = next((label for label, entry in _SCHEMA_TABLE.items() if entry[0] == name), None)
+    return SCHEMAS[label] if label is not None else None
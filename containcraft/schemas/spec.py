@@ -0,0 +1,389 @@
+# schemas/spec.py
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from ..core.yaml_path import format_path
+
+# Declarative schema descriptions.
+#
+#   SERVICE = Record({
+#       "image": Str(prompt="Docker image:"),
+#       "restart": Enum(["no", "always"], prompt="Restart policy:"),
+#       "ports": ListOf(Port(), prompt="Ports:"),
+#   }, alternatives=[("image", "build")])
+#
+# A spec is compiled once (compile_spec) into nested closures, one per spec
+# node, that append (path, message) for every problem instead of stopping at
+# the first; paths are linked (parent, key) pairs and are only formatted for
+# errors. The same specs drive the interactive prompts (prompt_value): a spec
+# with a prompt is asked for, Enum choices become a menu, Int bounds are
+# enforced at the prompt.
+
+# (parent, key) links from the document root; None is the root
+ErrorPath = Tuple[Any, Any] | None
+Check = Callable[[Any, ErrorPath, List[Tuple[ErrorPath, str]]], None]
+
+_MISSING = object()
+
+
+class Spec:
+    """Base class of spec nodes. prompt is the question asked when building a document."""
+
+    def __init__(self, prompt: str | None = None, default: Any = None):
+        self.prompt = prompt
+        self.default = default
+
+
+class Anything(Spec):
+    pass
+
+
+class Str(Spec):
+    def __init__(self, pattern: str | None = None, description: str | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.pattern = pattern
+        self.description = description or (f"matching {pattern}" if pattern else None)
+
+
+class Int(Spec):
+    def __init__(self, min: int | None = None, max: int | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.min = min
+        self.max = max
+
+
+class Number(Spec):
+    pass
+
+
+class Bool(Spec):
+    pass
+
+
+class Scalar(Spec):
+    """Any string, number, boolean or null."""
+
+
+class Enum(Spec):
+    def __init__(self, choices: Sequence[Any], **kwargs):
+        super().__init__(**kwargs)
+        self.choices = tuple(choices)
+
+
+class Port(Spec):
+    """A port mapping in compose short syntax: 80, "8080:80", "127.0.0.1:8080:80/udp", "9000-9005"."""
+
+
+class ListOf(Spec):
+    def __init__(self, item: Spec, min_items: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.item = item
+        self.min_items = min_items
+
+
+class MapOf(Spec):
+    """
+    A mapping with arbitrary keys and values of one spec.
+
+    For prompts, a mapping of records asks key_prompt and the record's fields
+    for each entry until more_prompt is declined; a mapping of scalars is
+    entered as key=value pairs.
+    """
+
+    def __init__(self, value: Spec, key_prompt: str | None = None, more_prompt: str | None = None,
+                 min_items: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.value = value
+        self.key_prompt = key_prompt
+        self.more_prompt = more_prompt
+        self.min_items = min_items
+
+
+class Record(Spec):
+    """
+    A mapping with known keys.
+
+    required keys must be present; for each group in alternatives at least
+    one key must be present. Other keys are allowed unless extra is False.
+    """
+
+    def __init__(self, fields: Dict[str, Spec], required: Sequence[str] = (),
+                 alternatives: Sequence[Sequence[str]] = (), extra: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.fields = fields
+        self.required = tuple(required)
+        self.alternatives = tuple(tuple(group) for group in alternatives)
+        self.extra = extra
+
+
+class AnyOf(Spec):
+    """The first option that accepts the value wins; prompts use the first option."""
+
+    def __init__(self, *options: Spec, **kwargs):
+        super().__init__(**kwargs)
+        self.options = options
+
+
+class Switch(Spec):
+    """Pick a record spec by the value of one key (such as Kubernetes' kind)."""
+
+    def __init__(self, key: str, cases: Dict[Any, Spec], otherwise: Spec | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.key = key
+        self.cases = cases
+        self.otherwise = otherwise
+
+
+# --- compiling ---------------------------------------------------------------
+
+def _type_name(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, dict):
+        return "mapping"
+    if isinstance(value, list):
+        return "list"
+    return type(value).__name__
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+_PORT = re.compile(r"^(?:(?:\d+\.\d+\.\d+\.\d+|\[[0-9a-fA-F:.]+\]):)?(?:(\d+)(?:-(\d+))?:)?(\d+)(?:-(\d+))?(?:/(?:tcp|udp|sctp))?$")
+
+
+def _port_problem(value: Any) -> str | None:
+    if _is_int(value):
+        return None if 1 <= value <= 65535 else f"port {value} is out of range 1-65535"
+    if not isinstance(value, str):
+        return f"expected a port (number or string), got {_type_name(value)}"
+    if "${" in value:
+        return None  # interpolated by compose at run time
+    match = _PORT.match(value)
+    if match is None:
+        return f"invalid port mapping {value!r} (expected [HOST:]CONTAINER[/PROTOCOL])"
+    for number in match.groups():
+        if number is not None and not 1 <= int(number) <= 65535:
+            return f"port {number} in {value!r} is out of range 1-65535"
+    return None
+
+
+@lru_cache(maxsize=None)
+def compile_spec(spec: Spec) -> Check:
+    """Compile spec into a check(value, path, errors) closure. Compiled once per spec object."""
+    if isinstance(spec, Anything):
+        def check(value, path, errors):
+            pass
+        return check
+
+    if isinstance(spec, Str):
+        regex = re.compile(spec.pattern) if spec.pattern else None
+        description = spec.description
+
+        def check(value, path, errors):
+            if not isinstance(value, str):
+                errors.append((path, f"expected a string, got {_type_name(value)}"))
+            elif regex is not None and regex.match(value) is None:
+                errors.append((path, f"{value!r} is not {description}"))
+        return check
+
+    if isinstance(spec, Int):
+        low, high = spec.min, spec.max
+        if high is None:
+            bounds = f"at least {low}"
+        else:
+            bounds = f"at most {high}" if low is None else f"between {low} and {high}"
+
+        def check(value, path, errors):
+            if not _is_int(value):
+                errors.append((path, f"expected an integer, got {_type_name(value)}"))
+            elif (low is not None and value < low) or (high is not None and value > high):
+                errors.append((path, f"{value} is not {bounds}"))
+        return check
+
+    if isinstance(spec, Number):
+        def check(value, path, errors):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append((path, f"expected a number, got {_type_name(value)}"))
+        return check
+
+    if isinstance(spec, Bool):
+        def check(value, path, errors):
+            if not isinstance(value, bool):
+                errors.append((path, f"expected true or false, got {_type_name(value)}"))
+        return check
+
+    if isinstance(spec, Scalar):
+        def check(value, path, errors):
+            if isinstance(value, (dict, list)):
+                errors.append((path, f"expected a scalar, got {_type_name(value)}"))
+        return check
+
+    if isinstance(spec, Enum):
+        choices = frozenset(spec.choices)
+        listed = ", ".join(str(c) for c in spec.choices)
+
+        def check(value, path, errors):
+            if isinstance(value, (dict, list)) or value not in choices or isinstance(value, bool):
+                hint = ""
+                if isinstance(value, bool) and {"no", "yes", "off", "on"} & choices:
+                    hint = " (YAML reads unquoted no/yes/on/off as booleans; quote the value)"
+                errors.append((path, f"must be one of {listed}, got {value!r}{hint}"))
+        return check
+
+    if isinstance(spec, Port):
+        def check(value, path, errors):
+            problem = _port_problem(value)
+            if problem is not None:
+                errors.append((path, problem))
+        return check
+
+    if isinstance(spec, ListOf):
+        item = compile_spec(spec.item)
+        min_items = spec.min_items
+
+        def check(value, path, errors):
+            if not isinstance(value, list):
+                errors.append((path, f"expected a list, got {_type_name(value)}"))
+                return
+            if len(value) < min_items:
+                errors.append((path, f"needs at least {min_items} item(s)"))
+            for i, v in enumerate(value):
+                item(v, (path, i), errors)
+        return check
+
+    if isinstance(spec, MapOf):
+        item = compile_spec(spec.value)
+        min_items = spec.min_items
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, f"expected a mapping, got {_type_name(value)}"))
+                return
+            if len(value) < min_items:
+                errors.append((path, f"needs at least {min_items} entr{'y' if min_items == 1 else 'ies'}"))
+            for k, v in value.items():
+                item(v, (path, k), errors)
+        return check
+
+    if isinstance(spec, Record):
+        fields = tuple((key, compile_spec(sub)) for key, sub in spec.fields.items())
+        required = spec.required
+        alternatives = spec.alternatives
+        known = None if spec.extra else frozenset(spec.fields)
+
+        def check(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, f"expected a mapping, got {_type_name(value)}"))
+                return
+            for key in required:
+                if key not in value:
+                    errors.append((path, f"missing required key '{key}'"))
+            for group in alternatives:
+                if not any(key in value for key in group):
+                    errors.append((path, "needs one of " + ", ".join(f"'{k}'" for k in group)))
+            for key, sub in fields:
+                v = value.get(key, _MISSING)
+                if v is not _MISSING:
+                    sub(v, (path, key), errors)
+            if known is not None:
+                for key in value:
+                    if key not in known:
+                        errors.append(((path, key), "unknown key"))
+        return check
+
+    if isinstance(spec, AnyOf):
+        options = tuple(compile_spec(option) for option in spec.options)
+
+        def check(value, path, errors):
+            first: List[Tuple[ErrorPath, str]] = []
+            for option in options:
+                found: List[Tuple[ErrorPath, str]] = []
+                option(value, path, found)
+                if not found:
+                    return
+                if not first:
+                    first = found
+            # report why the closest (first) option failed
+            errors.extend(first)
+        return check
+
+    if isinstance(spec, Switch):
+        key = spec.key
+        cases = {case: compile_spec(sub) for case, sub in spec.cases.items()}
+        fallback = compile_spec(spec.otherwise) if spec.otherwise is not None else None
+
+        def check(value, path, errors):
+            selected = cases.get(value.get(key)) if isinstance(value, dict) else None
+            selected = selected or fallback
+            if selected is not None:
+                selected(value, path, errors)
+        return check
+
+    raise TypeError(f"Unknown spec node {type(spec).__name__}")
+
+
+def format_error_path(path: ErrorPath) -> str:
+    parts = []
+    while path is not None:
+        path, key = path
+        parts.append(key)
+    return format_path(tuple(reversed(parts))) or "(document)"
+
+
+def spec_errors(spec: Spec, data: Any) -> List[str]:
+    """Every problem with data as "path: message", in document order."""
+    found: List[Tuple[ErrorPath, str]] = []
+    compile_spec(spec)(data, None, found)
+    return [f"{format_error_path(path)}: {message}" for path, message in found]
+
+
+# --- prompting ---------------------------------------------------------------
+
+def prompt_value(spec: Spec, ui, prompt: str | None = None) -> Any:
+    """Ask for a value of spec with the InputHandler ui."""
+    prompt = prompt or spec.prompt or "Value:"
+    if isinstance(spec, AnyOf):
+        return prompt_value(spec.options[0], ui, prompt)
+    if isinstance(spec, Enum):
+        return ui.get_choice(prompt, list(spec.choices))
+    if isinstance(spec, Int):
+        return ui.get_number(prompt, min_val=spec.min, max_val=spec.max)
+    if isinstance(spec, Bool):
+        return ui.get_yes_no(prompt)
+    if isinstance(spec, ListOf):
+        return [_convert(spec.item, item) for item in ui.get_list(prompt)]
+    if isinstance(spec, MapOf):
+        if not isinstance(spec.value, (Record, MapOf, ListOf)):
+            return {k: _convert(spec.value, v) for k, v in ui.get_key_value_pairs(prompt).items()}
+        entries = {}
+        while True:
+            key = ui.get_string(spec.key_prompt or "Name:")
+            entries[key] = prompt_value(spec.value, ui)
+            if not spec.more_prompt or not ui.get_yes_no(spec.more_prompt):
+                return entries
+    if isinstance(spec, Record):
+        result = {}
+        for key, sub in spec.fields.items():
+            if sub.prompt is not None or getattr(sub, "key_prompt", None) is not None:
+                result[key] = prompt_value(sub, ui)
+            elif sub.default is not None:
+                result[key] = sub.default
+        return result
+    return ui.get_string(prompt)
+
+
+def _convert(spec: Spec, text: str) -> Any:
+    # comma-separated and key=value input is text; numbers become numbers where the spec wants them
+    if isinstance(spec, AnyOf):
+        spec = spec.options[0]
+    if isinstance(spec, (Int, Port)) and text.isdigit():
+        return int(text)
+    return text
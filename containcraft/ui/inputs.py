@@ -3,6 +3,7 @@ from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.panel import Panel
 from pathlib import Path
 import os
+from ..core.file_index import shared_index
 
 console = Console()
 
@@ -69,10 +70,20 @@ class InputHandler:
                 
             if not path.endswith(('.yaml', '.yml')):
                 path += '.yaml'
-            file_dir=Path(path).cwd().rglob(Path(path).name)
-            if any(file_dir):
+            if os.path.isfile(path):
                 return path
-            if not os.path.isfile(path):
-                console.print(f"[bold red]File does not exist: {path}[/]")
-
-            
\ No newline at end of file
+            # not at that path: look the name up in the index of YAML files under the cwd
+            index = shared_index()
+            matches = index.find(path)
+            if matches:
+                chosen = os.path.relpath(os.path.join(index.root, matches[0]))
+                if len(matches) > 1:
+                    others = ", ".join(matches[1:6]) + (", ..." if len(matches) > 6 else "")
+                    console.print(f"[yellow]{len(matches)} files match {path}; using {chosen} (also: {others})[/]")
+                else:
+                    console.print(f"[dim]Using {chosen}[/]")
+                return chosen
+            console.print(f"[bold red]File does not exist: {path}[/]")
+            suggestions = index.suggest(path)
+            if suggestions:
+                console.print(f"[yellow]Did you mean: {', '.join(suggestions)}[/]")
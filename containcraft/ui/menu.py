@@ -1,34 +1,50 @@
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
 from rich.prompt import Prompt
-from ..schemas.docker_schema import DockerComposeSchema
-from ..schemas.custom_schema import CustomSchema
-from ..schemas.k8s_schema import KubernetesSchema
-from ..schemas.kafka_schema import KafkaSchema
 from ..schemas.base_schema import BaseSchema
-from ..edit.edit_yaml import edit_yaml_session
+from ..schemas.registry import SCHEMAS
 from .inputs import InputHandler
 
 from ..core.json_model import JSONModel
-from ..core.renderer import render_tree
+from ..core.renderer import iter_render_lines
 from ..core.yaml_tree import YamlTree
-from ..core.yaml_io import load_yaml, save_yaml
-from typing import Dict
-import yaml
+from ..core.file_index import shared_index
+from ..core.profiling import profiled, span
+from ..core.yaml_io import (load_yaml, save_yaml, dumps_yaml, iter_yaml_documents,
+                            is_multi_document, find_document, parse_document_selector,
+                            document_label)
+from typing import Any, Callable, Dict, Mapping
+import itertools
 import os
 from pathlib import Path
 console = Console()
 
+# Files above this size are not echoed and only the top of the tree is shown
+LARGE_FILE_BYTES = 1024 * 1024
+LARGE_FILE_TREE_DEPTH = 1
+# Longer trees open in the collapsible viewer instead of being printed
+TREE_PANEL_MAX_LINES = 200
+
+# The syntax highlighter (pygments), the editor and the span writer are
+# imported by the flows that use them, keeping them out of startup.
+
+
+def _is_multi_document(file_path: str) -> bool:
+    from ..core.doc_cache import MISSING, default_cache
+
+    # a file in the memory cache was parsed as a single document already;
+    # the disk tier is not asked, as that would read and hash the whole file
+    cache = default_cache()
+    if cache is not None and cache.peek(file_path) is not MISSING:
+        return False
+    return is_multi_document(file_path)
+
 class Menu:
     def __init__(self) -> None:
         self.ui: InputHandler = InputHandler()
-        self.schemas: Dict[str, BaseSchema] = {
-            "Docker Compose":DockerComposeSchema(),
-            "Kubernetes":KubernetesSchema(),
-            "Kafka Configuration":KafkaSchema(),
-            "Custom":CustomSchema()
-        }
+        self.schemas: Mapping[str, BaseSchema] = SCHEMAS
+        # index YAML files under the cwd in the background for path lookups
+        shared_index()
     def main_menu(self):
         while True:
             console.clear()
@@ -52,12 +68,19 @@ class Menu:
                 console.print("[bold yellow]Exiting ContainCraft. Goodbye![/]")
                 break
     '''create new yaml'''
+    @profiled("menu.create_yaml_flow", "ui")
     def create_yaml_flow(self):
         schema_name = self.ui.get_choice("Choose schema type:", list(self.schemas.keys()))
         schema: BaseSchema = self.schemas[schema_name]
 
         data = schema.guide_user_input(self.ui)
-        schema.validate(data)
+        errors = schema.errors(data)
+        if errors:
+            console.print(f"[bold yellow]The {schema.name} document has {len(errors)} problem(s):[/]")
+            for error in errors:
+                console.print(f"[yellow]  - {error}[/]")
+            if not self.ui.get_yes_no("Save anyway?"):
+                return
 
         file_path = self.ui.get_string("Enter the filename (filename.yaml)")
         if not file_path.endswith(('.yaml', '.yml')):
@@ -75,47 +98,178 @@ class Menu:
 
     #  load YAML 
 
+    @profiled("menu.load_yaml_flow", "ui")
     def load_yaml_flow(self):
+        from rich.syntax import Syntax
+
         file_path = self.ui.get_path_existing("Enter YAML file path or press enter to go back to main menu")
         # User pressed Enter to go back to main menu
         if file_path is None:
             return
-        
-        data = load_yaml(file_path)
-        # If data is None, file couldn't be loaded
-        if data is None:
+
+        if _is_multi_document(file_path):
+            self._page_documents(file_path, self._show_document)
+            return
+
+        size = os.path.getsize(file_path)
+        tree = self._load_tree(file_path, size)
+        # If tree is None, file couldn't be loaded
+        if tree is None or tree.root is None:
             console.print("[bold red]Error: Could not load YAML file[/]")
             input("Press Enter to continue...")
             return
 
+        max_depth = None
         console.print("\n[bold cyan]Loaded YAML:[/]\n")
-        yaml_str = yaml.safe_dump(data, sort_keys=False, default_flow_style=False)
-        console.print(Panel(Syntax(yaml_str, "yaml", theme="monokai"), title="YAML Content", border_style="cyan"))
+        if size <= LARGE_FILE_BYTES:
+            with open(file_path, 'r') as f:
+                text = f.read()
+            with span("menu.highlight", "render", chars=len(text)):
+                console.print(Panel(Syntax(text, "yaml", theme="monokai"), title="YAML Content", border_style="cyan"))
+        else:
+            max_depth = LARGE_FILE_TREE_DEPTH
+            console.print(f"[yellow]{size / 1e6:.1f} MB file: showing the top-level structure only[/]")
+
+        self._show_tree(tree, max_depth, title=f"Tree Structure: {file_path}")
+        #return data,file_path
+        if input("\nPress Enter to continue, or w and Enter to watch the file for changes..." ).strip().lower() == "w":
+            from .watch import watch_file
+            try:
+                watch_file(file_path, max_depth=max_depth)
+            except ValueError as e:
+                console.print(f"Error: {e}", style="bold red", markup=False)
+                input("Press Enter to continue...")
+
+    def _show_document(self, index: int | None, data: Any):
+        from rich.syntax import Syntax
+
+        title = "YAML Content"
+        if index is not None:
+            label = document_label(data)
+            title = f"Document {index}" + (f" ({label})" if label else "")
+
+        console.print("\n[bold cyan]Loaded YAML:[/]\n")
+        yaml_str = dumps_yaml(data)
+        with span("menu.highlight", "render", chars=len(yaml_str)):
+            console.print(Panel(Syntax(yaml_str, "yaml", theme="monokai"), title=title, border_style="cyan"))
 
         tree = YamlTree()
         tree.load_from_dict(data)
         if tree.root is None:
             console.print("[bold red]Error: Could not build tree from YAML[/]")
-            input("Press Enter to continue...")
             return
 
+        self._show_tree(tree, None, title=title)
+
+    def _show_tree(self, tree: YamlTree, max_depth: int | None, title: str):
+        """Print a small tree; offer the collapsible viewer for a big or truncated one."""
         console.print("\n[bold blue]Tree View:[/]\n")
-        console.print(Panel(render_tree(tree.root), border_style="blue", title="Tree Structure"))
-        #return data,file_path
-        input("\nPress Enter to continue..." )
-        
+        # big trees are not printed: the viewer draws one screen at a time
+        lines = list(itertools.islice(iter_render_lines(tree.root, max_depth=max_depth), TREE_PANEL_MAX_LINES + 1))
+        if len(lines) <= TREE_PANEL_MAX_LINES:
+            console.print(Panel("\n".join(lines), border_style="blue", title="Tree Structure"))
+        else:
+            console.print(f"[yellow]The tree has more than {TREE_PANEL_MAX_LINES} lines[/]")
+        if (max_depth is not None or len(lines) > TREE_PANEL_MAX_LINES) and self.ui.get_yes_no("Browse the full tree?"):
+            from .tree_viewer import browse_tree
+            browse_tree(tree.root, title=title)
+
+    def _page_documents(self, file_path: str, action: Callable[[int, Any], None]):
+        """Step through a multi-document stream by index or kind/name.
+
+        Documents are streamed from disk, so only the selected one is in memory.
+        """
+        console.print("[bold cyan]Multi-document stream detected.[/] "
+                      "Select documents by index (0, 1, ...) or kind/name (e.g. Deployment/web).")
+        cursor = enumerate(iter_yaml_documents(file_path))
+        position = 0  # index of the next document cursor yields
+        while True:
+            raw = self.ui.get_string("Document index, kind/name, 'n' for next, or Enter to go back")
+            if raw == "":
+                return
+            if raw.lower() in ("n", "next"):
+                found = next(cursor, None)
+                if found is None:
+                    console.print("[yellow]End of stream reached[/]")
+                    continue
+            else:
+                selector = parse_document_selector(raw)
+                # an index ahead of the cursor is read from the same stream;
+                # names (first match wins) and earlier indexes start over
+                ahead = isinstance(selector, int) and selector >= position
+                search = cursor if ahead else enumerate(iter_yaml_documents(file_path))
+                found = find_document(file_path, selector, search)
+                if found is None:
+                    console.print(f"[bold red]No document matches {raw}[/]")
+                    if ahead:
+                        # the search read the rest of the stream; 'n' resumes where it was
+                        cursor = itertools.islice(enumerate(iter_yaml_documents(file_path)), position, None)
+                    continue
+                # 'n' continues from the document just selected
+                cursor = search
+            position = found[0] + 1
+            action(*found)
+
+    @profiled("menu.load_tree", "ui")
+    def _load_tree(self, file_path: str, size: int) -> YamlTree | None:
+        """
+        Tree for the Load YAML view. Parsed documents come from the document
+        cache (core.doc_cache) when the file was opened before; a large file
+        that is not cached yet is built lazily from parse events instead, so
+        nothing below the displayed depth is constructed unless asked for.
+        """
+        from ..core.doc_cache import MISSING, default_cache
+        from ..core.lazy_tree import load_lazy_tree
+
+        if size <= LARGE_FILE_BYTES:
+            data = load_yaml(file_path)
+        else:
+            cache = default_cache()
+            data = cache.get(file_path) if cache is not None else MISSING
+            if data is MISSING:
+                return load_lazy_tree(file_path)
+        if data is None:
+            return None
+        tree = YamlTree()
+        tree.load_from_dict(data)
+        return tree
+
+    @profiled("menu.edit_yaml_flow", "ui")
     def edit_yaml_flow(self):
+        from ..edit.edit_yaml import edit_yaml_session
+        from ..core.yaml_writer import save_yaml_edits
+        from ..core.content_hash import documents_differ
+
         file_path=self.ui.get_path_existing("Enter YAML file path to edit")
+        if file_path is None:
+            return
+        if _is_multi_document(file_path):
+            self._page_documents(file_path, lambda index, doc: self._edit_document(file_path, index, doc))
+            return
         data=load_yaml(file_path)
         result=edit_yaml_session(data)
-        if result is not None:
-            save_yaml(file_path,result)
+        if result is not None and not documents_differ(data, result):
+            console.print(f"[yellow]No changes; {file_path} left untouched[/]")
+            input("Press Enter to continue...")
+        elif result is not None:
+            save_yaml_edits(file_path, data, result)
             console.print(f"[bold green]✓ Changes saved to {file_path}[/]")
             input("Press Enter to continue...")
-       
+
+    def _edit_document(self, file_path: str, index: int, doc: Any):
+        from ..edit.edit_yaml import edit_yaml_session
+        from ..core.yaml_writer import save_yaml_edits
+        from ..core.content_hash import documents_differ
+
+        result = edit_yaml_session(doc)
+        if result is not None and not documents_differ(doc, result):
+            console.print(f"[yellow]No changes to document {index}[/]")
+        elif result is not None:
+            save_yaml_edits(file_path, doc, result, index)
+            console.print(f"[bold green]✓ Document {index} saved to {file_path}[/]")
 
 
 
     def _pretty_yaml_box(self, data) -> str:
-        dumped = yaml.safe_dump(data, sort_keys=False, default_flow_style=False)
+        dumped = dumps_yaml(data)
         return dumped
\ No newline at end of file
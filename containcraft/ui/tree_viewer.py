@@ -1,36 +1,367 @@
 
+from typing import Dict, Iterator, List, Sequence, Tuple
 from rich.console import Console
 from rich.tree import Tree as RichTree
+from rich.markup import escape
 from rich.panel import Panel
-from ..core.yaml_node import YamlNode
+from rich.text import Text
+from ..core.yaml_node import SequenceNode, YamlNode
+from ..core.yaml_path import PathPart, compile_path, format_path
+from ..core.profiling import profiled
 
 console = Console()
 
-def view_tree(node: YamlNode, indent: int = 0):
-    """Return a list of lines representing the YAML tree."""
-    lines = []
+def _line(node: YamlNode, indent: int) -> str:
     prefix = "  " * indent
+    if node.is_leaf():
+        return f"{prefix}{node.display_key()}: {node.value}"
+    # object or list node
+    return f"{prefix}{node.display_key()}:"
 
-    if node.value is not None:
-        # leaf node
-        lines.append(f"{prefix}{node.key}: {node.value}")
-    else:
-        # object node
-        lines.append(f"{prefix}{node.key}:")
-        for child in node.children:
-            lines.extend(view_tree(child, indent + 1))
+def iter_view_lines(node: YamlNode, indent: int = 0) -> Iterator[str]:
+    """Yield the lines of the YAML tree, depth-first, without recursion."""
+    yield _line(node, indent)
+    if node.is_leaf():
+        return
+    stack = [(iter(node.children), indent + 1)]
+    while stack:
+        children, depth = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+        yield _line(child, depth)
+        if not child.is_leaf():
+            stack.append((iter(child.children), depth + 1))
 
-    return lines
+@profiled("tree_viewer.view_tree", "render")
+def view_tree(node: YamlNode, indent: int = 0) -> List[str]:
+    """Return a list of lines representing the YAML tree."""
+    return list(iter_view_lines(node, indent))
 
 
 def render_tree_screen(node: YamlNode):
-    """Pretty print the YAML tree on the screen."""
-    console.clear()
-    console.print(Panel("YAML Tree View", style="bold cyan"))
-    console.print()
+    """Show the YAML tree on the screen in the collapsible viewer."""
+    browse_tree(node)
+
+
+# The collapsible viewer. Only the rows on screen are laid out: a position
+# in the tree is a cursor (the path of (siblings, index) pairs from the
+# root), the rows of a frame are found by stepping the cursor forward, and
+# each expanded node stores how many visible rows its subtree has, so
+# expanding, collapsing and jumping update a few counters instead of
+# re-flattening the tree. Drawing a frame therefore costs the same for a
+# 50-line and a 500,000-line document, and children are only read (for
+# lazy trees: parsed) when their parent is expanded.
+
+Cursor = List[Tuple[Sequence[YamlNode], int]]
+
+
+def _node_at(cursor: Cursor) -> YamlNode:
+    siblings, index = cursor[-1]
+    return siblings[index]
+
+
+def _same(a: Cursor, b: Cursor) -> bool:
+    return len(a) == len(b) and all(x[0] is y[0] and x[1] == y[1] for x, y in zip(a, b))
+
+
+def _expandable(node: YamlNode) -> bool:
+    if node.is_leaf():
+        return False
+    is_expanded = getattr(node, "is_expanded", None)
+    if is_expanded is not None and not is_expanded():
+        # a lazy node that has not been read yet: assume it has children
+        return True
+    return bool(node.children)
+
+
+class TreeBrowser:
+    """
+    A collapsible view of the tree under root that lays out only the rows of
+    the current frame. Starts with root expanded and everything else
+    collapsed; a collapsed subtree keeps the open/closed state of the nodes
+    inside it.
+    """
+
+    def __init__(self, root: YamlNode, height: int = 20):
+        self.root = root
+        self.height = height
+        self._roots = (root,)
+        # id(node) -> visible rows of its subtree, for expanded nodes only
+        self._rows: Dict[int, int] = {}
+        # id(node) -> {child index: child} for the node's expanded children
+        self._open: Dict[int, Dict[int, YamlNode]] = {}
+        # id(node) -> {id(child): position} for mappings a jump went through;
+        # the viewer never edits the tree, so positions do not go stale
+        self._positions: Dict[int, Dict[int, int]] = {}
+        self.top = self._first()
+        self.top_row = 0
+        self.marked: YamlNode | None = None
+        self._search: Tuple[str, Cursor | None] = ("", None)
+        if _expandable(root):
+            self.toggle(self.top)
+
+    def _first(self) -> Cursor:
+        return [(self._roots, 0)]
+
+    def total_rows(self) -> int:
+        return self._rows.get(id(self.root), 1)
+
+    def is_open(self, node: YamlNode) -> bool:
+        return id(node) in self._rows
+
+    def _next(self, cursor: Cursor) -> Cursor | None:
+        """The cursor of the next visible row."""
+        node = _node_at(cursor)
+        if id(node) in self._rows:
+            children = node.children
+            if children:
+                return cursor + [(children, 0)]
+        cursor = list(cursor)
+        while cursor:
+            siblings, index = cursor[-1]
+            if index + 1 < len(siblings):
+                cursor[-1] = (siblings, index + 1)
+                return cursor
+            cursor.pop()
+        return None
+
+    def _previous(self, cursor: Cursor) -> Cursor | None:
+        """The cursor of the previous visible row."""
+        cursor = list(cursor)
+        siblings, index = cursor[-1]
+        if index == 0:
+            cursor.pop()
+            return cursor or None
+        cursor[-1] = (siblings, index - 1)
+        node = siblings[index - 1]
+        while id(node) in self._rows and node.children:
+            children = node.children
+            cursor.append((children, len(children) - 1))
+            node = children[-1]
+        return cursor
+
+    def frame(self) -> List[Cursor]:
+        """Cursors of the rows on screen, at most height of them."""
+        rows = []
+        cursor: Cursor | None = self.top
+        while cursor is not None and len(rows) < self.height:
+            rows.append(cursor)
+            cursor = self._next(cursor)
+        return rows
+
+    def scroll(self, rows: int):
+        """Move the first row on screen by rows (negative scrolls up), stopping at either end."""
+        step = self._next if rows > 0 else self._previous
+        for _ in range(abs(rows)):
+            cursor = step(self.top)
+            if cursor is None:
+                break
+            self.top = cursor
+            self.top_row += 1 if rows > 0 else -1
+
+    def scroll_to_top(self):
+        self.top = self._first()
+        self.top_row = 0
+
+    def scroll_to_end(self):
+        cursor = self._first()
+        node = self.root
+        while id(node) in self._rows and node.children:
+            children = node.children
+            cursor.append((children, len(children) - 1))
+            node = children[-1]
+        self.top = cursor
+        self.top_row = self.total_rows() - 1
+        self.scroll(-(self.height - 1))
+
+    def toggle(self, cursor: Cursor):
+        """Expand or collapse the node at cursor (a visible row)."""
+        node = _node_at(cursor)
+        if id(node) in self._rows:
+            delta = 1 - self._rows.pop(id(node))
+            expanded = False
+        else:
+            if not _expandable(node):
+                return
+            children = node.children
+            if not children:
+                return
+            # collapsed children count one row each; expanded ones their subtree
+            rows = 1 + len(children) + sum(self._rows[id(c)] - 1 for c in self._open.get(id(node), {}).values())
+            self._rows[id(node)] = rows
+            delta = rows - 1
+            expanded = True
+        if len(cursor) > 1:
+            parent = _node_at(cursor[:-1])
+            children_open = self._open.setdefault(id(parent), {})
+            if expanded:
+                children_open[cursor[-1][1]] = node
+            else:
+                children_open.pop(cursor[-1][1], None)
+        for level in range(len(cursor) - 1):
+            self._rows[id(_node_at(cursor[:level + 1]))] += delta
+
+    def collapse_all(self):
+        self._rows.clear()
+        self._open.clear()
+        self.scroll_to_top()
+        if _expandable(self.root):
+            self.toggle(self.top)
+
+    def row_of(self, cursor: Cursor) -> int:
+        """Row number (0-based) of a visible cursor."""
+        row = 0
+        for level in range(1, len(cursor)):
+            parent = _node_at(cursor[:level])
+            index = cursor[level][1]
+            row += 1 + index + sum(self._rows[id(c)] - 1 for i, c in self._open.get(id(parent), {}).items()
+                                   if i < index)
+        return row
+
+    def reveal(self, cursor: Cursor):
+        """Expand the ancestors of cursor and scroll it into view, a few rows below the top."""
+        for level in range(1, len(cursor)):
+            if not self.is_open(_node_at(cursor[:level])):
+                self.toggle(cursor[:level])
+        self.top = list(cursor)
+        self.top_row = self.row_of(cursor)
+        self.marked = _node_at(cursor)
+        self.scroll(-(self.height // 4))
+
+    def cursor_for(self, parts: Sequence[PathPart]) -> Cursor:
+        """The cursor of the node at a document path; raises KeyError if there is none."""
+        try:
+            return self._descend(self._first(), parts)
+        except KeyError:
+            if parts and self.root.child(parts[0]) is None and str(self.root.key) == str(parts[0]):
+                # a single top-level key is the root itself
+                try:
+                    return self._descend(self._first(), parts[1:])
+                except KeyError:
+                    pass
+            raise KeyError(format_path(tuple(parts))) from None
+
+    def _descend(self, cursor: Cursor, parts: Sequence[PathPart]) -> Cursor:
+        for part in parts:
+            parent = _node_at(cursor)
+            child = None if parent.is_leaf() else parent.child(part)
+            if child is None:
+                raise KeyError(part)
+            children = parent.children
+            if isinstance(parent, SequenceNode):
+                index = child.key
+            else:
+                positions = self._positions.get(id(parent))
+                if positions is None:
+                    positions = self._positions[id(parent)] = {id(c): i for i, c in enumerate(children)}
+                index = positions[id(child)]
+            cursor = cursor + [(children, index)]
+        return cursor
+
+    def jump(self, path: str):
+        self.reveal(self.cursor_for(compile_path(path).parts))
+
+    @property
+    def last_search(self) -> str:
+        return self._search[0]
+
+    def search(self, text: str) -> bool:
+        """
+        Show the next node after the last match (or the first row) whose
+        key or value contains text, ignoring case; wraps around once.
+        Collapsed subtrees are searched too, reading lazy subtrees as needed.
+        """
+        text = text.lower()
+        last_text, last = self._search
+        start = last if last is not None and text == last_text else self.top
+        cursor = start
+        while True:
+            cursor = self._next_any(cursor)
+            if cursor is None:
+                cursor = self._first()
+            node = _node_at(cursor)
+            if text in str(node.key).lower() or (node.is_leaf() and text in str(node.value).lower()):
+                self._search = (text, cursor)
+                self.reveal(cursor)
+                return True
+            if _same(cursor, start):
+                return False
+
+    @staticmethod
+    def _next_any(cursor: Cursor) -> Cursor | None:
+        """The next node in document order, whether or not it is visible."""
+        node = _node_at(cursor)
+        if not node.is_leaf() and node.children:
+            return cursor + [(node.children, 0)]
+        cursor = list(cursor)
+        while cursor:
+            siblings, index = cursor[-1]
+            if index + 1 < len(siblings):
+                cursor[-1] = (siblings, index + 1)
+                return cursor
+            cursor.pop()
+        return None
+
+    def lines(self, width: int) -> List[Text]:
+        """The frame as numbered, one-line rows at most width characters wide."""
+        out = []
+        for number, cursor in enumerate(self.frame(), 1):
+            node = _node_at(cursor)
+            marker = ("▾" if self.is_open(node) else "▸") if _expandable(node) else " "
+            label = node.display_key()
+            if node.is_leaf():
+                label = f"{label}: {str(node.value)[:width]}"
+            line = f"{number:>3} {'  ' * (len(cursor) - 1)}{marker} {label}".replace("\n", "\\n")
+            style = "bold yellow" if node is self.marked else ""
+            out.append(Text(line[:width], style=style, no_wrap=True))
+        return out
+
+
+_BROWSE_HELP = ("[dim]Enter/n: next page  b: previous page  t/e: top/end  q: back\n"
+                "<row>: expand/collapse  c: collapse all  g <path>: jump  /<text>: search[/]")
 
-    for line in view_tree(node):
-        console.print(f"[white]{line}[/]")
 
-    console.print("\n[yellow]Press Enter to continue...[/]")
-    input()
+@profiled("tree_viewer.browse_tree", "ui")
+def browse_tree(node: YamlNode, title: str = "YAML Tree View"):
+    """Browse the tree under node interactively until the user quits."""
+    browser = TreeBrowser(node)
+    message = ""
+    while True:
+        browser.height = max(console.size.height - 7, 5)
+        console.clear()
+        console.print(Panel(title, style="bold cyan"))
+        rows = browser.frame()
+        for line in browser.lines(console.size.width):
+            console.print(line)
+        console.print(f"[dim]rows {browser.top_row + 1}-{browser.top_row + len(rows)} of {browser.total_rows()}[/]"
+                      + (f"  {message}" if message else ""))
+        console.print(_BROWSE_HELP)
+        command = console.input("> ").strip()
+        message = ""
+        if command == "q":
+            return
+        if command in ("", "n"):
+            browser.scroll(browser.height)
+        elif command == "b":
+            browser.scroll(-browser.height)
+        elif command == "t":
+            browser.scroll_to_top()
+        elif command == "e":
+            browser.scroll_to_end()
+        elif command == "c":
+            browser.collapse_all()
+        elif command.isdigit() and 1 <= int(command) <= len(rows):
+            browser.toggle(rows[int(command) - 1])
+        elif command.startswith("g "):
+            try:
+                browser.jump(command[2:].strip())
+            except (KeyError, ValueError) as e:
+                message = f"[red]no such path: {escape(str(e))}[/]"
+        elif command.startswith("/"):
+            text = command[1:] or browser.last_search
+            if not text or not browser.search(text):
+                message = f"[red]not found: {escape(text)}[/]"
+        else:
+            message = f"[red]unknown command: {escape(command)}[/]"
@@ -0,0 +1,161 @@
+import os
+import time
+from itertools import islice
+from typing import List, Tuple
+import yaml
+from rich.console import Console, Group
+from rich.live import Live
+from rich.panel import Panel
+from rich.text import Text
+from ..core.interning import InternTable
+from ..core.renderer import IncrementalRenderer
+from ..core.yaml_io import document_label, is_multi_document, iter_yaml_documents, load_yaml
+from ..core.yaml_path import format_path
+from ..core.yaml_tree import YamlTree
+
+console = Console()
+
+# Watch mode for the Load YAML view. The file is polled with os.stat() only:
+# while nothing changes, each poll is one system call and the process
+# otherwise sleeps. A new (inode, size, mtime) re-parses the file (through
+# the document cache, so a touch without a content change is not parsed),
+# the changed paths are found by comparing subtree hashes with the previous
+# tree, and IncrementalRenderer re-formats only the subtrees that changed.
+# The screen is redrawn in place, and only when something changed. Parsing
+# itself is not incremental: every change re-parses the whole file.
+#
+# Watch shows a single document. A '---' separated stream is rejected up
+# front, and a file that becomes one keeps its last tree on screen.
+
+POLL_SECONDS = 0.5
+
+# changed paths listed in the status line
+_SHOWN_CHANGES = 5
+
+Signature = Tuple[int, int, int] | None
+
+
+def _signature(path: str) -> Signature:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _several_documents(path: str) -> str:
+    return (f"{path} holds several documents; watch shows a single document "
+            "(contain load without --watch, or Load YAML in the menu, shows them all)")
+
+
+def _tree(document) -> YamlTree:
+    tree = YamlTree()
+    tree.load_from_dict(document)
+    return tree
+
+
+def _load(path: str, table: InternTable | None = None) -> YamlTree:
+    return _tree(load_yaml(path, table=table))
+
+
+def _print_tree(tree: YamlTree, max_depth: int | None, title: str):
+    lines = IncrementalRenderer(max_depth).render(tree.root) if tree.root is not None else []
+    console.print(Panel(Text("\n".join(lines)), border_style="blue", title=title))
+
+
+def _screen(path: str, interval: float, lines: List[str], status: str, style: str) -> Group:
+    # lines below the bottom of the terminal would be cropped by Live anyway
+    height = max(console.size.height - 6, 1)
+    shown = "\n".join(lines[:height])
+    more = f"  ({len(lines) - height} more lines)" if len(lines) > height else ""
+    return Group(
+        Text(f"Watching {path} every {interval:g} s. Press Ctrl+C to stop.", style="bold cyan"),
+        Text(status + more, style=style),
+        Panel(Text(shown), border_style="blue", title="Tree Structure"),
+    )
+
+
+def watch_file(path: str, max_depth: int | None = None, interval: float = POLL_SECONDS, intern: bool = False):
+    """
+    Show the tree of path and redraw it whenever the file changes, until
+    Ctrl+C. With intern, each version is loaded through a new InternTable.
+    Raises ValueError for a multi-document file.
+    """
+    if is_multi_document(path):
+        raise ValueError(_several_documents(path))
+    renderer = IncrementalRenderer(max_depth)
+    signature = _signature(path)
+    tree = _load(path, InternTable() if intern else None)
+    lines = renderer.render(tree.root) if tree.root is not None else []
+    status, style = f"{time.strftime('%H:%M:%S')}  loaded, {len(lines)} lines", "green"
+
+    with Live(_screen(path, interval, lines, status, style), console=console, auto_refresh=False) as live:
+        try:
+            while True:
+                time.sleep(interval)
+                current = _signature(path)
+                if current == signature:
+                    continue
+                signature = current
+                stamp = time.strftime('%H:%M:%S')
+                if current is None:
+                    status, style = f"{stamp}  {path} is missing; showing the last version", "yellow"
+                    live.update(_screen(path, interval, lines, status, style), refresh=True)
+                    continue
+                start = time.perf_counter()
+                try:
+                    new_tree = _load(path, InternTable() if intern else None)
+                except (OSError, yaml.YAMLError) as e:
+                    if isinstance(e, yaml.composer.ComposerError) and is_multi_document(path):
+                        status, style = f"{stamp}  {_several_documents(path)}; showing the last version", "yellow"
+                    else:
+                        # usually a file caught half-written; the next write is picked up
+                        status, style = f"{stamp}  could not parse: {str(e).splitlines()[0]}", "red"
+                    live.update(_screen(path, interval, lines, status, style), refresh=True)
+                    continue
+                changed = [format_path(parts) for parts in islice(new_tree.changed_paths(tree), _SHOWN_CHANGES + 1)]
+                tree = new_tree
+                if tree.root is not None:
+                    lines = renderer.render(tree.root)
+                    redrawn = f"re-rendered {renderer.rendered} subtrees, reused {renderer.reused}"
+                else:
+                    lines, redrawn = [], "empty document"
+                seconds = time.perf_counter() - start
+                if not changed:
+                    summary = "no content change"
+                else:
+                    summary = ", ".join(changed[:_SHOWN_CHANGES]) + (", ..." if len(changed) > _SHOWN_CHANGES else "")
+                    summary = f"changed: {summary}"
+                status, style = f"{stamp}  {summary} ({redrawn}; {seconds * 1000:.0f} ms)", "green"
+                live.update(_screen(path, interval, lines, status, style), refresh=True)
+        except KeyboardInterrupt:
+            pass
+
+
+def run_load(path: str, watch: bool = False, interval: float = POLL_SECONDS, max_depth: int | None = None,
+             intern: bool = False) -> int:
+    """
+    Entry point for `contain load`; returns the process exit code.
+
+    A multi-document file is printed one tree per document, as Load YAML
+    pages through them; it cannot be watched.
+    """
+    table = InternTable() if intern else None
+    try:
+        if watch:
+            watch_file(path, max_depth=max_depth, interval=interval, intern=intern)
+            return 0
+        if is_multi_document(path):
+            for index, document in enumerate(iter_yaml_documents(path, table)):
+                label = document_label(document)
+                _print_tree(_tree(document), max_depth, f"Document {index}" + (f" ({label})" if label else ""))
+        else:
+            _print_tree(_load(path, table), max_depth, "Tree Structure")
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        console.print(f"[bold red]error:[/] {e}", markup=True, highlight=False)
+        return 2
+    if table is not None:
+        stats = table.stats()
+        console.print(f"interned: {stats['shared']} of {stats['values']} values shared, "
+                      f"~{stats['bytes_saved'] / 1e6:.1f} MB of copies dropped", highlight=False)
+    return 0
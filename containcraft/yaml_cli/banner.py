@@ -1,6 +1,22 @@
-import pyfiglet 
+# The banner is rendered once, ahead of time: loading pyfiglet and parsing
+# its font file took longer than the rest of startup. Regenerate BANNER with
+# render_banner() if TEXT or FONT change (benchmarks/bench_startup.py checks).
+TEXT = "ContainCraft"
+FONT = "slant"
+
+BANNER = (
+    '   ______            __        _       ______           ______ \n'
+    '  / ____/___  ____  / /_____ _(_)___  / ____/________ _/ __/ /_\n'
+    ' / /   / __ \\/ __ \\/ __/ __ `/ / __ \\/ /   / ___/ __ `/ /_/ __/\n'
+    '/ /___/ /_/ / / / / /_/ /_/ / / / / / /___/ /  / /_/ / __/ /_  \n'
+    '\\____/\\____/_/ /_/\\__/\\__,_/_/_/ /_/\\____/_/   \\__,_/_/  \\__/  \n'
+    '                                                               \n'
+)
+
+def render_banner(text: str = TEXT, font: str = FONT) -> str:
+    import pyfiglet
+    return pyfiglet.figlet_format(text=text, font=font)
 
 def print_ascii_banner():
-    #generate the ascii text
-    ascii_banner=pyfiglet.figlet_format(text="ContainCraft",font="slant")
-    return ascii_banner
\ No newline at end of file
+    #the ascii text, prerendered
+    return BANNER
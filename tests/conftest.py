@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# keep the document cache and query index of test runs out of the user's ~/.cache
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="containcraft-tests-")
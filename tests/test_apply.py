@@ -0,0 +1,22 @@
+import pytest
+
+from containcraft.batch.apply import run_apply
+from containcraft.core.yaml_io import load_yaml
+
+PATCH = "- op: set\n  path: services.web.image\n  value: nginx:2\n"
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_apply_reports_every_file_once(tmp_path, capsys, jobs):
+    (tmp_path / "patch.yaml").write_text(PATCH)
+    files = []
+    for i in range(12):
+        path = tmp_path / f"f{i}.yaml"
+        path.write_text("services:\n  web:\n    image: nginx\n" if i != 5 else "- not a mapping\n")
+        files.append(str(path))
+    assert run_apply(str(tmp_path / "patch.yaml"), files, jobs=jobs) == 1
+    lines = capsys.readouterr().out.splitlines()
+    reported = sorted(line.split()[1].rstrip(":") for line in lines if line.startswith(("changed", "failed")))
+    assert reported == sorted(files)
+    assert "12 files: 11 changed, 0 unchanged, 1 failed" in lines
+    assert all(load_yaml(f, cache=False)["services"]["web"]["image"] == "nginx:2" for f in files if "f5." not in f)
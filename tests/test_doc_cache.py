@@ -0,0 +1,143 @@
+import datetime
+import os
+import time
+
+import pytest
+
+from containcraft.core import doc_cache
+from containcraft.core.doc_cache import MISSING, DocumentCache
+from containcraft.core.yaml_io import loads_yaml
+
+
+class CountingParse:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return loads_yaml(text)
+
+
+def write(path, text, age=10.0):
+    """Write text to path with an mtime age seconds ago (older than the racy window)."""
+    path.write_text(text)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DocumentCache(str(tmp_path / "snapshots"))
+
+
+def test_memory_hit(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: [1, 2]\n")
+    parse = CountingParse()
+    first = cache.load(path, parse)
+    assert cache.load(path, parse) is first
+    assert parse.calls == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_touched_file_hits_the_disk_tier(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: 1\n")
+    parse = CountingParse()
+    cache.load(path, parse)
+    write(tmp_path / "a.yaml", "a: 1\n", age=5.0)
+    assert cache.load(path, parse) == {"a": 1}
+    assert parse.calls == 1
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_changed_file_is_parsed_again(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: 1\n")
+    parse = CountingParse()
+    cache.load(path, parse)
+    write(tmp_path / "a.yaml", "a: 2\n", age=5.0)
+    assert cache.load(path, parse) == {"a": 2}
+    assert parse.calls == 2
+
+
+def test_racy_mtime_is_not_trusted(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: 1\n", age=0.0)
+    parse = CountingParse()
+    cache.load(path, parse)
+    cache.load(path, parse)
+    stats = cache.stats()
+    assert stats["memory_hits"] == 0 and stats["memory_entries"] == 0
+    assert stats["disk_hits"] == 1 and parse.calls == 1
+    assert cache.peek(path) is MISSING
+
+
+def test_pickle_fallback_for_dates(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "released: 2024-01-01\nat: 2024-01-01T10:00:00\n")
+    cache.load(path, CountingParse())
+    snapshots = os.listdir(cache.disk_dir)
+    assert len(snapshots) == 1
+    with open(os.path.join(cache.disk_dir, snapshots[0]), "rb") as f:
+        assert f.read(len(doc_cache._HEADER) + 1).endswith(doc_cache._PICKLE)
+
+    parse = CountingParse()
+    document = DocumentCache(cache.disk_dir).load(path, parse)
+    assert parse.calls == 0
+    assert document["released"] == datetime.date(2024, 1, 1)
+    assert isinstance(document["at"], datetime.datetime)
+
+
+def test_shared_objects_stay_shared_on_disk(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: &x {k: [1, 2]}\nb: *x\n")
+    cache.load(path, CountingParse())
+    document = DocumentCache(cache.disk_dir).load(path, CountingParse())
+    assert document["a"] is document["b"]
+
+
+def test_empty_file_is_cached_as_none(tmp_path, cache):
+    path = write(tmp_path / "empty.yaml", "")
+    parse = CountingParse()
+    assert cache.load(path, parse) is None
+    assert cache.load(path, parse) is None
+    assert cache.get(path) is None
+    assert parse.calls == 1
+
+
+def test_get_never_parses(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: 1\n")
+    assert cache.get(path) is MISSING
+    assert cache.peek(path) is MISSING
+
+
+def test_corrupt_snapshot_is_parsed_again(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: 1\n")
+    cache.load(path, CountingParse())
+    snapshot = os.path.join(cache.disk_dir, os.listdir(cache.disk_dir)[0])
+    with open(snapshot, "wb") as f:
+        f.write(doc_cache._HEADER + doc_cache._MARSHAL + b"\xff")
+    parse = CountingParse()
+    assert DocumentCache(cache.disk_dir).load(path, parse) == {"a": 1}
+    assert parse.calls == 1
+
+
+def test_disk_tier_evicts_without_scanning_on_every_write(tmp_path, monkeypatch):
+    cache = DocumentCache(str(tmp_path / "snapshots"), memory_max_bytes=0, disk_max_bytes=5000)
+    scans = []
+    snapshots = cache._snapshots
+    monkeypatch.setattr(cache, "_snapshots", lambda: scans.append(1) or snapshots())
+    for i in range(60):
+        cache.load(write(tmp_path / f"f{i}.yaml", f"key: {'x' * 200}{i}\n"), CountingParse())
+    count, size = cache.disk_usage()
+    assert size <= 5000 and 0 < count < 60
+    assert cache.stats()["evictions"] == 60 - count
+    # one scan for the starting size, one per eviction (down to 3/4 of the
+    # limit, so not on every write) and one for disk_usage
+    assert len(scans) <= 12
+
+
+def test_clear_drops_both_tiers(tmp_path, cache):
+    path = write(tmp_path / "a.yaml", "a: 1\n")
+    cache.load(path, CountingParse())
+    cache.clear()
+    assert cache.disk_usage() == (0, 0)
+    parse = CountingParse()
+    cache.load(path, parse)
+    assert parse.calls == 1
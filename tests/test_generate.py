@@ -0,0 +1,24 @@
+import pytest
+
+from containcraft.batch.generate import run_generate
+from containcraft.core.yaml_io import dumps_yaml
+from containcraft.schemas.registry import schema_by_name
+
+
+@pytest.mark.parametrize("name, can_build", [
+    ("docker-compose", True), ("kubernetes", True), ("kafka", True), ("custom", False),
+])
+def test_can_build_follows_the_spec(name, can_build):
+    assert schema_by_name(name).can_build is can_build
+
+
+def test_build_without_a_spec_raises_value_error():
+    with pytest.raises(ValueError, match="custom documents cannot be generated"):
+        schema_by_name("custom").build({})
+
+
+def test_generate_rejects_a_schema_that_cannot_build(tmp_path, capsys):
+    params = tmp_path / "params.yaml"
+    params.write_text(dumps_yaml({"schema": "custom", "matrix": {"n": [1, 2]}, "item": {"name": "x-{n}"}}))
+    assert run_generate(str(params)) == 2
+    assert "schema must be one of" in capsys.readouterr().err
@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from containcraft.batch.generate import run_generate
+from containcraft.core.interning import InternTable
+from containcraft.core.yaml_io import dumps_yaml, iter_yaml_documents, loads_yaml
+
+
+def test_intern_keeps_equal_values_and_shares_repeats():
+    labels = {"app": "web", "tier": "backend"}
+    document = {"metadata": {"labels": dict(labels)}, "selector": dict(labels), "n": [1, 1.0, True]}
+    interned = InternTable().intern(document)
+    assert interned == document
+    assert interned["metadata"]["labels"] is interned["selector"]
+    assert [type(v) for v in interned["n"]] == [int, float, bool]
+
+
+def test_intern_keeps_the_sign_of_zero():
+    interned = InternTable().intern({"a": 0.0, "b": -0.0, "c": [-0.0, 0.0]})
+    assert math.copysign(1, interned["a"]) == 1
+    assert math.copysign(1, interned["b"]) == -1
+    assert [math.copysign(1, v) for v in interned["c"]] == [-1, 1]
+
+
+def test_clear_keeps_statistics_and_drops_canonical_objects():
+    table = InternTable()
+    first = table.intern({"a": {"x": 1, "y": 2}})
+    stats = table.stats()
+    table.clear()
+    second = table.intern({"a": {"x": 1, "y": 2}})
+    assert second == first and second["a"] is not first["a"]
+    assert table.stats()["values"] == 2 * stats["values"]
+
+
+def test_anchored_output_loads_back_equal():
+    block = {"environment": {f"KEY_{i}": str(i) for i in range(5)}}
+    document = {"a": dict(block), "b": dict(block)}
+    table = InternTable()
+    text = dumps_yaml(table.intern(document), table)
+    assert "&" in text and "*" in text
+    assert loads_yaml(text) == document
+
+
+@pytest.mark.parametrize("schema, item", [
+    ("kubernetes", {"kind": "Deployment", "name": "app-{n}", "labels": {"app": "web"}, "image": "nginx"}),
+    ("docker-compose", {"name": "svc-{n}", "image": "nginx", "environment": {"A": "1", "B": "2", "C": "3"}}),
+])
+def test_generate_with_anchors_writes_the_same_documents(tmp_path, schema, item):
+    params = tmp_path / "params.yaml"
+    outputs = {}
+    for anchors in (False, True):
+        output = tmp_path / f"out-{anchors}.yaml"
+        params.write_text(dumps_yaml({"schema": schema, "output": str(output),
+                                      "matrix": {"n": {"from": 1, "to": 6}}, "item": item}))
+        assert run_generate(str(params), anchors=anchors) == 0
+        outputs[anchors] = list(iter_yaml_documents(str(output)))
+    assert outputs[True] == outputs[False]
@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.bench_startup import CASES, run_case
+
+# CI machines are slower and noisier than the budgets in bench_startup
+# assume, so only a large regression (an eager import of a heavy module)
+# fails here; the import checks are exact.
+SLACK = 5
+
+
+@pytest.mark.parametrize("label, code, forbidden, budget", CASES, ids=[case[0] for case in CASES])
+def test_entry_point_startup(label, code, forbidden, budget):
+    ms, modules = run_case(code, runs=3)
+    leaked = sorted(m for m in modules if any(m == f or m.startswith(f + ".") for f in forbidden))
+    assert not leaked, f"{label} imports {', '.join(leaked)}"
+    assert ms < budget * SLACK, f"{label} took {ms:.0f} ms (budget {budget} ms)"
+
+
+def test_banner_is_current():
+    from containcraft.yaml_cli.banner import BANNER, render_banner
+    assert BANNER == render_banner()
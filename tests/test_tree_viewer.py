@@ -0,0 +1,70 @@
+import pytest
+
+from containcraft.core.renderer import render_tree
+from containcraft.core.yaml_tree import YamlTree
+from containcraft.ui.tree_viewer import TreeBrowser, _node_at
+
+
+def tree_of(data):
+    tree = YamlTree()
+    tree.load_from_dict(data)
+    return tree
+
+
+WIDE = {"services": {f"svc-{i}": {"image": f"img:{i}", "ports": [80, 443]} for i in range(300)},
+        "version": "3"}
+
+
+def expand_all(browser):
+    cursor = browser.top
+    while cursor is not None:
+        node = _node_at(cursor)
+        if not node.is_leaf() and node.children and not browser.is_open(node):
+            browser.toggle(cursor)
+        cursor = browser._next(cursor)
+
+
+def test_fully_expanded_rows_match_render_tree():
+    tree = tree_of(WIDE)
+    browser = TreeBrowser(tree.root, height=25)
+    expand_all(browser)
+    assert browser.total_rows() == len(render_tree(tree.root).split("\n"))
+    browser.scroll_to_end()
+    assert browser.row_of(browser.top) == browser.top_row == browser.total_rows() - 25
+
+
+@pytest.mark.parametrize("path, key", [
+    ("services.svc-250.ports[1]", 1),
+    ("services.svc-0.image", "image"),
+    ("version", "version"),
+])
+def test_jump_reveals_the_node(path, key):
+    browser = TreeBrowser(tree_of(WIDE).root, height=20)
+    browser.jump(path)
+    assert browser.marked.key == key
+    rows = browser.frame()
+    assert any(_node_at(cursor) is browser.marked for cursor in rows)
+    assert browser.row_of(browser.top) == browser.top_row
+
+
+def test_jump_positions_are_looked_up_once_per_mapping():
+    browser = TreeBrowser(tree_of(WIDE).root, height=20)
+    browser.jump("services.svc-299.image")
+    browser.jump("services.svc-7.image")
+    services = browser.root.child("services")
+    assert len(browser._positions[id(services)]) == 300
+    assert browser.marked is services.child("svc-7").child("image")
+
+
+def test_jump_to_missing_path_raises():
+    browser = TreeBrowser(tree_of(WIDE).root)
+    with pytest.raises(KeyError):
+        browser.jump("services.nope")
+
+
+def test_search_wraps_and_stops():
+    browser = TreeBrowser(tree_of(WIDE).root, height=20)
+    assert browser.search("img:299")
+    assert browser.marked.value == "img:299"
+    assert browser.search("img:299")
+    assert not browser.search("no such text")
@@ -0,0 +1,42 @@
+import os
+
+from containcraft.ui import watch
+
+STREAM = "kind: ConfigMap\nmetadata: {name: a}\n---\nkind: Secret\nmetadata: {name: b}\n"
+
+
+def test_load_prints_every_document(tmp_path, capsys):
+    path = tmp_path / "stream.yaml"
+    path.write_text(STREAM)
+    assert watch.run_load(str(path)) == 0
+    out = capsys.readouterr().out
+    assert "Document 0 (ConfigMap/a)" in out and "Document 1 (Secret/b)" in out
+
+
+def test_watch_rejects_a_multi_document_file(tmp_path, capsys):
+    path = tmp_path / "stream.yaml"
+    path.write_text(STREAM)
+    assert watch.run_load(str(path), watch=True) == 2
+    assert "holds several documents" in capsys.readouterr().out
+
+
+def test_file_that_becomes_a_stream_keeps_the_last_tree(tmp_path, monkeypatch):
+    path = tmp_path / "one.yaml"
+    path.write_text("a: 1\n")
+    statuses = []
+    screen = watch._screen
+    monkeypatch.setattr(watch, "_screen", lambda p, i, lines, status, style: statuses.append((status, lines)) or screen(p, i, lines, status, style))
+    polls = iter([lambda: path.write_text("a: 1\n---\nb: 2\n"), lambda: None])
+
+    def sleep(_):
+        step = next(polls, None)
+        if step is None:
+            raise KeyboardInterrupt
+        step()
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+
+    monkeypatch.setattr(watch.time, "sleep", sleep)
+    watch.watch_file(str(path))
+    status, lines = statuses[-1]
+    assert "holds several documents" in status and "last version" in status
+    assert lines == statuses[0][1]
@@ -0,0 +1,71 @@
+import datetime
+import random
+
+import pytest
+import yaml
+
+from containcraft.core import yaml_io
+from containcraft.core.interning import InternTable
+
+pytestmark = pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML was built without libyaml")
+
+ALPHABET = "ab üé中\t\n:-#'\"\\\x07\x85 ﻿\U0001F600{}[],&*!|>%@`0123456789."
+
+
+def random_string(rnd):
+    length = rnd.choice([0, 1, 3, 10, 40, 100, 130, 200])
+    return "".join(rnd.choice(ALPHABET) for _ in range(length))
+
+
+def random_scalar(rnd):
+    return rnd.choice([
+        lambda: random_string(rnd),
+        lambda: random_string(rnd),
+        lambda: "ü" * rnd.randint(1, 150),
+        lambda: "x" * rnd.randint(120, 135),
+        lambda: rnd.randint(-10 ** 6, 10 ** 6),
+        lambda: rnd.random() * 1e6,
+        lambda: None,
+        lambda: True,
+        lambda: -0.0,
+        lambda: float("inf"),
+        lambda: datetime.date(2024, 1, rnd.randint(1, 28)),
+        lambda: bytes(rnd.randrange(256) for _ in range(rnd.randint(0, 80))),
+    ])()
+
+
+def random_value(rnd, depth=0):
+    r = rnd.random()
+    if depth > 3 or r < 0.4:
+        return random_scalar(rnd)
+    if r < 0.7:
+        return {(random_string(rnd) if rnd.random() < 0.8 else random_scalar(rnd)): random_value(rnd, depth + 1)
+                for _ in range(rnd.randint(0, 4))}
+    return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 4))]
+
+
+def dump(documents, dumper):
+    return yaml.dump_all(documents, Dumper=dumper, **yaml_io._DUMP_OPTIONS)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_backends_write_identical_bytes(seed):
+    rnd = random.Random(seed)
+    for _ in range(500):
+        documents = [random_value(rnd) for _ in range(rnd.choice([1, 1, 2, 3]))]
+        assert dump(documents, yaml.CSafeDumper) == dump(documents, yaml_io.PureSafeDumper)
+
+
+def test_backends_write_identical_anchors():
+    rnd = random.Random(7)
+    shared = {"environment": {f"KEY_{i}": random_string(rnd) for i in range(5)}}
+    documents = [{"a": dict(shared), "b": dict(shared), "c": [dict(shared), random_value(rnd)]} for _ in range(20)]
+    table = InternTable()
+    documents = [table.intern(doc) for doc in documents]
+    assert dump(documents, table.dumper(yaml.CSafeDumper)) == dump(documents, table.dumper(yaml_io.PureSafeDumper))
+
+
+@pytest.mark.parametrize("value", ["plain", 3, None, "ü" * 100, "x" * 200])
+def test_top_level_scalar_has_no_end_marker(value):
+    assert dump([value], yaml_io.PureSafeDumper) == dump([value], yaml.CSafeDumper)
+    assert not dump([value], yaml_io.PureSafeDumper).endswith("...\n")
@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from containcraft.batch.query import run_query
+from containcraft.core.yaml_query import QueryIndex, iter_tree_entries
+from containcraft.core.yaml_tree import YamlTree
+
+DOCUMENT = {
+    "releases": {datetime.date(2024, 1, 1): "first", 80: "http", "tags": ["a", "b"]},
+    "services": {"web": {"image": "nginx:1.25"}},
+}
+
+
+def index_of(*documents):
+    index = QueryIndex()
+    for i, data in enumerate(documents):
+        tree = YamlTree()
+        tree.load_from_dict(data)
+        index.add_tree("doc.yaml", i, tree)
+    return index
+
+
+def paths(hits):
+    return [hit.path for hit in hits]
+
+
+def test_date_keys_are_indexed_as_text():
+    index = index_of(DOCUMENT)
+    assert [h.value for h in index.query("releases.2024-01-01")] == ["first"]
+
+
+@pytest.mark.parametrize("query", ["releases.80", "releases[80]", "releases.80 == http"])
+def test_int_keys_match_dotted_notation(query):
+    assert [h.value for h in index_of(DOCUMENT).query(query)] == ["http"]
+
+
+def test_list_items_by_index():
+    assert [h.value for h in index_of(DOCUMENT).query("releases.tags[1]")] == ["b"]
+
+
+def test_save_and_load_keep_results(tmp_path):
+    index = index_of(DOCUMENT, {"releases": {2023: None}})
+    saved = str(tmp_path / "index.marshal")
+    index.save(saved)
+    loaded = QueryIndex.load(saved)
+    for query in ("releases.*", "releases.2024-01-01", "releases.80", "**.image ^= nginx", "releases.2023"):
+        assert paths(loaded.query(query)) == paths(index.query(query))
+    assert len(loaded.query("releases.*")) == 4
+
+
+def test_outdated_index_file_loads_empty(tmp_path):
+    import marshal
+    saved = tmp_path / "index.marshal"
+    saved.write_bytes(marshal.dumps((0, [], [], [], {}, [], [])))
+    assert QueryIndex.load(str(saved)).entries == []
+
+
+def test_run_query_with_date_keys(tmp_path, capsys):
+    (tmp_path / "releases.yaml").write_text("releases: {2024-01-01: first, 80: http}\n")
+    index_path = str(tmp_path / "index.marshal")
+    assert run_query("releases.2024-01-01", [str(tmp_path)], index_path=index_path, jobs=1) == 0
+    assert run_query("releases.80", [str(tmp_path)], index_path=index_path, jobs=1) == 0
+    out = capsys.readouterr().out
+    assert "first" in out and "http" in out and "warning" not in out
+
+
+def test_iter_tree_entries_keeps_raw_keys():
+    tree = YamlTree()
+    tree.load_from_dict(DOCUMENT)
+    assert ("releases", datetime.date(2024, 1, 1)) in [parts for parts, _ in iter_tree_entries(tree)]
@@ -0,0 +1,75 @@
+import pytest
+
+from containcraft.core.content_hash import value_digest
+from containcraft.core.lazy_tree import load_lazy_tree
+from containcraft.core.yaml_io import save_yaml
+from containcraft.core.yaml_tree import YamlTree
+
+
+def tree_of(data):
+    tree = YamlTree()
+    tree.load_from_dict(data)
+    return tree
+
+
+DOCUMENTS = [
+    {"a": None},
+    {"a": [None, 1]},
+    {"a": None, "b": {}},
+    {"x": {"y": None}},
+    {"x": {"y": {}, "z": []}},
+    {"services": {"web": {"image": None, "ports": [None, [], {}, 80]}}},
+    [None, {}, [], {"a": None}],
+    None,
+    {},
+]
+
+
+@pytest.mark.parametrize("data", DOCUMENTS)
+def test_round_trip_keeps_nulls_and_empty_containers(data):
+    assert tree_of(data).tree_to_dict() == data
+
+
+@pytest.mark.parametrize("data", [d for d in DOCUMENTS if isinstance(d, dict) and d])
+def test_lazy_tree_round_trip_keeps_nulls(tmp_path, data):
+    path = tmp_path / "doc.yaml"
+    save_yaml(str(path), data)
+    tree = load_lazy_tree(str(path))
+    tree.materialize()
+    assert tree.tree_to_dict() == data
+
+
+def test_null_is_a_leaf():
+    tree = tree_of({"a": None, "b": {}})
+    assert tree.find("a").is_leaf()
+    assert not tree.find("b").is_leaf()
+
+
+def test_set_none_stores_null():
+    tree = tree_of({"a": {"b": 1}, "c": [1, 2]})
+    tree.set("a.b", None)
+    tree.set("c[0]", None)
+    tree.set("d", None)
+    assert tree.tree_to_dict() == {"a": {"b": None}, "c": [None, 2], "d": None}
+    tree.set("a", None)
+    assert tree.get("a") is None
+
+
+def test_set_replaces_null_with_container():
+    tree = tree_of({"a": None})
+    tree.set("a", {"b": None})
+    assert tree.tree_to_dict() == {"a": {"b": None}}
+
+
+@pytest.mark.parametrize("data", DOCUMENTS)
+def test_digest_matches_value_digest(data):
+    assert tree_of(data).digest() == value_digest(data)
+
+
+@pytest.mark.parametrize("old, new, path", [
+    ({"x": {"y": None}}, {"x": {"y": {}}}, ("x", "y")),
+    ({"x": {"y": None}}, {"x": {"y": []}}, ("x", "y")),
+    ({"x": [None, 1]}, {"x": [{}, 1]}, ("x", 0)),
+])
+def test_changed_paths_reports_null_to_empty_container(old, new, path):
+    assert list(tree_of(new).changed_paths(tree_of(old))) == [path]
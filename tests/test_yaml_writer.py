@@ -0,0 +1,159 @@
+import random
+
+import pytest
+import yaml
+
+from containcraft.core.yaml_io import SafeDumper, dumps_yaml, dumps_yaml_all, loads_yaml, iter_yaml_documents
+from containcraft.core.yaml_writer import render_edits, save_yaml_edits
+from containcraft.edit.persistent import append_in, assoc_in, dissoc_in
+
+WORDS = ["web", "db", "image", "ports", "env", "name", "value", "a-b", "x y", "true", "01", "3.5", "null", ""]
+
+
+def random_scalar(rnd):
+    return rnd.choice([
+        lambda: rnd.choice(WORDS),
+        lambda: rnd.randint(-5, 5000),
+        lambda: rnd.random(),
+        lambda: None,
+        lambda: rnd.random() < 0.5,
+        lambda: "line one\nline two",
+        lambda: "#not a comment",
+    ])()
+
+
+def random_value(rnd, depth=0):
+    r = rnd.random()
+    if depth >= 3 or r < 0.35:
+        return random_scalar(rnd)
+    if r < 0.7:
+        return {rnd.choice(WORDS) + str(i): random_value(rnd, depth + 1) for i in range(rnd.randint(0, 4))}
+    return [random_value(rnd, depth + 1) for _ in range(rnd.randint(0, 4))]
+
+
+def random_document(rnd):
+    return {f"k{i}": random_value(rnd, 1) for i in range(rnd.randint(1, 5))}
+
+
+def dump(document, rnd):
+    """Block style, flow style for the innermost collections, or with comment lines."""
+    style = rnd.choice(["block", "flow", "comments"])
+    if style == "flow":
+        return yaml.dump(document, Dumper=SafeDumper, default_flow_style=None, sort_keys=False)
+    text = dumps_yaml(document)
+    if style == "comments":
+        lines = text.splitlines(keepends=True)
+        for _ in range(rnd.randint(1, 3)):
+            at = rnd.randint(0, len(lines))
+            commented = "".join(lines[:at] + ["# note\n"] + lines[at:])
+            # inside a multi-line scalar the line would be part of the value
+            if loads_yaml(commented) == document:
+                lines.insert(at, "# note\n")
+        text = "".join(lines)
+    return text
+
+
+def paths(value, parts=()):
+    yield parts, value
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from paths(v, parts + (k,))
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            yield from paths(v, parts + (i,))
+
+
+def random_edit(rnd, document):
+    """One edit through edit.persistent, like the editor and apply make."""
+    parts, value = rnd.choice([p for p in paths(document)])
+    op = rnd.choice(["set", "set", "delete", "add", "append"])
+    if op == "add" and isinstance(value, dict):
+        return assoc_in(document, parts + (f"new{rnd.randint(0, 99)}",), random_value(rnd, 2))[0]
+    if op == "append" and isinstance(value, list):
+        return append_in(document, parts, random_value(rnd, 2))[0]
+    if op == "delete" and parts:
+        return dissoc_in(document, parts)[0]
+    if parts:
+        return assoc_in(document, parts, random_value(rnd, len(parts)))[0]
+    return document
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fuzz_edits_round_trip(seed):
+    rnd = random.Random(seed)
+    in_place = 0
+    for _ in range(1000):
+        old = random_document(rnd)
+        text = dump(old, rnd)
+        assert loads_yaml(text) == old
+        new = old
+        for _ in range(rnd.randint(1, 3)):
+            new = random_edit(rnd, new)
+        result = render_edits(text, old, new)
+        if result is not None:
+            in_place += 1
+            assert loads_yaml(result) == new, f"{text!r} -> {result!r}"
+    # most edits are made in place; the rest fall back to a full dump
+    assert in_place > 700
+
+
+def test_comments_and_layout_are_kept():
+    text = ("# deployment\n"
+            "services:\n"
+            "  web:\n"
+            "    image: 'nginx:1.25'   # pinned\n"
+            "    ports: [80, 443]\n"
+            "  db:\n"
+            "    image: postgres\n"
+            "\n"
+            "# trailing\n")
+    old = loads_yaml(text)
+    new = assoc_in(old, ("services", "db", "image"), "postgres:16")[0]
+    result = render_edits(text, old, new)
+    assert result == text.replace("image: postgres", "image: postgres:16")
+
+
+def test_flow_collection_is_rewritten_on_one_line():
+    text = "web:\n  ports: [80, 443]  # public\n"
+    old = loads_yaml(text)
+    new = append_in(old, ("web", "ports"), 8080)[0]
+    assert render_edits(text, old, new) == "web:\n  ports: [80, 443, 8080]  # public\n"
+
+
+def test_block_delete_add_and_append():
+    text = "a:\n  b: 1\n  c: 2\nlist:\n- x\n- y\n"
+    old = loads_yaml(text)
+    new = dissoc_in(old, ("a", "b"))[0]
+    new = assoc_in(new, ("a", "d"), {"e": 3})[0]
+    new = append_in(new, ("list",), "z")[0]
+    new = dissoc_in(new, ("list", 0))[0]
+    assert render_edits(text, old, new) == "a:\n  c: 2\n  d:\n    e: 3\nlist:\n- y\n- z\n"
+
+
+@pytest.mark.parametrize("text, edit", [
+    ("a: &x {k: 1}\nb: *x\n", lambda d: assoc_in(d, ("b", "k"), 2)[0]),        # aliases
+    ("a: 1\n", lambda d: [1, 2]),                                                # root replaced
+    ("- - 1\n  - 2\n- 3\n", lambda d: dissoc_in(d, (0, 0))[0]),              # item shares a line
+])
+def test_fallback_cases(text, edit):
+    old = loads_yaml(text)
+    assert render_edits(text, old, edit(old)) is None
+
+
+def test_multi_document_index(tmp_path):
+    documents = [{"kind": "A", "spec": {"n": i, "items": [1, 2]}} for i in range(3)]
+    path = tmp_path / "stream.yaml"
+    path.write_text("# header\n" + dumps_yaml_all(documents))
+    old = documents[1]
+    new = append_in(assoc_in(old, ("spec", "n"), 10)[0], ("spec", "items"), 3)[0]
+    assert save_yaml_edits(str(path), old, new, index=1)
+    assert list(iter_yaml_documents(str(path))) == [documents[0], new, documents[2]]
+    assert path.read_text().startswith("# header\n")
+
+
+def test_multi_document_fallback_keeps_other_documents(tmp_path):
+    documents = [{"a": 1}, {"b": 2}]
+    path = tmp_path / "stream.yaml"
+    path.write_text(dumps_yaml_all(documents))
+    assert not save_yaml_edits(str(path), documents[1], ["replaced"], index=1)
+    assert list(iter_yaml_documents(str(path))) == [{"a": 1}, ["replaced"]]